@@ -14,7 +14,9 @@ Usage:
     OR called from GUI with mode, file_path, content, subject_line, signature_name, signature_title, signature_image, and signature_email parameters.
 
 Requirements:
-    pandas, python-docx, fuzzywuzzy, python-Levenshtein
+    pandas, python-docx, fuzzywuzzy, python-Levenshtein, openpyxl
+    pillow (PDF output with JPEG, palette or interlaced signature images)
+    rapidfuzz (optional, multi-core prefilter for the batch client scrub)
 """
 
 __version__ = "5.1"
@@ -22,23 +24,48 @@ __author__ = "Kyle Padilla"
 __company__ = "Jones Insurance Advisors, Inc."
 __contact__ = "scooby_rizz@proton.me"
 
+import copy
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import queue
 import re
 import shutil
 import sqlite3
+import struct
 import sys
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
 from typing import Dict, Iterable, List, Mapping, Optional
 from typing import Dict, Iterable, List, Mapping
 
+import numpy as np
 import pandas as pd
 
 from docx import Document
 
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.enum.text import WD_BREAK, WD_PARAGRAPH_ALIGNMENT
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
 from docx.shared import Inches, Pt
 from fuzzywuzzy import fuzz
+from lxml import etree
+from openpyxl import load_workbook
+
+try:
+    from rapidfuzz import fuzz as rapid_fuzz, process as rapid_process
+except ImportError:  # rapidfuzz is an optional accelerator for batch scrubbing
+    rapid_fuzz = rapid_process = None
 
 import csv
 
@@ -52,7 +79,7 @@ def _get_first_nonempty(row, columns, default=""):
                 if value_str and value_str.lower() != "nan":
                     return value_str
     return default
-IGNORABLE_NAME_PREFIXES = {
+IGNORABLE_NAME_PREFIXES = frozenset({
     "mr",
     "mrs",
     "ms",
@@ -61,9 +88,9 @@ IGNORABLE_NAME_PREFIXES = {
     "rev",
     "hon",
     "attn",
-}
+})
 
-IGNORABLE_NAME_SUFFIXES = {
+IGNORABLE_NAME_SUFFIXES = frozenset({
     "jr",
     "junior",
     "sr",
@@ -74,9 +101,9 @@ IGNORABLE_NAME_SUFFIXES = {
     "md",
     "phd",
     "law",
-}
+})
 
-ORDINAL_WORDS = {
+ORDINAL_WORDS = frozenset({
     "first",
     "second",
     "third",
@@ -97,9 +124,9 @@ ORDINAL_WORDS = {
     "8th",
     "9th",
     "10th",
-}
+})
 
-ROMAN_NUMERAL_SUFFIXES = {
+ROMAN_NUMERAL_SUFFIXES = frozenset({
     "i",
     "ii",
     "iii",
@@ -110,12 +137,20 @@ ROMAN_NUMERAL_SUFFIXES = {
     "viii",
     "ix",
     "x",
-}
+})
+
+
+# Prefixes and suffixes are dropped the same way, so one lookup covers both.
+SKIPPED_NAME_AFFIXES = IGNORABLE_NAME_PREFIXES | IGNORABLE_NAME_SUFFIXES | ROMAN_NUMERAL_SUFFIXES
+# Generational markers that follow "the" (``the 3rd``, ``the III``).
+ORDINAL_AFTER_THE = ORDINAL_WORDS | ROMAN_NUMERAL_SUFFIXES
+
+_NAME_TOKEN_STRIP_PATTERN = re.compile(r"[^a-z0-9]")
 
 
 def _normalize_name_token(token):
     """Return a simplified representation of a name token for comparisons."""
-    return re.sub(r"[^a-z0-9]", "", token.lower())
+    return _NAME_TOKEN_STRIP_PATTERN.sub("", token.lower())
 
 
 def _strip_affixes(tokens):
@@ -129,17 +164,13 @@ def _strip_affixes(tokens):
             idx += 1
             continue
 
-        if normalized in IGNORABLE_NAME_PREFIXES:
-            idx += 1
-            continue
-
-        if normalized in IGNORABLE_NAME_SUFFIXES or normalized in ROMAN_NUMERAL_SUFFIXES:
+        if normalized in SKIPPED_NAME_AFFIXES:
             idx += 1
             continue
 
         if normalized == "the" and idx + 1 < len(tokens):
             next_normalized = _normalize_name_token(tokens[idx + 1])
-            if next_normalized in ORDINAL_WORDS or next_normalized in ROMAN_NUMERAL_SUFFIXES:
+            if next_normalized in ORDINAL_AFTER_THE:
                 idx += 2
                 continue
 
@@ -177,37 +208,22 @@ def _format_given_names(tokens):
 
 def _build_mailing_address(row):
     """Construct a mailing address string from any available components."""
-    parts = []
-    line_one = _get_first_nonempty(row, [
-        "Mailing Address",
-                "Mailing Address Line 1",
-        "Mailing Address 1",
-        "Address",
-    ])
-    if line_one:
-        parts.append(line_one)
-
-    line_two = _get_first_nonempty(row, [
-        "Mailing Address 2",
-        "Mailing Address Line 2",
-        "Address Line 2",
-    ])
-    if line_two:
-        parts.append(line_two)
+    return _join_mailing_address(
+        _get_first_nonempty(row, SALES_FIELD_ALIASES["mailing_line_one"]),
+        _get_first_nonempty(row, SALES_FIELD_ALIASES["mailing_line_two"]),
+        _get_first_nonempty(row, SALES_FIELD_ALIASES["mailing_city"]),
+        _get_first_nonempty(row, SALES_FIELD_ALIASES["mailing_state"]),
+        _get_first_nonempty(row, SALES_FIELD_ALIASES["mailing_zip"]),
+    )
 
 
-    zip_code = _get_first_nonempty(row, [
-        "Mailing Zip",
-        "Mailing ZIP",
-        "Mailing Zip Code",
-        "Zip Code",
-        "Zip",
-    ])
-    city_state_zip = _compose_city_state_zip(row, zip_code)
+def _join_mailing_address(line_one, line_two, city, state, zip_code, normalized_zip=None):
+    """Join resolved mailing address fields into a ``|``-separated string."""
+    parts = [part for part in (line_one, line_two) if part]
+    city_state_zip = _format_city_state_zip(city, state, zip_code, normalized_zip)
     if city_state_zip:
         parts.append(city_state_zip)
-
-        return " | ".join(parts) if parts else ""
+    return " | ".join(parts)
 
 # === PATH CONFIGURATION ===
 
@@ -261,6 +277,7 @@ WRITABLE_DATA_DIR = get_user_data_dir()
 WRITABLE_DATA_DIR.mkdir(parents=True, exist_ok=True)
 OUTPUT_ROOT = WRITABLE_DATA_DIR / "output"
 CAMPAIGN_DB_PATH = WRITABLE_DATA_DIR / "campaign_history.db"
+CLIENT_INDEX_DB_PATH = WRITABLE_DATA_DIR / "client_index.db"
 
 
 CAMPAIGN_CONTACTS_COLUMNS = (
@@ -310,12 +327,14 @@ INSERT INTO campaign_contacts (
     sale_price,
     email,
     phone,
-    source
-) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    source,
+    contact_key
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
 ON CONFLICT(campaign_id, name, address) DO UPDATE SET
     mode=excluded.mode,
     sent_at=excluded.sent_at,
     zip=excluded.zip,
+    contact_key=excluded.contact_key,
     sale_date=excluded.sale_date,
     sale_price=excluded.sale_price,
     email=excluded.email,
@@ -353,8 +372,8 @@ def _rebuild_campaign_contacts_table(connection):
         cursor.execute("DROP TABLE IF EXISTS campaign_contacts_legacy")
 
 
-def _ensure_campaign_history_schema(connection):
-    """Ensure the campaign history database has the expected schema."""
+def _migrate_campaign_contacts_table(connection):
+    """Create campaign_contacts, rebuilding a legacy table without the upsert key or columns."""
 
     cursor = connection.cursor()
     cursor.execute(
@@ -381,6 +400,10 @@ def _ensure_campaign_history_schema(connection):
 
 def _initialize_campaign_db(connection: sqlite3.Connection) -> None:
     """Ensure the SQLite database has the table for campaign contacts."""
+
+    migrate_campaign_db(connection)
+
+
 def ensure_local_database() -> Path:
     """Create or hydrate the writable SQLite database in the user data directory."""
 
@@ -419,8 +442,8 @@ CREATE TABLE IF NOT EXISTS customers (
 """
 
 
-def _ensure_customers_table(connection: sqlite3.Connection) -> None:
-    """Create the customers table if it is missing."""
+def _migrate_customers_table(connection: sqlite3.Connection) -> None:
+    """Create the customers table and add columns missing from older databases."""
 
     cursor = connection.cursor()
     cursor.execute(CUSTOMERS_TABLE_SQL)
@@ -433,9 +456,6 @@ def _ensure_customers_table(connection: sqlite3.Connection) -> None:
     ):
         if column not in existing_columns:
             cursor.execute(f"ALTER TABLE customers ADD COLUMN {column} {definition}")
-    connection.commit()
-    _backfill_customer_contact_keys(connection)
-    _ensure_campaign_history_schema(connection)
 
 
 def _backfill_customer_contact_keys(connection: sqlite3.Connection) -> None:
@@ -460,59 +480,460 @@ def _backfill_customer_contact_keys(connection: sqlite3.Connection) -> None:
             "UPDATE customers SET contact_key = ? WHERE id = ?",
             updates,
         )
+
+
+def _migrate_campaign_contact_keys(connection: sqlite3.Connection) -> None:
+    """Store each campaign contact's contact key and index it, ``sent_at`` and customer keys."""
+
+    cursor = connection.cursor()
+    cursor.execute("PRAGMA table_info('campaign_contacts')")
+    if "contact_key" not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE campaign_contacts ADD COLUMN contact_key TEXT")
+    cursor.execute(
+        "SELECT id, name, address, zip FROM campaign_contacts WHERE contact_key IS NULL"
+    )
+    updates = [
+        (_compute_contact_key(name, address, zip_code), contact_id)
+        for contact_id, name, address, zip_code in cursor.fetchall()
+    ]
+    if updates:
+        cursor.executemany(
+            "UPDATE campaign_contacts SET contact_key = ? WHERE id = ?",
+            updates,
+        )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_campaign_contacts_contact_key "
+        "ON campaign_contacts (contact_key)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_campaign_contacts_sent_at ON campaign_contacts (sent_at)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_customers_contact_key ON customers (contact_key)"
+    )
+
+
+# === CONTACT SUMMARY ===
+# contact_summary holds one row per contact key, kept current by
+# write_campaign_history() for the contacts each campaign touches.
+# ``recency`` is a fixed-width "sent_at, id" sort key, so MAX() over
+# ``recency || value`` picks a field's most recently mailed non-blank value.
+CONTACT_RECENCY_WIDTH = 39
+CONTACT_RECENCY_DATE_WIDTH = 19
+
+CONTACT_SUMMARY_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS contact_summary (
+    contact_key TEXT PRIMARY KEY,
+    name TEXT,
+    address TEXT,
+    zip TEXT,
+    email TEXT,
+    phone TEXT,
+    mailings_count INTEGER NOT NULL,
+    last_sent_at TEXT,
+    last_recency TEXT NOT NULL
+)
+"""
+
+
+def _latest_contact_value(column: str) -> str:
+    return (
+        f"substr(MAX(CASE WHEN {column} <> '' THEN recency || {column} END), "
+        f"{CONTACT_RECENCY_WIDTH + 1}) AS {column}"
+    )
+
+
+def _contact_summary_sql(condition: str = "1") -> str:
+    """Return the contact_summary rows for campaign contacts matching ``condition``."""
+
+    return f"""
+SELECT
+    contact_key,
+    {_latest_contact_value("name")},
+    {_latest_contact_value("address")},
+    {_latest_contact_value("zip")},
+    {_latest_contact_value("email")},
+    {_latest_contact_value("phone")},
+    COUNT(*) AS mailings_count,
+    MAX(sent_at) AS last_sent_at,
+    MAX(recency) AS last_recency
+FROM (
+    SELECT contact_key, name, address, zip, email, phone, sent_at,
+           printf('%-{CONTACT_RECENCY_DATE_WIDTH}s%020d', COALESCE(datetime(sent_at), ''), id) AS recency
+    FROM campaign_contacts
+    WHERE contact_key <> '' AND ({condition})
+)
+GROUP BY contact_key
+"""
+
+
+def _mark_campaign_contacts(connection: sqlite3.Connection, campaign_id: str) -> None:
+    """Remember the contact keys logged under ``campaign_id`` for :func:`_refresh_marked_contacts`."""
+
+    connection.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS touched_contacts (contact_key TEXT PRIMARY KEY)"
+    )
+    connection.execute(
+        "INSERT OR IGNORE INTO temp.touched_contacts "
+        "SELECT contact_key FROM campaign_contacts WHERE campaign_id = ? AND contact_key <> ''",
+        (campaign_id,),
+    )
+
+
+def _fold_new_contacts(connection: sqlite3.Connection, first_id: int, sent_at: str) -> None:
+    """Fold campaign_contacts rows with ``id > first_id`` into contact_summary.
+
+    The rows all carry ``sent_at`` and ids above every older row, so they are
+    newer than anything already summarized unless ``sent_at`` predates a
+    contact's last mailing.  Those contacts, like every contact already
+    marked, are left to :func:`_refresh_marked_contacts`; the rest are
+    upserted one row at a time in id order, adding to the count and letting
+    non-blank values replace the stored ones.
+    """
+
+    parameters = {"first_id": first_id, "sent_at": sent_at}
+    prefix = f"printf('%-{CONTACT_RECENCY_DATE_WIDTH}s', COALESCE(datetime(:sent_at), ''))"
+    connection.execute(
+        "INSERT OR IGNORE INTO temp.touched_contacts "
+        "SELECT DISTINCT c.contact_key FROM campaign_contacts AS c "
+        "JOIN contact_summary AS s ON s.contact_key = c.contact_key "
+        f"WHERE c.id > :first_id AND substr(s.last_recency, 1, {CONTACT_RECENCY_DATE_WIDTH}) > {prefix}",
+        parameters,
+    )
+    latest = ",\n    ".join(
+        f"{column} = COALESCE(excluded.{column}, {column})"
+        for column in ("name", "address", "zip", "email", "phone")
+    )
+    connection.execute(
+        f"""
+INSERT INTO contact_summary (
+    contact_key, name, address, zip, email, phone, mailings_count, last_sent_at, last_recency
+)
+SELECT contact_key, NULLIF(name, ''), NULLIF(address, ''), NULLIF(zip, ''),
+       NULLIF(email, ''), NULLIF(phone, ''), 1, sent_at, {prefix} || printf('%020d', id)
+FROM campaign_contacts
+WHERE id > :first_id AND contact_key <> ''
+  AND contact_key NOT IN (SELECT contact_key FROM temp.touched_contacts)
+ORDER BY id
+ON CONFLICT(contact_key) DO UPDATE SET
+    {latest},
+    mailings_count = mailings_count + 1,
+    last_sent_at = CASE
+        WHEN last_sent_at IS NULL OR excluded.last_sent_at > last_sent_at THEN excluded.last_sent_at
+        ELSE last_sent_at
+    END,
+    last_recency = excluded.last_recency
+""",
+        parameters,
+    )
+
+
+def _refresh_marked_contacts(connection: sqlite3.Connection) -> None:
+    """Recompute the contact_summary rows of every marked contact key."""
+
+    marked = "contact_key IN (SELECT contact_key FROM temp.touched_contacts)"
+    connection.execute(f"INSERT OR REPLACE INTO contact_summary {_contact_summary_sql(marked)}")
+    connection.execute(
+        f"DELETE FROM contact_summary WHERE {marked} AND NOT EXISTS ("
+        "SELECT 1 FROM campaign_contacts WHERE campaign_contacts.contact_key = contact_summary.contact_key)"
+    )
+    connection.execute("DELETE FROM temp.touched_contacts")
+
+
+def _migrate_contact_summary(connection: sqlite3.Connection) -> None:
+    """Create contact_summary and fill it from the campaign history."""
+
+    connection.execute(CONTACT_SUMMARY_TABLE_SQL)
+    connection.execute("DELETE FROM contact_summary")
+    connection.execute(f"INSERT INTO contact_summary {_contact_summary_sql()}")
+
+
+def rebuild_contact_summary() -> Dict[str, int]:
+    """Recompute contact_summary from the full campaign history.
+
+    Returns the number of contacts and how many of them the stored summary
+    disagreed with, which is 0 while incremental maintenance is in sync.
+    """
+
+    with campaign_db.transaction(immediate=True) as connection:
+        connection.execute("DROP TABLE IF EXISTS temp.contact_summary_check")
+        connection.execute(f"CREATE TEMP TABLE contact_summary_check AS {_contact_summary_sql()}")
+        mismatched = connection.execute(
+            """
+            SELECT COUNT(DISTINCT contact_key) FROM (
+                SELECT * FROM (
+                    SELECT * FROM temp.contact_summary_check
+                    EXCEPT SELECT * FROM main.contact_summary
+                )
+                UNION ALL
+                SELECT * FROM (
+                    SELECT * FROM main.contact_summary
+                    EXCEPT SELECT * FROM temp.contact_summary_check
+                )
+            )
+            """
+        ).fetchone()[0]
+        connection.execute("DELETE FROM main.contact_summary")
+        connection.execute(
+            "INSERT INTO main.contact_summary SELECT * FROM temp.contact_summary_check"
+        )
+        contacts = connection.execute("SELECT COUNT(*) FROM main.contact_summary").fetchone()[0]
+        connection.execute("DROP TABLE temp.contact_summary_check")
+
+    print(f"🧮 Contact summary rebuilt: {contacts} contacts, {mismatched} differed from the stored summary")
+    return {"contacts": contacts, "mismatched": mismatched}
+
+
+# === DATABASE MIGRATIONS ===
+# Step N upgrades the campaign history database to ``PRAGMA user_version`` N.
+# Append new steps; never reorder or edit released ones.
+CAMPAIGN_DB_MIGRATIONS = (
+    _migrate_campaign_contacts_table,
+    _migrate_customers_table,
+    _backfill_customer_contact_keys,
+    _migrate_campaign_contact_keys,
+    _migrate_contact_summary,
+)
+CAMPAIGN_DB_VERSION = len(CAMPAIGN_DB_MIGRATIONS)
+
+
+def migrate_campaign_db(connection: sqlite3.Connection) -> int:
+    """Bring the campaign history database up to ``CAMPAIGN_DB_VERSION``.
+
+    An up-to-date database costs one ``PRAGMA user_version`` read.  Otherwise
+    the missing steps run in one ``BEGIN IMMEDIATE`` transaction, re-reading
+    the version once the write lock is held so concurrent openers migrate
+    only once.  Returns the database's schema version.
+    """
+
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version >= CAMPAIGN_DB_VERSION:
+        return version
+
+    if connection.in_transaction:
         connection.commit()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        for step_version, step in enumerate(CAMPAIGN_DB_MIGRATIONS[version:], start=version + 1):
+            step(connection)
+            connection.execute(f"PRAGMA user_version = {step_version}")
+        connection.commit()
+    except BaseException:
+        connection.rollback()
+        raise
+    return max(version, CAMPAIGN_DB_VERSION)
+
+
+# === CAMPAIGN DATABASE CONNECTIONS ===
+CAMPAIGN_DB_BUSY_TIMEOUT_MS = 5000
+CAMPAIGN_DB_MMAP_BYTES = 64 * 1024 * 1024
+CAMPAIGN_DB_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", CAMPAIGN_DB_BUSY_TIMEOUT_MS),
+    ("mmap_size", CAMPAIGN_DB_MMAP_BYTES),
+)
+
+
+class _CountingCursor(sqlite3.Cursor):
+    """Cursor that reports each ``execute``/``executemany`` call to its connection."""
+
+    def execute(self, *args, **kwargs):
+        self.connection.on_query()
+        return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self.connection.on_query()
+        return super().executemany(*args, **kwargs)
+
+
+class _CountingConnection(sqlite3.Connection):
+    """Connection whose statements (one per ``executemany``) are counted by ``on_query``."""
+
+    on_query = staticmethod(lambda: None)
+
+    def cursor(self, factory=_CountingCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args, **kwargs):
+        self.on_query()
+        return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self.on_query()
+        return super().executemany(*args, **kwargs)
+
+
+class CampaignDatabase:
+    """Share one configured connection per thread to the campaign history database.
+
+    The first use in a thread prepares the database file, applies
+    ``CAMPAIGN_DB_PRAGMAS`` and runs pending migrations; later calls in that
+    thread reuse the connection (and its prepared statement cache).  The
+    connection is reopened if ``CAMPAIGN_DB_PATH`` changes.  Rows come back
+    as :class:`sqlite3.Row`.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.queries = 0
+
+    def _count_query(self):
+        with self._lock:
+            self.queries += 1
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening and configuring it on first use."""
 
+        local = self._local
+        connection = getattr(local, "connection", None)
+        if connection is not None and local.path == CAMPAIGN_DB_PATH:
+            return connection
+        if connection is not None:
+            self.close()
 
+        ensure_local_database()
+        connection = sqlite3.connect(CAMPAIGN_DB_PATH, factory=_CountingConnection)
+        try:
+            connection.row_factory = sqlite3.Row
+            connection.on_query = self._count_query
+            for pragma, value in CAMPAIGN_DB_PRAGMAS:
+                connection.execute(f"PRAGMA {pragma}={value}")
+            migrate_campaign_db(connection)
+        except BaseException:
+            connection.close()
+            raise
+        local.connection = connection
+        local.path = CAMPAIGN_DB_PATH
+        local.depth = 0
+        with self._lock:
+            self.connections_opened += 1
+        return connection
+
+    @contextmanager
+    def transaction(self, immediate: bool = False):
+        """Run the enclosed database helpers in one transaction on this thread's connection.
+
+        Commits when the outermost block exits and rolls back if it raises;
+        nested blocks join the outer transaction.  Pass ``immediate=True``
+        when the block reads before it writes: the write lock is then taken
+        up front (waiting out the busy timeout) instead of failing when
+        another connection commits between the read and the write.
+        """
+
+        connection = self.connection()
+        local = self._local
+        local.depth += 1
+        try:
+            if local.depth > 1:
+                yield connection
+                return
+            if not connection.in_transaction:
+                connection.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            with connection:
+                yield connection
+        finally:
+            local.depth -= 1
+
+    def close(self) -> None:
+        """Close this thread's connection, if it has one."""
+
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def stats(self) -> Dict[str, int]:
+        """Return the connections opened and queries run (``executemany`` counts once) since start-up."""
+
+        with self._lock:
+            return {"connections_opened": self.connections_opened, "queries": self.queries}
+
+
+campaign_db = CampaignDatabase()
+CAMPAIGN_HISTORY_BATCH_ROWS = 10000
+
+
+def _campaign_history_payload(records, campaign_id, mode, sent_at_iso):
+    """Yield ``CAMPAIGN_CONTACTS_INSERT_SQL`` parameters for each CRM row."""
+
+    for record in records:
+        name = str(record.get("Name", ""))
+        address = str(record.get("Address", ""))
+        zip_code = str(record.get("Zip", ""))
+        yield (
+            campaign_id,
+            mode,
+            sent_at_iso,
+            name,
+            address,
+            zip_code or None,
+            str(record.get("Sale Date", "")) or None,
+            _to_float(record.get("Sale Price", 0.0)),
+            str(record.get("Email", "")) or None,
+            str(record.get("Phone", "")) or None,
+            str(record.get("Source", "")) or None,
+            _compute_contact_key(name, address, zip_code),
+        )
 
 
-def _append_campaign_records(
+def write_campaign_history(
     records: Iterable[Mapping[str, object]],
     *,
     campaign_id: str,
     mode: str,
     sent_at: datetime,
-) -> None:
-    """Persist CRM rows into the consolidated SQLite database."""
-
-    records = list(records)
-    if not records:
-        return
+    batch_rows: int = CAMPAIGN_HISTORY_BATCH_ROWS,
+) -> int:
+    """Upsert a campaign's CRM rows into the history database in one transaction.
+
+    Rows are bound to one prepared upsert in batches of ``batch_rows``, so a
+    large campaign is bulk-loaded without building every parameter tuple up
+    front.  The campaign's new rows are folded into contact_summary in the
+    same transaction; only contacts whose earlier rows were re-logged or
+    moved, or that were mailed after ``sent_at``, are re-summarized in full.
+    Joins the caller's :meth:`CampaignDatabase.transaction` if one is open.  Returns the number of rows written; errors are reported and
+    leave the database unchanged.
+    """
 
-    WRITABLE_DATA_DIR.mkdir(parents=True, exist_ok=True)
-    ensure_local_database()
-    sent_at_iso = sent_at.isoformat(timespec="seconds")
+    payload = _campaign_history_payload(
+        records, campaign_id, mode, sent_at.isoformat(timespec="seconds")
+    )
+    written = 0
     try:
-        with sqlite3.connect(CAMPAIGN_DB_PATH) as connection:
-            _initialize_campaign_db(connection)
-
-            insert_sql = CAMPAIGN_CONTACTS_INSERT_SQL
-
-            payload = []
-            for record in records:
-                payload.append(
-                    (
-                        campaign_id,
-                        mode,
-                        sent_at_iso,
-                        str(record.get("Name", "")),
-                        str(record.get("Address", "")),
-                        str(record.get("Zip", "")) or None,
-                        str(record.get("Sale Date", "")) or None,
-                        float(record.get("Sale Price", 0.0) or 0.0),
-                        str(record.get("Email", "")) or None,
-                        str(record.get("Phone", "")) or None,
-                        str(record.get("Source", "")) or None,
-                    )
-                )
-
-            connection.executemany(insert_sql, payload)
-            connection.commit()
-
-            print(
-                f"🗄️ Logged {len(payload)} contacts to campaign history database at {CAMPAIGN_DB_PATH}"
+        with campaign_db.transaction(immediate=True) as connection:
+            # Re-logged rows keep their id and can move to another contact
+            # key, so both their previous and new contacts are re-summarized.
+            _mark_campaign_contacts(connection, campaign_id)
+            first_id = connection.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM campaign_contacts"
+            ).fetchone()[0]
+            cursor = connection.cursor()
+            while True:
+                batch = list(islice(payload, batch_rows))
+                if not batch:
+                    break
+                cursor.executemany(CAMPAIGN_CONTACTS_INSERT_SQL, batch)
+                written += len(batch)
+            connection.execute(
+                "INSERT OR IGNORE INTO temp.touched_contacts "
+                "SELECT contact_key FROM campaign_contacts "
+                "WHERE campaign_id = ? AND id <= ? AND contact_key <> ''",
+                (campaign_id, first_id),
             )
+            _fold_new_contacts(connection, first_id, sent_at.isoformat(timespec="seconds"))
+            _refresh_marked_contacts(connection)
     except sqlite3.Error as exc:
         print(f"⚠️ Failed to log campaign history: {exc}")
+        return 0
+
+    if written:
+        print(f"🗄️ Logged {written} contacts to campaign history database at {CAMPAIGN_DB_PATH}")
+    return written
 
 ZIP_LOOKUP_FILE = DATA_DIR / "zip_lookup.csv"
 MASTER_CLIENT_LIST = DATA_DIR / "master_client_list.xlsx"
@@ -533,38 +954,100 @@ def load_zip_lookup():
     if not ZIP_LOOKUP_FILE.exists():
         print(f"❌ Missing ZIP lookup file: {ZIP_LOOKUP_FILE}")
         return
-    df = pd.read_csv(ZIP_LOOKUP_FILE, dtype=str)
-    for _, row in df.iterrows():
-        raw_zip = row.get("zip")
-        normalized_zip = _normalize_zip(raw_zip)
-        if not normalized_zip:
-            continue
-        city = str(row.get("city", "")).strip()
-        state = str(row.get("state", "")).strip()
-        if not city or not state:
-            continue
-        city_state = f"{city.title()}, {state.upper()}"
-        zip_city_state[normalized_zip] = city_state
+    df = pd.read_csv(ZIP_LOOKUP_FILE, dtype=str).reindex(columns=["zip", "city", "state"])
+    normalized_zips = normalize_zip_series(df["zip"])
+    cities = df["city"].fillna("").str.strip()
+    states = df["state"].fillna("").str.strip()
+    usable = (normalized_zips != "") & (cities != "") & (states != "")
+    city_states = cities[usable].str.title() + ", " + states[usable].str.upper()
+    zip_city_state.update(zip(normalized_zips[usable], city_states))
+
+_NON_DIGIT_PATTERN = re.compile(r"\D")
 
 def _normalize_zip(zip_code):
     """Return the 5-digit portion of a ZIP code string if available."""
     if zip_code is None:
         return ""
 
-    digits_only = re.sub(r"\D", "", str(zip_code))
+    digits_only = _NON_DIGIT_PATTERN.sub("", str(zip_code))
     if len(digits_only) >= 5:
         return digits_only[:5]
     if digits_only:
         return digits_only.zfill(5)
     return ""
 
+
+# === VECTORIZED NORMALIZATION ===
+SALE_DATE_INPUT_FORMAT = '%m/%d/%Y'
+SALE_DATE_DISPLAY_FORMAT = '%B %d, %Y'
+
+
+def _transform_distinct(values, transform):
+    """Apply a vectorized ``transform`` to the distinct values of ``values`` only.
+
+    Sales exports repeat a small set of ZIPs, prices and recording dates
+    across many rows, so each distinct text is normalized once and the
+    results are broadcast back by position.
+    """
+    codes, uniques = pd.factorize(values.fillna("").astype(str))
+    transformed = transform(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+    return pd.Series(transformed[codes] if len(transformed) else [], index=values.index, dtype=object)
+
+
+def _normalize_zip_text(zip_codes):
+    digits_only = zip_codes.str.replace(_NON_DIGIT_PATTERN, "", regex=True)
+    return digits_only.str.slice(0, 5).str.zfill(5).where(digits_only != "", "")
+
+
+def _parse_sale_price_text(prices):
+    cleaned = prices.str.replace(r"[$,]", "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce").fillna(0.0).astype(float)
+
+
+def _format_sale_date_text(sale_dates):
+    parsed = pd.to_datetime(sale_dates, format=SALE_DATE_INPUT_FORMAT, errors="coerce")
+    return parsed.dt.strftime(SALE_DATE_DISPLAY_FORMAT).fillna("Unknown")
+
+
+def normalize_zip_series(zip_codes):
+    """Vectorized :func:`_normalize_zip` over a Series of ZIP values."""
+    return _transform_distinct(zip_codes, _normalize_zip_text)
+
+
+def parse_sale_price_series(prices):
+    """Return sale prices as floats, stripping ``$`` and ``,``; unparsable values become 0.0."""
+    return _transform_distinct(prices, _parse_sale_price_text).astype(float)
+
+
+def format_sale_date_series(sale_dates):
+    """Format ``MM/DD/YYYY`` sale dates for letters; anything else becomes ``Unknown``."""
+    return _transform_distinct(sale_dates, _format_sale_date_text)
+
+
+def normalize_sales_fields(fields):
+    """Add normalized ZIP, numeric sale price and display sale date columns.
+
+    Runs once per chunk of resolved sales fields so the per-row loop only
+    reads precomputed values.
+    """
+    return fields.assign(
+        site_zip_normalized=normalize_zip_series(fields["site_zip"]),
+        mailing_zip_normalized=normalize_zip_series(fields["mailing_zip"]),
+        sale_price_value=parse_sale_price_series(fields["sale_price"]),
+        sale_date_display=format_sale_date_series(fields["sale_date"]),
+    )
+
+_CONTACT_KEY_STRIP_PATTERN = re.compile(r"[^a-z0-9 ]")
+
+
 def _normalize_contact_component(value: object) -> str:
     """Normalize name or address fragments for consistent comparisons."""
 
     if value in (None, ""):
         return ""
-    normalized = re.sub(r"\s+", " ", str(value)).strip().lower()
-    return re.sub(r"[^a-z0-9 ]", "", normalized)
+    # str.split() and the regex ``\s`` agree on what counts as whitespace.
+    normalized = " ".join(str(value).split()).lower()
+    return _CONTACT_KEY_STRIP_PATTERN.sub("", normalized)
 
 
 def _compute_contact_key(
@@ -589,56 +1072,6 @@ def _compute_contact_key(
         return joined_address
     return ""
 
-def append_campaign_history(campaign_id, mode, crm_rows):
-    """Append campaign contacts to the SQLite history database."""
-
-    if not crm_rows:
-        return
-
-    ensure_local_database()
-
-    sent_at = datetime.utcnow().isoformat(timespec="seconds")
-    rows_to_insert = []
-    for row in crm_rows:
-        sale_price_raw = row.get("Sale Price", 0.0)
-        try:
-            sale_price = float(sale_price_raw or 0.0)
-        except (TypeError, ValueError):
-            sale_price = 0.0
-
-        rows_to_insert.append(
-            (
-                campaign_id,
-                mode,
-                sent_at,
-                row.get("Name", ""),
-                row.get("Address", ""),
-                row.get("Zip", ""),
-                row.get("Sale Date", ""),
-                sale_price,
-                row.get("Email", ""),
-                row.get("Phone", ""),
-                row.get("Source", ""),
-            )
-        )
-
-    try:
-        with sqlite3.connect(CAMPAIGN_DB_PATH) as connection:
-            _ensure_campaign_history_schema(connection)
-            cursor = connection.cursor()
-            cursor.executemany(CAMPAIGN_CONTACTS_INSERT_SQL, rows_to_insert)
-            connection.commit()
-        print(f"🗃️ Campaign history updated: {CAMPAIGN_DB_PATH}")
-    except sqlite3.Error as error:
-        print(f"⚠️ Failed to log campaign history: {error}")
-
-def _prepare_customer_database(connection: sqlite3.Connection) -> None:
-    """Ensure the campaign and customer tables exist for shared reporting."""
-
-    _initialize_campaign_db(connection)
-    _ensure_customers_table(connection)
-
-
 def _to_float(value: object) -> float:
     """Safely convert arbitrary values to floats, returning 0.0 on failure."""
 
@@ -650,119 +1083,89 @@ def _to_float(value: object) -> float:
         return 0.0
 
 
-def list_customers() -> List[Dict[str, object]]:
-    """Return merged contact history with saved customer outcomes."""
-
-    WRITABLE_DATA_DIR.mkdir(parents=True, exist_ok=True)
-    ensure_local_database()
-
-    with sqlite3.connect(CAMPAIGN_DB_PATH) as connection:
-        connection.row_factory = sqlite3.Row
-        _prepare_customer_database(connection)
-
-        campaign_rows = connection.execute(
-            """
-            SELECT name, address, zip, email, phone, sent_at
-            FROM campaign_contacts
-            ORDER BY datetime(sent_at) DESC, id DESC
-            """
-        ).fetchall()
+# Every summarized contact joined to its saved customer row, most recently
+# mailed first, then customers never mailed in order of their first row.  The
+# customer row per contact key is the most recently updated (lowest id on ties).
+CUSTOMER_LIST_SQL = """
+WITH status AS (
+    SELECT * FROM (
+        SELECT *,
+            ROW_NUMBER() OVER (
+                PARTITION BY contact_key ORDER BY COALESCE(updated_at, '') DESC, id
+            ) AS status_rank,
+            MIN(id) OVER (PARTITION BY contact_key) AS first_id
+        FROM customers
+        WHERE COALESCE(contact_key, '') <> ''
+    )
+    WHERE status_rank = 1
+)
+SELECT 0 AS sort_group, s.last_recency AS sort_key, s.contact_key,
+       s.name, s.address, s.zip, s.email, s.phone, s.mailings_count, s.last_sent_at,
+       st.id AS customer_id, st.name AS customer_name, st.email AS customer_email,
+       st.phone AS customer_phone, st.premium, st.home_price, st.responded, st.converted,
+       st.address AS customer_address, st.zip AS customer_zip
+FROM contact_summary AS s
+LEFT JOIN status AS st ON st.contact_key = s.contact_key
+UNION ALL
+SELECT 1, -st.first_id, st.contact_key,
+       NULL, NULL, NULL, NULL, NULL, 0, NULL,
+       st.id, st.name, st.email, st.phone, st.premium, st.home_price, st.responded,
+       st.converted, st.address, st.zip
+FROM status AS st
+WHERE NOT EXISTS (SELECT 1 FROM contact_summary AS s WHERE s.contact_key = st.contact_key)
+ORDER BY sort_group, sort_key DESC
+"""
 
-        contact_index: Dict[str, Dict[str, object]] = {}
-        for row in campaign_rows:
-            key = _compute_contact_key(row["name"], row["address"], row["zip"])
-            if not key:
-                continue
-            entry = contact_index.get(key)
-            if entry is None:
-                entry = {
-                    "contact_key": key,
-                    "name": str(row["name"] or ""),
-                    "address": str(row["address"] or ""),
-                    "zip": str(row["zip"] or ""),
-                    "email": str(row["email"] or ""),
-                    "phone": str(row["phone"] or ""),
-                    "mailings_count": 1,
-                    "last_sent_at": str(row["sent_at"] or ""),
-                }
-                contact_index[key] = entry
-            else:
-                entry["mailings_count"] += 1
-                sent_at = str(row["sent_at"] or "")
-                if sent_at and sent_at > entry.get("last_sent_at", ""):
-                    entry["last_sent_at"] = sent_at
-                for field in ("name", "address", "zip", "email", "phone"):
-                    if not entry.get(field) and row[field]:
-                        entry[field] = str(row[field])
-
-        status_rows = connection.execute(
-            """
-            SELECT id, contact_key, name, email, phone, premium, home_price,
-                   responded, converted, address, zip, updated_at
-            FROM customers
-            """
-        ).fetchall()
 
-        status_index: Dict[str, sqlite3.Row] = {}
-        for row in status_rows:
-            key = row["contact_key"] or _compute_contact_key(
-                row["name"], row["address"], row["zip"]
-            )
-            if not key:
-                continue
-            existing = status_index.get(key)
-            if existing is None:
-                status_index[key] = row
-            else:
-                current_updated = str(row["updated_at"] or "")
-                previous_updated = str(existing["updated_at"] or "")
-                if current_updated > previous_updated:
-                    status_index[key] = row
-
-        records: List[Dict[str, object]] = []
-        for key, contact in contact_index.items():
-            status = status_index.get(key)
-            premium = _to_float(status["premium"]) if status else 0.0
-            home_price = _to_float(status["home_price"]) if status else 0.0
-            record = {
-                "id": int(status["id"]) if status and status["id"] is not None else None,
-                "contact_key": key,
-                "name": (status["name"] if status and status["name"] else contact["name"]).strip(),
-                "email": (status["email"] if status and status["email"] else contact["email"]).strip(),
-                "phone": (status["phone"] if status and status["phone"] else contact["phone"]).strip(),
-                "premium": premium,
-                "home_price": home_price,
-                "responded": bool(status["responded"]) if status else False,
-                "converted": bool(status["converted"]) if status else False,
-                "address": (status["address"] if status and status["address"] else contact["address"]).strip(),
-                "zip": (status["zip"] if status and status["zip"] else contact["zip"]).strip(),
-                "mailings_count": contact["mailings_count"],
-                "last_sent_at": contact.get("last_sent_at", ""),
-            }
-            records.append(record)
+def list_customers() -> List[Dict[str, object]]:
+    """Return merged contact history with saved customer outcomes."""
 
-        for key, status in status_index.items():
-            if key in contact_index:
-                continue
-            record = {
-                "id": int(status["id"]) if status["id"] is not None else None,
-                "contact_key": key,
-                "name": str(status["name"] or ""),
-                "email": str(status["email"] or ""),
-                "phone": str(status["phone"] or ""),
-                "premium": _to_float(status["premium"]),
-                "home_price": _to_float(status["home_price"]),
-                "responded": bool(status["responded"]),
-                "converted": bool(status["converted"]),
-                "address": str(status["address"] or ""),
-                "zip": str(status["zip"] or ""),
+    with campaign_db.transaction() as connection:
+        rows = connection.execute(CUSTOMER_LIST_SQL).fetchall()
+
+    records: List[Dict[str, object]] = []
+    for row in rows:
+        has_status = row["customer_id"] is not None
+        if row["sort_group"] == 1:
+            records.append({
+                "id": int(row["customer_id"]),
+                "contact_key": row["contact_key"],
+                "name": str(row["customer_name"] or ""),
+                "email": str(row["customer_email"] or ""),
+                "phone": str(row["customer_phone"] or ""),
+                "premium": _to_float(row["premium"]),
+                "home_price": _to_float(row["home_price"]),
+                "responded": bool(row["responded"]),
+                "converted": bool(row["converted"]),
+                "address": str(row["customer_address"] or ""),
+                "zip": str(row["customer_zip"] or ""),
                 "mailings_count": 0,
                 "last_sent_at": "",
-            }
-            records.append(record)
+            })
+            continue
 
-        records.sort(key=lambda item: item.get("name", "").lower())
-        return records
+        def pick(field: str) -> str:
+            saved = row[f"customer_{field}"] if has_status else None
+            return (saved if saved else str(row[field] or "")).strip()
+
+        records.append({
+            "id": int(row["customer_id"]) if has_status else None,
+            "contact_key": row["contact_key"],
+            "name": pick("name"),
+            "email": pick("email"),
+            "phone": pick("phone"),
+            "premium": _to_float(row["premium"]) if has_status else 0.0,
+            "home_price": _to_float(row["home_price"]) if has_status else 0.0,
+            "responded": bool(row["responded"]) if has_status else False,
+            "converted": bool(row["converted"]) if has_status else False,
+            "address": pick("address"),
+            "zip": pick("zip"),
+            "mailings_count": row["mailings_count"],
+            "last_sent_at": str(row["last_sent_at"] or ""),
+        })
+
+    records.sort(key=lambda item: item.get("name", "").lower())
+    return records
 
 def save_customer(customer: Mapping[str, object]) -> int:
     """Insert or update a customer record in the database."""
@@ -783,10 +1186,7 @@ def save_customer(customer: Mapping[str, object]) -> int:
     customer_id = customer.get("id")
     contact_key = str(customer.get("contact_key", "")).strip()
 
-    WRITABLE_DATA_DIR.mkdir(parents=True, exist_ok=True)
-    ensure_local_database()
-    with sqlite3.connect(CAMPAIGN_DB_PATH) as connection:
-        _prepare_customer_database(connection)
+    with campaign_db.transaction(immediate=True) as connection:
         cursor = connection.cursor()
 
         existing_id = None
@@ -843,7 +1243,6 @@ def save_customer(customer: Mapping[str, object]) -> int:
             )
             if cursor.rowcount == 0:
                 raise ValueError("Customer not found")
-            connection.commit()
             return existing_id
 
         cursor.execute(
@@ -881,7 +1280,6 @@ def save_customer(customer: Mapping[str, object]) -> int:
                     contact_key,
                 ),
             )
-            connection.commit()
             return existing_id
 
         cursor.execute(
@@ -912,7 +1310,6 @@ def save_customer(customer: Mapping[str, object]) -> int:
                 zip_code,
             ),
         )
-        connection.commit()
         return int(cursor.lastrowid)
 
 def _compute_group_metrics(customers: Iterable[Mapping[str, object]]) -> Dict[str, float]:
@@ -1025,8 +1422,20 @@ def get_customer_metrics(filters: Optional[Mapping[str, bool]] = None) -> Dict[s
 
 def _compose_city_state_zip(row, zip_code):
     """Create a display string for city/state/ZIP using row data before falling back."""
-    city = _get_first_nonempty(row, ["Mailing City", "City"]).strip()
-    state = _get_first_nonempty(row, ["Mailing State", "State"]).strip()
+    return _format_city_state_zip(
+        _get_first_nonempty(row, SALES_FIELD_ALIASES["mailing_city"]),
+        _get_first_nonempty(row, SALES_FIELD_ALIASES["mailing_state"]),
+        zip_code,
+    )
+
+
+def _format_city_state_zip(city, state, zip_code, normalized_zip=None):
+    """Format resolved city/state values and a ZIP, falling back to the ZIP lookup.
+
+    ``normalized_zip`` may carry a precomputed :func:`_normalize_zip` result.
+    """
+    city = city.strip()
+    state = state.strip()
 
     city_formatted = city.title() if city else ""
     state_formatted = state.upper() if state else ""
@@ -1043,7 +1452,8 @@ def _compose_city_state_zip(row, zip_code):
     if zip_code is not None:
         raw_zip = str(zip_code).strip()
         if raw_zip and raw_zip.lower() != "nan":
-            normalized_zip = _normalize_zip(zip_code)
+            if normalized_zip is None:
+                normalized_zip = _normalize_zip(zip_code)
             display_zip = normalized_zip or raw_zip
 
     if location:
@@ -1051,14 +1461,15 @@ def _compose_city_state_zip(row, zip_code):
             return f"{location} {display_zip}".strip()
         return location
 
-    fallback = zip_to_city_state(zip_code)
+    fallback = zip_to_city_state(zip_code, normalized_zip)
     if fallback:
         return fallback
     return display_zip
 
 
-def zip_to_city_state(zip_code):
-    normalized_zip = _normalize_zip(zip_code)
+def zip_to_city_state(zip_code, normalized_zip=None):
+    if normalized_zip is None:
+        normalized_zip = _normalize_zip(zip_code)
     city_state = zip_city_state.get(normalized_zip, "Indian River County, FL") if normalized_zip else "Indian River County, FL"
     display_zip = normalized_zip or str(zip_code).strip()
     if not display_zip or display_zip.lower() in {"nan", ""}:
@@ -1066,73 +1477,537 @@ def zip_to_city_state(zip_code):
     return f"{city_state} {display_zip}".strip()
 
 # === LOAD CLIENT LIST FOR SCRUBBING ===
-def load_client_list():
+CLIENT_INDEX_FORMAT_VERSION = 2
+
+CLIENT_INDEX_TABLES_SQL = (
+    """
+    CREATE TABLE IF NOT EXISTS client_index_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS client_index (
+        position INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        mailing_address TEXT NOT NULL,
+        name_normalized TEXT NOT NULL,
+        address_normalized TEXT NOT NULL
+    )
+    """,
+)
+
+
+def _file_sha256(path):
+    """Return the hex SHA-256 digest of a file, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _client_list_signature():
+    """Return the master workbook's format/source/size/mtime signature as stored in client_index_meta."""
+    stat = MASTER_CLIENT_LIST.stat()
+    return {
+        "format_version": str(CLIENT_INDEX_FORMAT_VERSION),
+        "source": str(MASTER_CLIENT_LIST.resolve()),
+        "size": str(stat.st_size),
+        "mtime_ns": str(stat.st_mtime_ns),
+    }
+
+
+def _refresh_client_index_cache(connection):
+    """Rebuild the persisted client index if the master workbook changed.
+
+    The cache is trusted while the workbook's size and mtime match the stored
+    signature.  When either differs the content hash decides: an unchanged hash
+    only refreshes the signature, anything else re-parses the workbook.
+    Returns True when the index was rebuilt.
+    """
+    for statement in CLIENT_INDEX_TABLES_SQL:
+        connection.execute(statement)
+    meta = dict(connection.execute("SELECT key, value FROM client_index_meta"))
+
+    signature = _client_list_signature()
+    if all(meta.get(key) == value for key, value in signature.items()):
+        return False
+
+    signature["sha256"] = _file_sha256(MASTER_CLIENT_LIST)
+    if (
+        meta.get("sha256") == signature["sha256"]
+        and meta.get("format_version") == signature["format_version"]
+    ):
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO client_index_meta (key, value) VALUES (?, ?)",
+                signature.items(),
+            )
+        return False
+
+    df = pd.read_excel(MASTER_CLIENT_LIST)
+    rows = []
+    for position, client in enumerate(df[['Name', 'Mailing Address']].dropna().to_dict('records')):
+        client_name = str(client['Name'])
+        client_address = str(client['Mailing Address'])
+        rows.append(
+            (
+                position,
+                client_name,
+                client_address,
+                client_name.lower().strip(),
+                client_address.lower().strip(),
+            )
+        )
+
+    with connection:
+        # Older format versions stored blocking-key columns, so recreate the table.
+        connection.execute("DROP TABLE IF EXISTS client_index")
+        connection.execute(CLIENT_INDEX_TABLES_SQL[1])
+        connection.executemany(
+            "INSERT INTO client_index VALUES (?, ?, ?, ?, ?)", rows
+        )
+        connection.execute("DELETE FROM client_index_meta")
+        connection.executemany(
+            "INSERT INTO client_index_meta (key, value) VALUES (?, ?)",
+            signature.items(),
+        )
+    print(f"🗂️ Rebuilt client index cache with {len(rows)} clients: {CLIENT_INDEX_DB_PATH}")
+    return True
+
+
+def client_index_version():
+    """Return the content hash of the master client list, or '' if it is missing.
+
+    Does not load or rebuild the index: the hash stored in client_index_meta
+    is reused while the workbook's signature still matches, otherwise the
+    workbook itself is hashed.
+    """
+    if not MASTER_CLIENT_LIST.exists():
+        return ""
+    signature = _client_list_signature()
+    try:
+        with sqlite3.connect(CLIENT_INDEX_DB_PATH) as connection:
+            meta = dict(connection.execute("SELECT key, value FROM client_index_meta"))
+    except sqlite3.Error:
+        meta = {}
+    if meta.get("sha256") and all(meta.get(key) == value for key, value in signature.items()):
+        sha256 = meta["sha256"]
+    else:
+        sha256 = _file_sha256(MASTER_CLIENT_LIST)
+    return f"{CLIENT_INDEX_FORMAT_VERSION}:{sha256}"
+
+
+def _load_cached_client_rows(columns):
+    """Return ``columns`` for every cached client, or None if unavailable."""
     if not MASTER_CLIENT_LIST.exists():
         print(f"❌ Master client list not found: {MASTER_CLIENT_LIST}")
-        return []
+        return None
     try:
-        df = pd.read_excel(MASTER_CLIENT_LIST)
-        return df[['Name', 'Mailing Address']].dropna().to_dict('records')
+        WRITABLE_DATA_DIR.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(CLIENT_INDEX_DB_PATH) as connection:
+            _refresh_client_index_cache(connection)
+            return connection.execute(
+                f"SELECT {columns} FROM client_index ORDER BY position"
+            ).fetchall()
     except Exception as e:
         print(f"⚠️ Failed to load master client list: {e}")
+        return None
+
+
+def load_client_list():
+    rows = _load_cached_client_rows("name, mailing_address")
+    if rows is None:
         return []
+    return [{'Name': name, 'Mailing Address': address} for name, address in rows]
 
-# === CHECK IF RECORD IS IN CLIENT LIST ===
-def is_existing_client(name, mailing_address, client_list):
-    if not client_list:
-        return False
+# === CLIENT MATCH INDEX ===
+CLIENT_MATCH_THRESHOLD = 85
+
+
+def _min_shared_bigrams(lengths):
+    """Return the fewest bigrams a pair must share to pass ``partial_ratio``.
+
+    ``lengths`` holds the length of the shorter string of each pair.
+    ``partial_ratio`` scores the shorter string against windows of the longer
+    one that are at most as long, and a window only scores above
+    ``CLIENT_MATCH_THRESHOLD`` when fewer than ``100 - CLIENT_MATCH_THRESHOLD``
+    percent of their combined characters are insertions or deletions.  Each
+    edit breaks at most two of the shorter string's ``length - 1`` bigrams and
+    every unbroken bigram also occurs in the longer string, so a pair sharing
+    fewer bigrams (counted with multiplicity) cannot match.  Values of zero or
+    less mean the pair can never be ruled out.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    max_edits = np.maximum((2 * (100 - CLIENT_MATCH_THRESHOLD) * lengths - 1) // 100, 0)
+    return lengths - 1 - 2 * max_edits
+
+
+def _bigram_codes(text):
+    """Return one integer code per two-character window of ``text``."""
+    chars = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    return (chars[:-1] << 21) | chars[1:]
+
+
+class _BigramPostings:
+    """Bigram postings over one normalized client column.
+
+    ``postings`` maps a bigram code to the ascending client positions that
+    contain it and how often each one does.
+    """
+
+    def __init__(self, values):
+        self.lengths = np.fromiter((len(value) for value in values), dtype=np.int64, count=len(values))
+        self.postings = {}
+        if not values:
+            return
+        codes = _bigram_codes("\x00".join(values))
+        # Each value owns its characters plus the separator that follows it;
+        # windows touching a separator are dropped, whatever the text contains.
+        owners = np.repeat(np.arange(len(values), dtype=np.int32), self.lengths + 1)[:-1]
+        real = np.ones(len(owners), dtype=bool)
+        real[np.cumsum(self.lengths[:-1] + 1) - 1] = False
+        inside = real[:-1] & real[1:]
+        codes, owners = codes[inside], owners[:-1][inside]
+        if not codes.size:
+            return
+
+        order = np.lexsort((owners, codes))
+        codes, owners = codes[order], owners[order]
+        run_starts = np.flatnonzero(
+            np.concatenate(([True], (codes[1:] != codes[:-1]) | (owners[1:] != owners[:-1])))
+        )
+        counts = np.diff(np.append(run_starts, len(codes))).astype(np.int32)
+        codes, owners = codes[run_starts], owners[run_starts]
+        group_starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+        group_ends = np.append(group_starts[1:], len(codes))
+        for code, start, end in zip(
+            codes[group_starts].tolist(), group_starts.tolist(), group_ends.tolist()
+        ):
+            self.postings[code] = (owners[start:end], counts[start:end])
+
+    def candidates(self, value, positions=None):
+        """Return the client positions (optionally within ``positions``) that may match ``value``."""
+        if positions is None:
+            shared = np.zeros(len(self.lengths), dtype=np.int32)
+        else:
+            shared = np.zeros(len(positions), dtype=np.int32)
+        codes, code_counts = np.unique(_bigram_codes(value), return_counts=True)
+        for code, count in zip(codes.tolist(), code_counts.tolist()):
+            posting = self.postings.get(code)
+            if posting is None:
+                continue
+            owners, counts = posting
+            if positions is None:
+                shared[owners] += np.minimum(counts, count)
+                continue
+            found = np.minimum(np.searchsorted(owners, positions), len(owners) - 1)
+            hits = owners[found] == positions
+            shared[hits] += np.minimum(counts[found[hits]], count)
+
+        lengths = self.lengths if positions is None else self.lengths[positions]
+        keep = shared >= _min_shared_bigrams(np.minimum(lengths, len(value)))
+        return np.flatnonzero(keep) if positions is None else positions[keep]
+
+
+class ClientMatchIndex:
+    """Filtered lookup over the master client list.
+
+    Names and addresses are indexed by their two-character windows.  A sales
+    row is fuzzy-scored only against clients that share enough bigrams with
+    both its name and its address to possibly clear the threshold (see
+    :func:`_min_shared_bigrams`).  The filter never drops a pair that
+    ``partial_ratio`` would accept, so decisions are identical to the linear
+    scan in :func:`is_existing_client`.
+    """
+
+    def __init__(self, client_list=()):
+        self._build([
+            (
+                str(client.get('Name', '')).lower().strip(),
+                str(client.get('Mailing Address', '')).lower().strip(),
+            )
+            for client in client_list or []
+        ])
+
+    @classmethod
+    def from_normalized(cls, rows):
+        """Build an index from persisted ``(name, address)`` rows, already lowered and stripped."""
+        index = cls()
+        index._build([tuple(row) for row in rows])
+        return index
+
+    def __len__(self):
+        return len(self.clients)
+
+    def _build(self, clients):
+        self.clients = clients
+        self.names = _BigramPostings([client_name for client_name, _ in clients])
+        self.addresses = _BigramPostings([client_address for _, client_address in clients])
+
+    def candidates(self, name, mailing_address):
+        """Return the ascending array of client positions that must be scored for the given row."""
+        positions = self.names.candidates(name)
+        if positions.size:
+            positions = self.addresses.candidates(mailing_address, positions)
+        return positions
+
+    def matches(self, name, mailing_address):
+        """Return True if any candidate client passes both fuzzy thresholds."""
+        name = str(name).lower().strip()
+        mailing_address = str(mailing_address).lower().strip()
+        for position in self.candidates(name, mailing_address).tolist():
+            client_name, client_address = self.clients[position]
+            if (fuzz.partial_ratio(name, client_name) > CLIENT_MATCH_THRESHOLD and
+                fuzz.partial_ratio(mailing_address, client_address) > CLIENT_MATCH_THRESHOLD):
+                return True
+        return False
+
+
+def load_client_index():
+    """Return a :class:`ClientMatchIndex` backed by the persisted client cache.
+
+    Routine runs read the pre-normalized names and addresses from
+    ``client_index.db`` and skip the Excel parse entirely.
+    """
+    rows = _load_cached_client_rows("name_normalized, address_normalized")
+    return ClientMatchIndex.from_normalized(rows or [])
+
+
+def build_client_index(client_list=None):
+    """Build a :class:`ClientMatchIndex` once per run from the master client list."""
+    if client_list is None:
+        return load_client_index()
+    return ClientMatchIndex(client_list)
+
+
+# === CHECK IF RECORD IS IN CLIENT LIST ===
+def is_existing_client(name, mailing_address, client_list):
+    if not client_list:
+        return False
+    if isinstance(client_list, ClientMatchIndex):
+        return client_list.matches(name, mailing_address)
     name = str(name).lower().strip()
     mailing_address = str(mailing_address).lower().strip()
     for client in client_list:
         client_name = str(client.get('Name', '')).lower().strip()
         client_address = str(client.get('Mailing Address', '')).lower().strip()
-        if (fuzz.partial_ratio(name, client_name) > 85 and
-            fuzz.partial_ratio(mailing_address, client_address) > 85):
+        if (fuzz.partial_ratio(name, client_name) > CLIENT_MATCH_THRESHOLD and
+            fuzz.partial_ratio(mailing_address, client_address) > CLIENT_MATCH_THRESHOLD):
             return True
     return False
 
+# === BATCH CLIENT SCRUB ===
+SCRUB_CHUNK_ROWS = 256
+
+
+def _rapid_candidate_pairs(values, client_values):
+    """Return a boolean array of the pairs rapidfuzz scores at or above the threshold.
+
+    ``values`` and ``client_values`` are scored element-wise on every core.
+    rapidfuzz's ``partial_ratio`` searches every alignment, so it never scores
+    a pair below fuzzywuzzy's heuristic: a pair left out here cannot pass
+    :func:`is_existing_client`.  Scores are rounded to ``uint8``; keeping
+    ``>= CLIENT_MATCH_THRESHOLD`` stays on the safe side of that rounding.
+    """
+    return rapid_process.cpdist(
+        values,
+        client_values,
+        scorer=rapid_fuzz.partial_ratio,
+        score_cutoff=CLIENT_MATCH_THRESHOLD,
+        dtype=np.uint8,
+        workers=-1,
+    ) >= CLIENT_MATCH_THRESHOLD
+
+
+def _batch_existing_client_flags(names, mailing_addresses, client_index, chunk_rows):
+    """Decide every ``(name, address)`` pair in chunked, multi-core passes.
+
+    For each chunk the :class:`ClientMatchIndex` candidates of every row are
+    gathered into one list of pairs.  Names and then the surviving addresses
+    are scored with rapidfuzz across all cores, and the pairs left are
+    confirmed with the fuzzywuzzy test from :func:`is_existing_client`, so
+    decisions are identical to it.
+    """
+    flags = np.zeros(len(names), dtype=bool)
+    if not len(client_index) or not names:
+        return flags
+
+    client_names = np.array([client_name for client_name, _ in client_index.clients], dtype=object)
+    client_addresses = np.array(
+        [client_address for _, client_address in client_index.clients], dtype=object
+    )
+    for start in range(0, len(names), chunk_rows):
+        stop = min(start + chunk_rows, len(names))
+        candidates = [
+            client_index.candidates(names[row], mailing_addresses[row]) for row in range(start, stop)
+        ]
+        rows = np.repeat(np.arange(start, stop), [len(positions) for positions in candidates])
+        if not rows.size:
+            continue
+        positions = np.concatenate(candidates)
+        keep = _rapid_candidate_pairs([names[row] for row in rows.tolist()], client_names[positions].tolist())
+        rows, positions = rows[keep], positions[keep]
+        keep = _rapid_candidate_pairs(
+            [mailing_addresses[row] for row in rows.tolist()], client_addresses[positions].tolist()
+        )
+        for row, position in zip(rows[keep].tolist(), positions[keep].tolist()):
+            if flags[row]:
+                continue
+            client_name, client_address = client_index.clients[position]
+            if (fuzz.partial_ratio(names[row], client_name) > CLIENT_MATCH_THRESHOLD and
+                fuzz.partial_ratio(mailing_addresses[row], client_address) > CLIENT_MATCH_THRESHOLD):
+                flags[row] = True
+    return flags
+
+
+def scrub_existing_clients(
+    df,
+    client_list,
+    name_column="Name",
+    address_column="Mailing Address",
+    result_column="Existing Client",
+    chunk_rows=SCRUB_CHUNK_ROWS,
+):
+    """Flag every row of ``df`` that matches the master client list.
+
+    Names and addresses are lowered and stripped once and duplicate pairs are
+    decided once.  With rapidfuzz installed the pairs go through
+    :func:`_batch_existing_client_flags`; otherwise each one is checked
+    through :class:`ClientMatchIndex`.  Both give the same decisions as
+    :func:`is_existing_client`.  Returns ``df`` with a boolean
+    ``result_column`` added.
+    """
+    if not isinstance(client_list, ClientMatchIndex):
+        client_list = build_client_index(client_list)
+
+    names = [str(value).lower().strip() for value in df[name_column].tolist()]
+    mailing_addresses = [
+        str(value).lower().strip() for value in df[address_column].tolist()
+    ]
+    pairs = list(dict.fromkeys(zip(names, mailing_addresses)))
+    if rapid_process is not None:
+        decided = _batch_existing_client_flags(
+            [name for name, _ in pairs], [address for _, address in pairs], client_list, chunk_rows
+        )
+    else:
+        decided = [client_list.matches(name, address) for name, address in pairs]
+    decisions = dict(zip(pairs, decided))
+    df[result_column] = np.array(
+        [decisions[pair] for pair in zip(names, mailing_addresses)], dtype=bool
+    )
+    return df
+
 # === CLEAN NAME ===
+NAME_CACHE_SIZE = 65536
+_name_batch_counts = {"rows": 0, "distinct": 0}
+
+
 def clean_name(row, mode):
     if mode == "personal":
-        raw_name = _get_first_nonempty(row, ['Owner Name', 'Owner'])
-        name_parts = [part.strip() for part in raw_name.split('||')]
-        last_names = []
-        first_names = []
-        for part in name_parts:
-            name_no_suffix = part.split('(')[0].strip()
-            words = _clean_name_tokens(name_no_suffix)
-            if len(words) >= 2:
-                last_names.append(words[0].title())
-                first_name = _format_given_names(words[1:])
-                first_names.append(first_name)
-            elif len(words) == 1:
-                last_names.append("")
-                ffirst_names.append(_format_given_names([words[0]]))
-            else:
-                last_names.append("")
-                first_names.append("")
-        unique_last_names = set([ln for ln in last_names if ln])
-        if len(unique_last_names) == 1:
-            last_name = unique_last_names.pop()
-            combined_first_names = " & ".join([fn for fn in first_names if fn])
-            full_name = f"{combined_first_names} {last_name}".strip()
-        else:
-            full_name = " & ".join(
-                [f"{fn} {ln}".strip() for fn, ln in zip(first_names, last_names) if fn or ln]
-            )
-        return full_name or "Valued Customer"
+        raw_name = _get_first_nonempty(row, SALES_FIELD_ALIASES["owner_name"])
     else:  # commercial
-        first_name = str(row.get('Executive First Name', '')).strip()
-        last_name = str(row.get('Executive Last Name', '')).strip()
-        first_tokens = _clean_name_tokens(first_name)
-        last_tokens = _clean_name_tokens(last_name)
-        cleaned_first_name = _format_given_names(first_tokens)
-        cleaned_last_name = " ".join(token.title() for token in last_tokens)
-        if cleaned_first_name and cleaned_last_name:
-            return f"{cleaned_first_name} {cleaned_last_name}".strip()
-        legal_name = str(row.get('Legal Name', '')).strip()
-        company_name = str(row.get('Company Name', '')).strip()
-        return legal_name.title() or company_name.title() or "Valued Business"
+        raw_name = (
+            str(row.get('Executive First Name', '')).strip(),
+            str(row.get('Executive Last Name', '')).strip(),
+            str(row.get('Legal Name', '')).strip(),
+            str(row.get('Company Name', '')).strip(),
+        )
+    return _cached_clean_name(raw_name, mode)
+
+
+def clean_names(raw_names, mode):
+    """Clean a Series of raw names, formatting each distinct value only once.
+
+    In personal mode the values are raw owner strings; in commercial mode they
+    are ``(first, last, legal, company)`` tuples.  Returns a Series aligned
+    with ``raw_names``; a name that fails to clean holds its exception so
+    only the rows carrying it are skipped.
+    """
+    distinct = {}
+    for raw_name in dict.fromkeys(raw_names):
+        try:
+            distinct[raw_name] = _cached_clean_name(raw_name, mode)
+        except Exception as e:
+            distinct[raw_name] = e
+    _name_batch_counts["rows"] += len(raw_names)
+    _name_batch_counts["distinct"] += len(distinct)
+    return pd.Series(
+        [distinct[raw_name] for raw_name in raw_names], index=raw_names.index, dtype=object
+    )
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _cached_clean_name(raw_name, mode):
+    if mode == "personal":
+        return _clean_owner_name(raw_name)
+    return _clean_executive_name(*raw_name)
+
+
+def name_cache_stats():
+    """Return hit/miss counters for the name-cleaning cache.
+
+    ``hits`` and ``misses`` count lookups in the LRU cache; ``batch_rows`` and
+    ``batch_distinct`` show how many rows :func:`clean_names` saw versus how
+    many distinct names it actually looked up.
+    """
+    info = _cached_clean_name.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "batch_rows": _name_batch_counts["rows"],
+        "batch_distinct": _name_batch_counts["distinct"],
+    }
+
+
+def clear_name_cache():
+    """Empty the name-cleaning cache and reset its counters."""
+    _cached_clean_name.cache_clear()
+    _name_batch_counts.update(rows=0, distinct=0)
+
+
+def _clean_owner_name(raw_name):
+    """Format a raw ``LAST FIRST || LAST FIRST`` owner string for letters."""
+    name_parts = [part.strip() for part in raw_name.split('||')]
+    last_names = []
+    first_names = []
+    for part in name_parts:
+        name_no_suffix = part.split('(')[0].strip()
+        words = _clean_name_tokens(name_no_suffix)
+        if len(words) >= 2:
+            last_names.append(words[0].title())
+            first_name = _format_given_names(words[1:])
+            first_names.append(first_name)
+        elif len(words) == 1:
+            last_names.append("")
+            first_names.append(_format_given_names([words[0]]))
+        else:
+            last_names.append("")
+            first_names.append("")
+    unique_last_names = set([ln for ln in last_names if ln])
+    if len(unique_last_names) == 1:
+        last_name = unique_last_names.pop()
+        combined_first_names = " & ".join([fn for fn in first_names if fn])
+        full_name = f"{combined_first_names} {last_name}".strip()
+    else:
+        full_name = " & ".join(
+            [f"{fn} {ln}".strip() for fn, ln in zip(first_names, last_names) if fn or ln]
+        )
+    return full_name or "Valued Customer"
+
+
+def _clean_executive_name(first_name, last_name, legal_name, company_name):
+    """Format a commercial contact, falling back to the legal or company name."""
+    first_tokens = _clean_name_tokens(first_name)
+    last_tokens = _clean_name_tokens(last_name)
+    cleaned_first_name = _format_given_names(first_tokens)
+    cleaned_last_name = " ".join(token.title() for token in last_tokens)
+    if cleaned_first_name and cleaned_last_name:
+        return f"{cleaned_first_name} {cleaned_last_name}".strip()
+    return legal_name.title() or company_name.title() or "Valued Business"
 
 def _has_minimum_name_parts(name, min_parts=2):
     """Return True if the cleaned name contains at least ``min_parts`` distinct words."""
@@ -1205,7 +2080,122 @@ def is_valid_business(business_type):
 
     return True
 
+# === SIGNATURE CACHE ===
+# Letters place the signature at 1.5" x 0.5"; the source PNGs are scanned far
+# larger.  Each source is reduced to print resolution once and the result is
+# kept in the writable data dir, named by the source's SHA-1.
+SIGNATURE_WIDTH = 1.5
+SIGNATURE_HEIGHT = 0.5
+SIGNATURE_PRINT_DPI = 300
+SIGNATURE_CACHE_DIR = WRITABLE_DATA_DIR / "signature_cache"
+
+
+def _decode_png(data):
+    """Return an 8-bit non-interlaced PNG as a (height, width, channels) array, or None."""
+    parsed = _parse_png(data)
+    if parsed is None:
+        return None
+    (width, height, bit_depth, color_type, _, _, interlace), compressed = parsed
+    channels = {0: 1, 2: 3, 4: 2, 6: 4}.get(color_type)
+    if channels is None or interlace or bit_depth != 8:
+        return None
+    raw = _inflate_png(compressed, width, height, channels)
+    if raw is None:
+        return None
+    return _unfilter_png(raw, width, height, channels).reshape(height, width, channels)
+
+
+def _encode_png(pixels):
+    """Encode a (height, width, channels) uint8 array as a PNG using the Up filter."""
+    height, width, channels = pixels.shape
+    rows = pixels.reshape(height, width * channels)
+    filtered = np.empty((height, width * channels + 1), dtype=np.uint8)
+    filtered[:, 0] = 2
+    filtered[0, 1:] = rows[0]
+    filtered[1:, 1:] = rows[1:] - rows[:-1]
+
+    def chunk(chunk_type, body):
+        return struct.pack(">I", len(body)) + chunk_type + body + struct.pack(">I", zlib.crc32(chunk_type + body))
+
+    color_type = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)),
+        chunk(b"IDAT", zlib.compress(filtered.tobytes(), 9)),
+        chunk(b"IEND", b""),
+    ])
+
+
+def _downsample_pixels(pixels, width, height):
+    """Area-average pixels down to ``width`` x ``height``, weighting colour by alpha."""
+    source_height, source_width, channels = pixels.shape
+    values = pixels.astype(np.float64)
+    has_alpha = channels in (2, 4)
+    if has_alpha:
+        values[:, :, :-1] *= values[:, :, -1:] / 255.0
+    row_edges = np.arange(height) * source_height // height
+    column_edges = np.arange(width) * source_width // width
+    sums = np.add.reduceat(np.add.reduceat(values, row_edges, axis=0), column_edges, axis=1)
+    counts = np.outer(np.diff(row_edges, append=source_height), np.diff(column_edges, append=source_width))
+    values = sums / counts[:, :, None]
+    if has_alpha:
+        alpha = values[:, :, -1:]
+        values[:, :, :-1] = np.divide(
+            values[:, :, :-1] * 255.0, alpha, out=np.zeros_like(values[:, :, :-1]), where=alpha > 0
+        )
+    return np.clip(np.rint(values), 0, 255).astype(np.uint8)
+
+
+@lru_cache(maxsize=32)
+def _prepared_signature(source, modified_ns, size):
+    source = Path(source)
+    data = source.read_bytes()
+    width = round(SIGNATURE_WIDTH * SIGNATURE_PRINT_DPI)
+    height = round(SIGNATURE_HEIGHT * SIGNATURE_PRINT_DPI)
+    target = SIGNATURE_CACHE_DIR / f"{source.stem}_{hashlib.sha1(data).hexdigest()[:16]}_{width}x{height}.png"
+    if target.exists():
+        return target
+    pixels = _decode_png(data)
+    if pixels is None or pixels.shape[0] <= height or pixels.shape[1] <= width:
+        return source
+    try:
+        SIGNATURE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        partial.write_bytes(_encode_png(_downsample_pixels(pixels, width, height)))
+        os.replace(partial, target)
+    except OSError as e:
+        print(f"⚠️ Could not cache signature image, using the original: {e}")
+        return source
+    print(f"🖋️ Signature image reduced to print size: {target.name}")
+    return target
+
+
+def prepare_signature_image(signature_image):
+    """Return the print-resolution copy of a signature image, or None if it is missing.
+
+    Images that are already small or cannot be decoded are returned as-is.
+    Results are memoized per source path, modification time and size.
+    """
+    if not signature_image:
+        return None
+    try:
+        stat = os.stat(signature_image)
+    except OSError:
+        return None
+    return _prepared_signature(os.fspath(signature_image), stat.st_mtime_ns, stat.st_size)
+
 # === ADD LETTER TO DOC ===
+def _letter_county(zip_code):
+    """Return the county name used for the ``[County]`` placeholder."""
+    city_state = zip_to_city_state(zip_code)
+    return "Indian River" if "County" in city_state else city_state.split("County")[0].strip()
+
+
+def _personalize_letter_content(content, name, zip_code):
+    """Fill the ``[Name]`` and ``[County]`` placeholders of the letter body."""
+    return content.replace("[Name]", name).replace("[County]", _letter_county(zip_code))
+
+
 def add_letter_to_doc(doc, name, address, zip_code, sale_date, sale_price, content, mode, subject_line, signature_name, signature_title, signature_image, signature_email):
     today = datetime.now().strftime('%B %d, %Y')
 
@@ -1226,15 +2216,11 @@ def add_letter_to_doc(doc, name, address, zip_code, sale_date, sale_price, conte
 
     add_compact_paragraph(subject_line, bold=True, space_after=10)
 
-    city_state = zip_to_city_state(zip_code)
-    county_name = "Indian River" if "County" in city_state else city_state.split("County")[0].strip()
-    personalized_content = content.replace("[Name]", name).replace("[County]", county_name)
-
-    doc.add_paragraph(personalized_content)
+    doc.add_paragraph(_personalize_letter_content(content, name, zip_code))
 
-    signature_image_path = os.fspath(signature_image) if signature_image else None
-    if signature_image_path and os.path.exists(signature_image_path):
-        doc.add_picture(signature_image_path, width=Inches(1.5), height=Inches(0.5))
+    signature_path = prepare_signature_image(signature_image)
+    if signature_path:
+        doc.add_picture(os.fspath(signature_path), width=Inches(SIGNATURE_WIDTH), height=Inches(SIGNATURE_HEIGHT))
     else:
         print(f"❌ Signature image not found: {signature_image}")
 
@@ -1244,9 +2230,62 @@ def add_letter_to_doc(doc, name, address, zip_code, sale_date, sale_price, conte
 
     doc.add_page_break()
 
+# === LETTER SKELETON ===
+class LetterSkeleton:
+    """Clone one fully built letter for every recipient instead of rebuilding it.
+
+    The first letter of a run is rendered through :func:`add_letter_to_doc`,
+    which also embeds the signature image in the document once.  Its body
+    elements become the skeleton: every later letter is a deep copy of that
+    XML with only the greeting and letter body text swapped, reusing the
+    image relationship.  Drawing ids continue the sequence python-docx would
+    have assigned, so the saved document matches the one built call by call.
+    """
+
+    # Positions of the per-recipient paragraphs among a letter's body elements:
+    # four blank lines, the date, then the greeting; the subject, then the body.
+    GREETING_INDEX = 5
+    CONTENT_INDEX = 7
+
+    def __init__(self, doc, content, mode, subject_line, signature_name, signature_title, signature_image, signature_email):
+        self.doc = doc
+        self.content = content
+        self.letter_options = (content, mode, subject_line, signature_name, signature_title, signature_image, signature_email)
+        self.elements = None
+        self.sect_pr = None
+        self.doc_pr_id = 0
+
+    def add(self, name, address, zip_code, sale_date, sale_price):
+        """Append one recipient's letter to the document."""
+        body = self.doc.element.body
+        if self.elements is None:
+            self.sect_pr = body.sectPr
+            existing = len(body)
+            add_letter_to_doc(self.doc, name, address, zip_code, sale_date, sale_price, *self.letter_options)
+            trailing = 1 if self.sect_pr is not None else 0
+            self.elements = list(body)[existing - trailing:len(body) - trailing]
+            doc_pr_ids = [int(value) for value in body.xpath(".//wp:docPr/@id")]
+            self.doc_pr_id = max(doc_pr_ids, default=0)
+            return
+
+        clones = [copy.deepcopy(element) for element in self.elements]
+        clones[self.GREETING_INDEX].r_lst[0].text = f"Dear {name},"
+        clones[self.CONTENT_INDEX].r_lst[0].text = _personalize_letter_content(self.content, name, zip_code)
+        for clone in clones[self.CONTENT_INDEX + 1:]:
+            for doc_pr in clone.iter(qn("wp:docPr")):
+                self.doc_pr_id += 1
+                doc_pr.set("id", str(self.doc_pr_id))
+                doc_pr.set("name", f"Picture {self.doc_pr_id}")
+
+        for clone in clones:
+            if self.sect_pr is not None:
+                self.sect_pr.addprevious(clone)
+            else:
+                body.append(clone)
+
 # === ADD ENVELOPE TO DOC ===
-def add_envelope_to_doc(doc, name, address, location_line, signature_name):
-    section = doc.add_section()
+def setup_envelope_section(section):
+    """Apply the #10 envelope page geometry to ``section``."""
     section.page_width = Inches(9.5)
     section.page_height = Inches(4.125)
     section.left_margin = Inches(0.5)
@@ -1254,6 +2293,21 @@ def add_envelope_to_doc(doc, name, address, location_line, signature_name):
     section.top_margin = Inches(0.5)
     section.bottom_margin = Inches(0.5)
 
+
+def create_envelope_document():
+    """Return a new document whose single section is set up for #10 envelopes."""
+    doc = Document()
+    setup_envelope_section(doc.sections[0])
+    return doc
+
+
+def add_envelope_to_doc(doc, name, address, location_line, signature_name):
+    """Append one envelope page; ``doc`` must come from :func:`create_envelope_document`.
+
+    Envelopes share the document's single section and are separated by page
+    breaks only, so the file carries one ``sectPr`` however many recipients
+    it holds.
+    """
     return_address = f"{signature_name}\n{YOUR_ADDRESS}"
     sender = doc.add_paragraph(return_address)
     sender.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
@@ -1274,54 +2328,1872 @@ def add_envelope_to_doc(doc, name, address, location_line, signature_name):
 
     doc.add_page_break()
 
+# === ATOMIC FILE OUTPUT ===
+def partial_output_path(path):
+    """Hidden sibling that an artifact is written to before it replaces ``path``."""
+    path = Path(path)
+    return path.with_name(f".{path.name}.partial")
+
+
+@contextmanager
+def atomic_output(path):
+    """Yield a partial path that replaces ``path`` only if the block completes."""
+    partial = partial_output_path(path)
+    try:
+        yield partial
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+
 # === CREATE LABELS DOC ===
-def create_labels(label_data, labels_file):
-    labels_file = Path(labels_file)
-    doc = Document()
-    section = doc.sections[0]
-    section.page_width = Inches(8.5)
-    section.page_height = Inches(11)
-    section.top_margin = Inches(0.5)
-    section.bottom_margin = Inches(0.5)
-    section.left_margin = Inches(0.19)
-    section.right_margin = Inches(0.19)
+# Sheet geometry in inches, from the Avery templates.  ``column_gap`` is the
+# horizontal gutter between labels; it becomes an empty spacer column in the
+# page table.  New sheet sizes only need a new entry here.
+AVERY_LABEL_FORMATS = {
+    "5160": {
+        "description": "Address labels, 1\" x 2-5/8\", 30 per sheet",
+        "page_width": 8.5, "page_height": 11.0, "top_margin": 0.5, "left_margin": 0.1875,
+        "label_width": 2.625, "label_height": 1.0, "column_gap": 0.125, "columns": 3, "rows": 10,
+    },
+    "5161": {
+        "description": "Address labels, 1\" x 4\", 20 per sheet",
+        "page_width": 8.5, "page_height": 11.0, "top_margin": 0.5, "left_margin": 0.15625,
+        "label_width": 4.0, "label_height": 1.0, "column_gap": 0.1875, "columns": 2, "rows": 10,
+    },
+    "5163": {
+        "description": "Shipping labels, 2\" x 4\", 10 per sheet",
+        "page_width": 8.5, "page_height": 11.0, "top_margin": 0.5, "left_margin": 0.15625,
+        "label_width": 4.0, "label_height": 2.0, "column_gap": 0.1875, "columns": 2, "rows": 5,
+    },
+    "8160": {
+        "description": "Inkjet address labels, 1\" x 2-5/8\", 30 per sheet",
+        "page_width": 8.5, "page_height": 11.0, "top_margin": 0.5, "left_margin": 0.1875,
+        "label_width": 2.625, "label_height": 1.0, "column_gap": 0.125, "columns": 3, "rows": 10,
+    },
+}
+DEFAULT_LABEL_FORMAT = "5160"
+LABEL_FONT_SIZE = 10.5
+LABEL_PAGE_BREAK_ROOM = 0.1  # inches left under the grid for the page-break paragraph
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+
+def get_label_format(label_format=DEFAULT_LABEL_FORMAT):
+    """Return the geometry for an Avery format number (or a geometry dict as-is)."""
+    if isinstance(label_format, dict):
+        return label_format
+    try:
+        return AVERY_LABEL_FORMATS[str(label_format)]
+    except KeyError:
+        raise ValueError(
+            f"Unknown label format '{label_format}'. Choose one of: {', '.join(AVERY_LABEL_FORMATS)}"
+        ) from None
+
+
+def setup_label_section(section, geometry):
+    """Size a section for one label sheet; the bottom margin leaves room for a page break."""
+    grid_height = geometry["rows"] * geometry["label_height"]
+    section.page_width = Inches(geometry["page_width"])
+    section.page_height = Inches(geometry["page_height"])
+    section.top_margin = Inches(geometry["top_margin"])
+    section.bottom_margin = Inches(
+        max(geometry["page_height"] - geometry["top_margin"] - grid_height - LABEL_PAGE_BREAK_ROOM, 0)
+    )
+    section.left_margin = Inches(geometry["left_margin"])
+    section.right_margin = Inches(geometry["left_margin"])
 
-    labels_per_row = 3
-    label_width = Inches(2.63)
-    label_height = Inches(1.0)
-    num_rows = (len(label_data) + labels_per_row - 1) // labels_per_row
 
-    table = doc.add_table(rows=num_rows, cols=labels_per_row)
+def add_label_table(doc, geometry):
+    """Add one empty sheet-sized label table; returns it with the label cells in reading order."""
+    columns = geometry["columns"]
+    gap = geometry["column_gap"]
+    table_columns = columns * 2 - 1 if gap else columns
+    table = doc.add_table(rows=geometry["rows"], cols=table_columns)
     table.autofit = False
     table.allow_autofit = False
 
-    for col in table.columns:
-        col.width = label_width
+    widths = [
+        Inches(gap) if gap and index % 2 else Inches(geometry["label_width"])
+        for index in range(table_columns)
+    ]
+    for column, width in zip(table.columns, widths):
+        column.width = width
+    label_cells = []
     for row in table.rows:
-        row.height = label_height
+        row.height = Inches(geometry["label_height"])
         row.height_rule = 2
+        for index, (cell, width) in enumerate(zip(row.cells, widths)):
+            cell.width = width
+            if gap and index % 2:
+                continue
+            cell.paragraphs[0].alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+            label_cells.append(cell)
+    return table, label_cells
+
+
+def _label_page_break(doc, page_break=True):
+    """Add the 1 pt paragraph Word needs between (and after) tables, optionally breaking the page."""
+    para = doc.add_paragraph()
+    para.paragraph_format.space_before = Pt(0)
+    para.paragraph_format.space_after = Pt(0)
+    para.paragraph_format.line_spacing = Pt(1)
+    run = para.add_run()
+    run.font.size = Pt(1)
+    if page_break:
+        run.add_break(WD_BREAK.PAGE)
+    return para
+
+
+class LabelSheetTemplate:
+    """Fill label sheets by cloning one prebuilt page table.
+
+    The page table (rows × columns of the label format, with spacer columns
+    for the gutters) and the bold/regular run formatting are built once
+    through python-docx; :meth:`add_page` deep-copies that table and writes
+    each label's lines straight into the copied cell paragraphs.
+    """
 
-    idx = 0
-    for row in table.rows:
-        for cell in row.cells:
-            if idx < len(label_data):
-                lines = label_data[idx].split("\n")
-                para = cell.paragraphs[0]
-                para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-                if lines:
-                    name_run = para.add_run(lines[0] + "\n")
-                    name_run.bold = True
-                    name_run.font.size = Pt(10.5)
-                for line in lines[1:]:
-                    addr_run = para.add_run(line + "\n")
-                    addr_run.font.size = Pt(10.5)
-                idx += 1
-            else:
-                cell.text = ""
+    def __init__(self, doc, label_format=DEFAULT_LABEL_FORMAT):
+        self.doc = doc
+        self.geometry = get_label_format(label_format)
+        self.per_page = self.geometry["columns"] * self.geometry["rows"]
+        setup_label_section(doc.sections[0], self.geometry)
+        self.body = doc.element.body
+        self.sect_pr = self.body.sectPr
+
+        table, label_cells = add_label_table(doc, self.geometry)
+        paragraphs = list(table._tbl.iter(qn("w:p")))
+        label_paragraphs = {id(cell.paragraphs[0]._p) for cell in label_cells}
+        self.label_slots = [index for index, p in enumerate(paragraphs) if id(p) in label_paragraphs]
+
+        scratch = label_cells[0].paragraphs[0]
+        name_run = scratch.add_run()
+        name_run.bold = True
+        name_run.font.size = Pt(LABEL_FONT_SIZE)
+        line_run = scratch.add_run()
+        line_run.font.size = Pt(LABEL_FONT_SIZE)
+        self.name_run = name_run._r
+        self.line_run = line_run._r
+        scratch._p.remove(self.name_run)
+        scratch._p.remove(self.line_run)
+
+        self.page_table = table._tbl
+        self.page_break = _label_page_break(doc)._p
+        self.body.remove(self.page_table)
+        self.body.remove(self.page_break)
+        self.pages = 0
+
+    def add_page(self, labels):
+        """Append one sheet holding up to :attr:`per_page` labels."""
+        if self.pages:
+            self.sect_pr.addprevious(copy.deepcopy(self.page_break))
+        table = copy.deepcopy(self.page_table)
+        paragraphs = list(table.iter(qn("w:p")))
+        for slot, label in zip(self.label_slots, labels):
+            para = paragraphs[slot]
+            lines = label.split("\n")
+            for index, line in enumerate(lines):
+                run = copy.deepcopy(self.name_run if index == 0 else self.line_run)
+                text = etree.SubElement(run, qn("w:t"))
+                text.text = line
+                if line != line.strip():
+                    text.set(XML_SPACE, "preserve")
+                etree.SubElement(run, qn("w:br"))
+                para.append(run)
+        self.sect_pr.addprevious(table)
+        self.pages += 1
+
+    def finish(self):
+        """Close the last sheet with the paragraph Word requires after a table."""
+        self.sect_pr.addprevious(_label_page_break(self.doc, page_break=False)._p)
+
+
+def create_labels(label_data, labels_file, label_format=DEFAULT_LABEL_FORMAT):
+    """Write ``label_data`` onto label sheets, one fixed table per page."""
+    labels_file = Path(labels_file)
+    doc = Document()
+    writer = StreamingDocxWriter(labels_file, doc)
+    sheet = LabelSheetTemplate(doc, label_format)
+    for page_start in range(0, len(label_data), sheet.per_page):
+        sheet.add_page(label_data[page_start:page_start + sheet.per_page])
+        writer.flush()
+    sheet.finish()
+    writer.close()
+    print(f"✅ Mailing labels saved to: {labels_file}")
+
+# === PDF OUTPUT ===
+# Letter layout mirrors python-docx's default template: 11 pt text, 1.15 line
+# spacing, 10 pt after each paragraph, 1.25" side and 1" top/bottom margins.
+PDF_POINTS_PER_INCH = 72
+PDF_BODY_FONT_SIZE = 11
+PDF_LINE_SPACING = 1.15 * 1.2
+PDF_PARAGRAPH_SPACE_AFTER = 10
+PDF_LETTER_PAGE = (8.5 * PDF_POINTS_PER_INCH, 11 * PDF_POINTS_PER_INCH)
+PDF_LETTER_MARGINS = (72, 90, 72, 90)  # top, right, bottom, left
+PDF_ENVELOPE_PAGE = (9.5 * PDF_POINTS_PER_INCH, 4.125 * PDF_POINTS_PER_INCH)
+PDF_ENVELOPE_MARGINS = (36, 36, 36, 36)
+
+# Helvetica / Helvetica-Bold advance widths (1/1000 em) for ASCII 32-126.
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+# (regular, bold) widths for the WinAnsi punctuation the letter templates use.
+_PDF_EXTRA_WIDTHS = {
+    "‘": (222, 278),
+    "’": (222, 278),
+    "“": (333, 500),
+    "”": (333, 500),
+    "–": (556, 556),
+    "—": (1000, 1000),
+    "•": (350, 350),
+}
 
-    doc.save(str(labels_file))
+
+def _pdf_text_width(text, size, bold=False):
+    widths = _HELVETICA_BOLD_WIDTHS if bold else _HELVETICA_WIDTHS
+    total = 0
+    for char in text:
+        code = ord(char)
+        if 32 <= code <= 126:
+            total += widths[code - 32]
+        else:
+            total += _PDF_EXTRA_WIDTHS.get(char, (556, 556))[bold]
+    return total * size / 1000
+
+
+def _wrap_pdf_text(text, size, max_width, bold=False):
+    """Greedily wrap ``text`` on spaces so each line fits ``max_width`` points."""
+    lines = []
+    current = ""
+    for word in text.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if current and _pdf_text_width(candidate, size, bold) > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    lines.append(current)
+    return lines
+
+
+def _pdf_string(text):
+    data = text.encode("cp1252", errors="replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _unfilter_png_row(line, previous, bpp, filter_type):
+    """Undo the byte-wise PNG Average (3) or Paeth (4) filter for one scanline."""
+    current = bytearray(line.tobytes())
+    above = previous.tobytes()
+    for i in range(len(current)):
+        left = current[i - bpp] if i >= bpp else 0
+        up = above[i]
+        if filter_type == 3:
+            current[i] = (current[i] + ((left + up) >> 1)) & 0xFF
+            continue
+        upper_left = above[i - bpp] if i >= bpp else 0
+        estimate = left + up - upper_left
+        left_distance = abs(estimate - left)
+        up_distance = abs(estimate - up)
+        upper_left_distance = abs(estimate - upper_left)
+        if left_distance <= up_distance and left_distance <= upper_left_distance:
+            predictor = left
+        elif up_distance <= upper_left_distance:
+            predictor = up
+        else:
+            predictor = upper_left
+        current[i] = (current[i] + predictor) & 0xFF
+    return np.frombuffer(bytes(current), dtype=np.uint8)
+
+
+def _unfilter_png(raw, width, height, bpp):
+    stride = width * bpp
+    pixels = np.empty((height, stride), dtype=np.uint8)
+    previous = np.zeros(stride, dtype=np.uint8)
+    for row in range(height):
+        start = row * (stride + 1)
+        filter_type = raw[start]
+        line = np.frombuffer(raw, dtype=np.uint8, count=stride, offset=start + 1)
+        if filter_type == 1:
+            line = np.cumsum(line.reshape(width, bpp), axis=0, dtype=np.uint8).reshape(stride)
+        elif filter_type == 2:
+            line = line + previous
+        elif filter_type in (3, 4):
+            line = _unfilter_png_row(line, previous, bpp, filter_type)
+        pixels[row] = line
+        previous = pixels[row]
+    return pixels
+
+
+def _parse_png(data):
+    """Return ``(IHDR fields, concatenated IDAT data)`` for PNG bytes, or None.
+
+    None also covers files the numpy decoders leave to Pillow: truncated or
+    malformed chunks, and ``tRNS`` transparency.
+    """
+    if not data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return None
+    header = None
+    compressed = []
+    position = 8
+    while position + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", data[position:position + 8])
+        if position + 12 + length > len(data):
+            return None
+        chunk = data[position + 8:position + 8 + length]
+        if chunk_type == b"IHDR":
+            if length != 13:
+                return None
+            header = struct.unpack(">IIBBBBB", chunk)
+        elif chunk_type == b"tRNS":
+            return None
+        elif chunk_type == b"IDAT":
+            compressed.append(chunk)
+        elif chunk_type == b"IEND":
+            break
+        position += 12 + length
+    if header is None:
+        return None
+    return header, b"".join(compressed)
+
+
+def _inflate_png(compressed, width, height, channels):
+    """Return the filtered scanlines in a PNG's IDAT data, or None if they are truncated or corrupt."""
+    inflater = zlib.decompressobj()
+    try:
+        raw = inflater.decompress(compressed)
+    except zlib.error:
+        return None
+    if not inflater.eof or len(raw) < height * (width * channels + 1):
+        return None
+    return raw
+
+
+def _read_png_for_pdf(image_path):
+    """Return a PDF image record for a non-interlaced 8-bit PNG, or None if unsupported.
+
+    Opaque grayscale/RGB data is passed through with PNG predictors; images
+    with an alpha channel are decoded so the alpha can become a soft mask.
+    Files :func:`_parse_png` or :func:`_inflate_png` reject are left to Pillow.
+    """
+    parsed = _parse_png(Path(image_path).read_bytes())
+    if parsed is None:
+        return None
+    header, compressed = parsed
+
+    width, height, bit_depth, color_type, _, _, interlace = header
+    channels = {0: 1, 2: 3, 4: 2, 6: 4}.get(color_type)
+    if channels is None or interlace or bit_depth != 8:
+        return None
+    raw = _inflate_png(compressed, width, height, channels)
+    if raw is None:
+        return None
+    image = {
+        "width": width,
+        "height": height,
+        "color_space": "/DeviceGray" if color_type in (0, 4) else "/DeviceRGB",
+        "data": compressed,
+        "decode_parms": f"<< /Predictor 15 /Colors {channels} /BitsPerComponent 8 /Columns {width} >>",
+        "alpha": None,
+    }
+    if color_type in (4, 6):
+        pixels = _unfilter_png(raw, width, height, channels)
+        return _pdf_image_from_pixels(pixels.reshape(height, width, channels))
+    return image
+
+
+def _pdf_image_from_pixels(pixels):
+    """Return a PDF image record for a (height, width, channels) uint8 array.
+
+    Two- and four-channel arrays carry alpha, which becomes a soft mask.
+    """
+    height, width, channels = pixels.shape
+    has_alpha = channels in (2, 4)
+    colors = pixels[:, :, :-1] if has_alpha else pixels
+    return {
+        "width": width,
+        "height": height,
+        "color_space": "/DeviceGray" if channels in (1, 2) else "/DeviceRGB",
+        "data": zlib.compress(np.ascontiguousarray(colors).tobytes()),
+        "decode_parms": None,
+        "alpha": zlib.compress(np.ascontiguousarray(pixels[:, :, -1]).tobytes()) if has_alpha else None,
+    }
+
+
+def _read_image_for_pdf(image_path):
+    """Return a PDF image record for a signature image in any format Pillow reads.
+
+    8-bit non-interlaced PNGs take the :func:`_read_png_for_pdf` fast path;
+    JPEG, palette, interlaced, ``tRNS``-transparent, truncated and other
+    images are decoded with Pillow.  Raises ValueError when the image cannot
+    be decoded, so a PDF run stops before any page is written instead of
+    leaving the signature out.
+    """
+    image = _read_png_for_pdf(image_path)
+    if image is not None:
+        return image
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise ValueError(f"Pillow is required to embed signature image {image_path} in a PDF") from e
+    try:
+        with Image.open(image_path) as source:
+            source.load()
+            if source.mode in ("I", "I;16", "I;16B", "I;16L"):  # 16-bit grayscale PNG
+                return _pdf_image_from_pixels(
+                    (np.asarray(source).astype(np.uint32) >> 8).astype(np.uint8)[:, :, None]
+                )
+            has_alpha = "A" in source.getbands() or "transparency" in source.info
+            grayscale = source.mode in ("1", "L", "LA")
+            mode = ("LA" if grayscale else "RGBA") if has_alpha else ("L" if grayscale else "RGB")
+            pixels = np.asarray(source.convert(mode))
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Unsupported signature image {image_path}: {e}") from e
+    return _pdf_image_from_pixels(pixels.reshape(pixels.shape[0], pixels.shape[1], len(mode)))
+
+
+class StreamingPdfWriter:
+    """Write PDF pages straight to disk as they are produced.
+
+    Fonts (the standard Helvetica faces, WinAnsi encoded) and the optional
+    signature image are written once and shared by every page through a
+    single resource dictionary.  Only object offsets and page ids are kept in
+    memory; the page tree, cross-reference table and trailer are written by
+    :meth:`close`.
+    """
+
+    def __init__(self, path, image_path=None):
+        # Read the image first so an undecodable one fails before the file is created.
+        image = None
+        if image_path and os.path.exists(os.fspath(image_path)):
+            image = _read_image_for_pdf(image_path)
+        elif image_path:
+            print(f"❌ Signature image not found: {image_path}")
+        self.path = Path(path)
+        self.file = open(partial_output_path(self.path), "wb")
+        self.offsets = {}
+        self.page_ids = []
+        self.last_id = 0
+        self.has_image = False
+        self.file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self.pages_id = self._reserve()
+
+        regular_font = self._write_object(
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+        )
+        bold_font = self._write_object(
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>"
+        )
+        resources = f"<< /Font << /F1 {regular_font} 0 R /F2 {bold_font} 0 R >>"
+        if image is not None:
+            resources += f" /XObject << /Im1 {self._write_image(image)} 0 R >>"
+            self.has_image = True
+        self.resources_id = self._write_object(f"{resources} >>".encode("ascii"))
+
+    def _reserve(self):
+        self.last_id += 1
+        return self.last_id
+
+    def _write_object(self, body, stream=None, object_id=None):
+        object_id = object_id or self._reserve()
+        self.offsets[object_id] = self.file.tell()
+        self.file.write(f"{object_id} 0 obj\n".encode("ascii") + body)
+        if stream is not None:
+            self.file.write(b"\nstream\n" + stream + b"\nendstream")
+        self.file.write(b"\nendobj\n")
+        return object_id
+
+    def _write_image(self, image):
+        dictionary = (
+            f"<< /Type /XObject /Subtype /Image /Width {image['width']} /Height {image['height']} "
+            f"/BitsPerComponent 8 /Filter /FlateDecode /Length {{length}}"
+        )
+        if image["alpha"] is not None:
+            mask_id = self._write_object(
+                (
+                    dictionary.format(length=len(image["alpha"]))
+                    + " /ColorSpace /DeviceGray >>"
+                ).encode("ascii"),
+                image["alpha"],
+            )
+            dictionary += f" /SMask {mask_id} 0 R"
+        if image["decode_parms"]:
+            dictionary += f" /DecodeParms {image['decode_parms']}"
+        dictionary += f" /ColorSpace {image['color_space']} >>"
+        return self._write_object(
+            dictionary.format(length=len(image["data"])).encode("ascii"), image["data"]
+        )
+
+    def add_page(self, width, height, content):
+        """Compress and write one page whose content stream is ``content`` (bytes)."""
+        content = zlib.compress(content)
+        content_id = self._write_object(
+            f"<< /Filter /FlateDecode /Length {len(content)} >>".encode("ascii"), content
+        )
+        page_id = self._write_object(
+            (
+                f"<< /Type /Page /Parent {self.pages_id} 0 R /MediaBox [0 0 {width:g} {height:g}] "
+                f"/Resources {self.resources_id} 0 R /Contents {content_id} 0 R >>"
+            ).encode("ascii")
+        )
+        self.page_ids.append(page_id)
+
+    def close(self):
+        """Write the page tree, cross-reference table and trailer."""
+        kids = " ".join(f"{page_id} 0 R" for page_id in self.page_ids)
+        self._write_object(
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode("ascii"),
+            object_id=self.pages_id,
+        )
+        catalog_id = self._write_object(f"<< /Type /Catalog /Pages {self.pages_id} 0 R >>".encode("ascii"))
+        xref_offset = self.file.tell()
+        entries = [f"xref\n0 {self.last_id + 1}\n0000000000 65535 f \n"]
+        entries.extend(f"{self.offsets[object_id]:010d} 00000 n \n" for object_id in range(1, self.last_id + 1))
+        entries.append(
+            f"trailer\n<< /Size {self.last_id + 1} /Root {catalog_id} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+        )
+        self.file.write("".join(entries).encode("ascii"))
+        self.file.close()
+        os.replace(self.file.name, self.path)
+
+
+class PdfPageFlow:
+    """Lay paragraphs out top to bottom, continuing on a new page when one fills up."""
+
+    def __init__(self, writer, page_size, margins):
+        self.writer = writer
+        self.width, self.height = page_size
+        self.top, self.right, self.bottom, self.left = margins
+        self.text_width = self.width - self.left - self.right
+        self.ops = []
+        self.y = self.height - self.top
+
+    def _make_room(self, needed):
+        if self.y - needed < self.bottom and self.ops:
+            self.finish_page()
+
+    def paragraph(self, lines, align="left", space_before=0, space_after=PDF_PARAGRAPH_SPACE_AFTER):
+        """Add a paragraph of ``(text, size, bold)`` lines, each wrapped to the text width."""
+        self.y -= space_before
+        for text, size, bold in lines:
+            line_height = size * PDF_LINE_SPACING
+            for line in _wrap_pdf_text(text, size, self.text_width, bold):
+                self._make_room(line_height)
+                if line:
+                    x = self.left
+                    if align == "center":
+                        x += (self.text_width - _pdf_text_width(line, size, bold)) / 2
+                    self.ops.append(
+                        b"BT /F%d %g Tf %.2f %.2f Td %s Tj ET"
+                        % (2 if bold else 1, size, x, self.y - size, _pdf_string(line))
+                    )
+                self.y -= line_height
+        self.y -= space_after
+
+    def image(self, width, height, space_after=PDF_PARAGRAPH_SPACE_AFTER):
+        """Draw the writer's shared image at the left margin."""
+        self._make_room(height)
+        self.ops.append(b"q %.2f 0 0 %.2f %.2f %.2f cm /Im1 Do Q" % (width, height, self.left, self.y - height))
+        self.y -= height + space_after
+
+    def finish_page(self):
+        self.writer.add_page(self.width, self.height, b"\n".join(self.ops))
+        self.ops = []
+        self.y = self.height - self.top
+
+
+def _pdf_lines(text, size=PDF_BODY_FONT_SIZE, bold=False):
+    return [(line, size, bold) for line in text.split("\n")]
+
+
+def add_letter_to_pdf(writer, name, address, zip_code, sale_date, sale_price, content, mode, subject_line, signature_name, signature_title, signature_image, signature_email):
+    """PDF counterpart of :func:`add_letter_to_doc`; the signature image comes from ``writer``."""
+    today = datetime.now().strftime('%B %d, %Y')
+    flow = PdfPageFlow(writer, PDF_LETTER_PAGE, PDF_LETTER_MARGINS)
+    for _ in range(4):
+        flow.paragraph(_pdf_lines(""))
+    flow.paragraph(_pdf_lines(today), space_after=48)
+    flow.paragraph(_pdf_lines(f"Dear {name},"), space_after=24)
+    flow.paragraph(_pdf_lines(subject_line, bold=True), space_after=10)
+    flow.paragraph(_pdf_lines(_personalize_letter_content(content, name, zip_code)))
+    if writer.has_image:
+        flow.image(1.5 * PDF_POINTS_PER_INCH, 0.5 * PDF_POINTS_PER_INCH)
+    flow.paragraph(
+        _pdf_lines(f"{signature_name}\n{signature_title}\n{signature_email}\n{YOUR_PHONE}\n{YOUR_WEB}")
+    )
+    flow.finish_page()
+
+
+def add_envelope_to_pdf(writer, name, address, location_line, signature_name):
+    """PDF counterpart of :func:`add_envelope_to_doc` (#10 envelope, one page each)."""
+    flow = PdfPageFlow(writer, PDF_ENVELOPE_PAGE, PDF_ENVELOPE_MARGINS)
+    flow.paragraph(_pdf_lines(f"{signature_name}\n{YOUR_ADDRESS}", size=10))
+    flow.paragraph(_pdf_lines(""), space_before=40)
+    addr_line = f"{address}\n{location_line}" if location_line else address
+    flow.paragraph([(name, 14, True)] + _pdf_lines(addr_line, size=14), align="center")
+    flow.finish_page()
+
+
+def create_labels_pdf(label_data, labels_file, label_format=DEFAULT_LABEL_FORMAT):
+    """PDF counterpart of :func:`create_labels`: one label-format grid per page."""
+    labels_file = Path(labels_file)
+    geometry = get_label_format(label_format)
+    labels_per_row, rows_per_page = geometry["columns"], geometry["rows"]
+    label_width = geometry["label_width"] * PDF_POINTS_PER_INCH
+    label_height = geometry["label_height"] * PDF_POINTS_PER_INCH
+    label_pitch = (geometry["label_width"] + geometry["column_gap"]) * PDF_POINTS_PER_INCH
+    page_width = geometry["page_width"] * PDF_POINTS_PER_INCH
+    page_height = geometry["page_height"] * PDF_POINTS_PER_INCH
+    top_margin = geometry["top_margin"] * PDF_POINTS_PER_INCH
+    left_margin, cell_padding = geometry["left_margin"] * PDF_POINTS_PER_INCH, 0.08 * PDF_POINTS_PER_INCH
+    size = LABEL_FONT_SIZE
+    line_height = size * PDF_LINE_SPACING
+    per_page = labels_per_row * rows_per_page
+
+    writer = StreamingPdfWriter(labels_file)
+    for page_start in range(0, max(len(label_data), 1), per_page):
+        ops = []
+        for offset, label in enumerate(label_data[page_start:page_start + per_page]):
+            row, column = divmod(offset, labels_per_row)
+            cell_left = left_margin + column * label_pitch + cell_padding
+            cell_width = label_width - 2 * cell_padding
+            y = page_height - top_margin - row * label_height
+            for index, line in enumerate(label.split("\n")):
+                bold = index == 0
+                x = cell_left + (cell_width - _pdf_text_width(line, size, bold)) / 2
+                ops.append(b"BT /F%d %g Tf %.2f %.2f Td %s Tj ET" % (2 if bold else 1, size, x, y - size, _pdf_string(line)))
+                y -= line_height
+        writer.add_page(page_width, page_height, b"\n".join(ops))
+    writer.close()
     print(f"✅ Mailing labels saved to: {labels_file}")
 
+# === MAIL MERGE OUTPUT ===
+MAIL_MERGE_DATA_FILE = "mail_merge_data.csv"
+MAIL_MERGE_FIELDS = [
+    "Name",
+    "Address",
+    "LocationLine",
+    "County",
+    "Subject",
+    "SignatureName",
+    "SignatureTitle",
+    "SignatureEmail",
+]
+_MERGE_PLACEHOLDER_PATTERN = re.compile(r"\[(Name|County)\]")
+
+
+def mail_merge_record(name, address, location_line, zip_code, subject_line, signature_name, signature_title, signature_email):
+    """Return one data-source row for the mail-merge templates."""
+    return {
+        "Name": name,
+        "Address": address,
+        "LocationLine": location_line,
+        "County": _letter_county(zip_code),
+        "Subject": subject_line,
+        "SignatureName": signature_name,
+        "SignatureTitle": signature_title,
+        "SignatureEmail": signature_email,
+    }
+
+
+def _add_merge_field(paragraph, field_name, bold=False, size=None):
+    """Append a ``MERGEFIELD`` showing ``«field_name»`` until the document is merged."""
+    field = OxmlElement("w:fldSimple")
+    field.set(qn("w:instr"), f" MERGEFIELD {field_name} ")
+    run = paragraph.add_run(f"«{field_name}»")
+    if bold:
+        run.bold = True
+    if size:
+        run.font.size = Pt(size)
+    run._r.addprevious(field)
+    field.append(run._r)
+
+
+def _add_next_record_field(paragraph):
+    field = OxmlElement("w:fldSimple")
+    field.set(qn("w:instr"), " NEXT ")
+    paragraph._p.append(field)
+
+
+def _add_merge_text(paragraph, text, bold=False, size=None):
+    """Add ``text``, turning ``[Name]``/``[County]`` placeholders into merge fields."""
+    for index, piece in enumerate(_MERGE_PLACEHOLDER_PATTERN.split(text)):
+        if index % 2:
+            _add_merge_field(paragraph, piece, bold, size)
+        elif piece:
+            run = paragraph.add_run(piece)
+            if bold:
+                run.bold = True
+            if size:
+                run.font.size = Pt(size)
+
+
+def _add_merge_lines(paragraph, field_names, bold_first=False, size=None):
+    for index, field_name in enumerate(field_names):
+        if index:
+            break_run = paragraph.add_run("\n")
+            if size:
+                break_run.font.size = Pt(size)
+        _add_merge_field(paragraph, field_name, bold=bold_first and index == 0, size=size)
+
+
+def create_letter_merge_template(template_file, content, signature_image):
+    """Write the letter layout of :func:`add_letter_to_doc` once, with merge fields."""
+    doc = Document()
+    today = datetime.now().strftime('%B %d, %Y')
+
+    def add_compact_paragraph(space_before=0, space_after=2):
+        para = doc.add_paragraph()
+        para.paragraph_format.space_before = Pt(space_before)
+        para.paragraph_format.space_after = Pt(space_after)
+        return para
+
+    for _ in range(4):
+        doc.add_paragraph()
+
+    add_compact_paragraph(space_after=48).add_run(today)
+    greeting = add_compact_paragraph(space_after=24)
+    _add_merge_text(greeting, "Dear [Name],")
+    _add_merge_field(add_compact_paragraph(space_after=10), "Subject", bold=True)
+
+    _add_merge_text(doc.add_paragraph(), content)
+
+    signature_path = prepare_signature_image(signature_image)
+    if signature_path:
+        doc.add_picture(os.fspath(signature_path), width=Inches(SIGNATURE_WIDTH), height=Inches(SIGNATURE_HEIGHT))
+    else:
+        print(f"❌ Signature image not found: {signature_image}")
+
+    signature = doc.add_paragraph()
+    _add_merge_lines(signature, ["SignatureName", "SignatureTitle", "SignatureEmail"])
+    signature.add_run(f"\n{YOUR_PHONE}\n{YOUR_WEB}")
+    with atomic_output(template_file) as partial:
+        doc.save(str(partial))
+
+
+def create_envelope_merge_template(template_file):
+    """Write the #10 envelope of :func:`add_envelope_to_doc` once, with merge fields."""
+    doc = create_envelope_document()
+
+    sender = doc.add_paragraph()
+    sender.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+    _add_merge_field(sender, "SignatureName", size=10)
+    sender.add_run(f"\n{YOUR_ADDRESS}").font.size = Pt(10)
+
+    spacer = doc.add_paragraph()
+    spacer.paragraph_format.space_before = Pt(40)
+
+    recipient = doc.add_paragraph()
+    recipient.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    _add_merge_lines(recipient, ["Name", "Address", "LocationLine"], bold_first=True, size=14)
+    with atomic_output(template_file) as partial:
+        doc.save(str(partial))
+
+
+def create_labels_merge_template(template_file, label_format=DEFAULT_LABEL_FORMAT):
+    """Write one label sheet of :func:`create_labels` whose cells step through records."""
+    geometry = get_label_format(label_format)
+    doc = Document()
+    setup_label_section(doc.sections[0], geometry)
+    _, label_cells = add_label_table(doc, geometry)
+    for index, cell in enumerate(label_cells):
+        para = cell.paragraphs[0]
+        if index:
+            _add_next_record_field(para)
+        _add_merge_lines(para, ["Name", "Address", "LocationLine"], bold_first=True, size=LABEL_FONT_SIZE)
+    _label_page_break(doc, page_break=False)
+    with atomic_output(template_file) as partial:
+        doc.save(str(partial))
+
+
+def write_mail_merge_outputs(
+    output_dir, merge_rows, content, signature_image, label_format=DEFAULT_LABEL_FORMAT, templates=("letters", "envelopes", "labels")
+):
+    """Write the selected merge templates plus the shared CSV data source."""
+    output_dir = Path(output_dir)
+    data_file = output_dir / MAIL_MERGE_DATA_FILE
+    with atomic_output(data_file) as partial, open(partial, 'w', newline='', encoding='utf-8-sig') as f:
+        dict_writer = csv.DictWriter(f, MAIL_MERGE_FIELDS)
+        dict_writer.writeheader()
+        dict_writer.writerows(merge_rows)
+    if "letters" in templates:
+        create_letter_merge_template(output_dir / "letters_template.docx", content, signature_image)
+    if "envelopes" in templates:
+        create_envelope_merge_template(output_dir / "envelopes_template.docx")
+    if "labels" in templates:
+        create_labels_merge_template(output_dir / "labels_template.docx", label_format)
+    print(f"📥 Mail merge data source saved to: {data_file} ({len(merge_rows)} records)")
+    print(f"📄 Mail merge templates saved to: {output_dir}")
+
+# === STREAMING DOCX WRITER ===
+class StreamingDocxWriter:
+    """Stream a python-docx document's body to disk as it is built.
+
+    Content is still added to ``doc`` with the usual helpers; every
+    :meth:`flush` serializes the body elements added since the last flush
+    straight into the ``word/document.xml`` zip entry and drops them from the
+    in-memory tree, so memory stays flat no matter how many recipients are
+    rendered.  The first flush writes the static parts (styles, media,
+    relationships) once, which means every image must already be embedded
+    by then.  :meth:`close` writes the final section properties and moves
+    the finished package from its partial path into place.
+    """
+
+    DOCUMENT_PART = "word/document.xml"
+
+    def __init__(self, path, doc):
+        self.path = Path(path)
+        self.doc = doc
+        self.archive = None
+        self.stream = None
+        self.closing_xml = ""
+        self.namespace_declarations = ""
+        self.relationship_ids = set()
+
+    def _open(self):
+        body = self.doc.element.body
+        children = list(body)
+        for child in children:
+            body.remove(child)
+        template = io.BytesIO()
+        self.doc.save(template)
+        body.extend(children)
+        self.relationship_ids = set(self.doc.part.rels)
+
+        # Serialized body elements repeat the root's namespace declarations;
+        # they are already declared on <w:document>, so they are stripped.
+        probe = etree.SubElement(body, qn("w:p"))
+        self.namespace_declarations = etree.tostring(probe, encoding="unicode")[len("<w:p"):-len("/>")]
+        body.remove(probe)
+
+        self.archive = zipfile.ZipFile(partial_output_path(self.path), "w", zipfile.ZIP_DEFLATED)
+        with zipfile.ZipFile(template) as template_archive:
+            for info in template_archive.infolist():
+                if info.filename == self.DOCUMENT_PART:
+                    document_xml = template_archive.read(info).decode("utf-8")
+                else:
+                    self.archive.writestr(info, template_archive.read(info))
+        opening_xml, self.closing_xml = document_xml.split("<w:body/>", 1)
+        self.stream = self.archive.open(self.DOCUMENT_PART, "w")
+        self.stream.write(f"{opening_xml}<w:body>".encode("utf-8"))
+
+    def _write(self, elements):
+        xml = "".join(
+            etree.tostring(element, encoding="unicode").replace(self.namespace_declarations, "", 1)
+            for element in elements
+        )
+        self.stream.write(xml.encode("utf-8"))
+
+    def flush(self):
+        """Write and release every body element added since the last flush."""
+        if self.stream is None:
+            self._open()
+        body = self.doc.element.body
+        sect_pr = body.sectPr
+        pending = [element for element in body if element is not sect_pr]
+        self._write(pending)
+        for element in pending:
+            body.remove(element)
+
+    def close(self):
+        """Finish ``word/document.xml`` and the package."""
+        self.flush()
+        sect_pr = self.doc.element.body.sectPr
+        if sect_pr is not None:
+            self._write([sect_pr])
+        self.stream.write(f"</w:body>{self.closing_xml}".encode("utf-8"))
+        self.stream.close()
+        self.archive.close()
+        os.replace(partial_output_path(self.path), self.path)
+
+# === SHARDED RENDERING ===
+RENDER_SHARD_SIZE = None  # None splits recipients evenly across the render workers.
+
+
+def _shard_recipients(recipients, render_workers, shard_size):
+    """Split recipients into ordered shards of ``shard_size`` (or one per worker)."""
+    if not shard_size:
+        shard_size = -(-len(recipients) // max(render_workers, 1))
+    shard_size = max(int(shard_size), 1)
+    return [recipients[start:start + shard_size] for start in range(0, len(recipients), shard_size)]
+
+
+def _init_render_worker(zip_lookup):
+    """Prepare a render worker: share the ZIP lookup and keep output off the GUI console."""
+    zip_city_state.clear()
+    zip_city_state.update(zip_lookup)
+    sys.stdout = sys.stderr = open(os.devnull, "w")
+
+
+def _render_shard(shard_number, recipients, output_dir, letter_options, signature_name, render_letters=True, render_envelopes=True):
+    """Render one shard's letters and/or envelopes into numbered part documents."""
+    letters_part = envelopes_part = None
+    writers = []
+    if render_letters:
+        letters_part = Path(output_dir) / f"all_letters_part_{shard_number:03d}.docx"
+        letters_doc = Document()
+        letter_skeleton = LetterSkeleton(letters_doc, *letter_options)
+        writers.append(StreamingDocxWriter(letters_part, letters_doc))
+    if render_envelopes:
+        envelopes_part = Path(output_dir) / f"all_envelopes_part_{shard_number:03d}.docx"
+        envelopes_doc = create_envelope_document()
+        writers.append(StreamingDocxWriter(envelopes_part, envelopes_doc))
+    for recipient in recipients:
+        if render_letters:
+            letter_skeleton.add(
+                recipient['Name'],
+                recipient['Address'],
+                recipient['Zip'],
+                recipient['Sale Date'],
+                recipient['Sale Price'],
+            )
+        if render_envelopes:
+            add_envelope_to_doc(
+                envelopes_doc, recipient['Name'], recipient['Address'], recipient['Location Line'], signature_name
+            )
+        for writer in writers:
+            writer.flush()
+
+    for writer in writers:
+        writer.close()
+    return letters_part, envelopes_part
+
+
+def merge_docx_parts(part_paths, merged_path):
+    """Concatenate part documents, in order, into a single document.
+
+    Parts are loaded one at a time and streamed into ``merged_path``, so
+    memory is bounded by the shard size.  Images are re-linked to the first
+    part's copies (parts rendered with the same letter options share them)
+    and drawing ids are renumbered across the whole document.  A part that
+    opens with a section break continues the previous part's page setup,
+    exactly as ``add_section`` would have done in one document.
+    """
+    merged = Document(str(part_paths[0]))
+    body = merged.element.body
+    sect_pr = body.sectPr
+    writer = StreamingDocxWriter(merged_path, merged)
+    doc_pr_id = 0
+    for part_path in part_paths:
+        if part_path != part_paths[0]:
+            part = Document(str(part_path))
+            part_body = part.element.body
+            part_sect_pr = part_body.sectPr
+            elements = [element for element in part_body if element is not part_sect_pr]
+            if elements:
+                for leading_break in elements[0].xpath("./w:pPr/w:sectPr"):
+                    leading_break.getparent().replace(leading_break, sect_pr.clone())
+
+            relinked = {}
+            for element in elements:
+                for blip in element.xpath(".//a:blip"):
+                    source_rid = blip.get(qn("r:embed"))
+                    if source_rid not in relinked:
+                        image_blob = part.part.related_parts[source_rid].blob
+                        relinked[source_rid], _ = merged.part.get_or_add_image(io.BytesIO(image_blob))
+                        if relinked[source_rid] not in writer.relationship_ids:
+                            raise ValueError(f"{part_path} uses an image missing from {part_paths[0]}")
+                    blip.set(qn("r:embed"), relinked[source_rid])
+                sect_pr.addprevious(element)
+
+        for doc_pr in body.xpath(".//wp:docPr"):
+            doc_pr_id += 1
+            doc_pr.set("id", str(doc_pr_id))
+            doc_pr.set("name", f"Picture {doc_pr_id}")
+        writer.flush()
+    writer.close()
+
+
+def remove_shard_parts(output_dir):
+    """Delete ``all_*_part_*.docx`` files left in ``output_dir`` by an earlier run."""
+    for part_path in Path(output_dir).glob("all_*_part_*.docx"):
+        part_path.unlink()
+
+
+def render_document_shards(
+    recipients,
+    output_dir,
+    letter_options,
+    signature_name,
+    render_workers=1,
+    shard_size=RENDER_SHARD_SIZE,
+    merge_shards=True,
+    render_letters=True,
+    render_envelopes=True,
+):
+    """Render letters and envelopes shard by shard, in worker processes when ``render_workers > 1``.
+
+    Shards are numbered in recipient order and parts are written as
+    ``all_letters_part_001.docx`` / ``all_envelopes_part_001.docx``.  With
+    ``merge_shards`` the parts are combined, in shard order, into
+    ``all_letters.docx`` and ``all_envelopes.docx`` and then removed.
+    ``render_letters`` / ``render_envelopes`` limit the run to one of the two.
+    Part files left in ``output_dir`` by an earlier run are removed first, so
+    the folder only ever holds this run's parts.
+    """
+    output_dir = Path(output_dir)
+    remove_shard_parts(output_dir)
+    shards = _shard_recipients(recipients, render_workers, shard_size)
+    if not shards:
+        shards = [[]]
+    signature_image = letter_options[5]
+    if render_letters and not (signature_image and os.path.exists(os.fspath(signature_image))):
+        print(f"❌ Signature image not found: {signature_image}")
+
+    tasks = [
+        (number, shard, output_dir, letter_options, signature_name, render_letters, render_envelopes)
+        for number, shard in enumerate(shards, start=1)
+    ]
+    if render_workers > 1 and len(shards) > 1:
+        # Workers are spawned on every platform, so each one re-imports the
+        # entry module (run.py keeps its GUI behind ``__main__``) and every task
+        # argument has to pickle.  Spawning also means the pool never inherits
+        # threads that happen to be running in this process.
+        with ProcessPoolExecutor(
+            max_workers=min(render_workers, len(shards)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_render_worker,
+            initargs=(dict(zip_city_state),),
+        ) as pool:
+            futures = [pool.submit(_render_shard, *task) for task in tasks]
+            parts = []
+            for number, future in enumerate(futures, start=1):
+                parts.append(future.result())
+                print(f"🧩 Rendered shard {number}/{len(shards)}")
+    else:
+        parts = [_render_shard(*task) for task in tasks]
+
+    letter_parts = [letters_part for letters_part, _ in parts if letters_part]
+    envelope_parts = [envelopes_part for _, envelopes_part in parts if envelopes_part]
+    if not merge_shards:
+        if letter_parts:
+            print(f"📄 {len(letter_parts)} letter parts saved to: {output_dir}")
+        if envelope_parts:
+            print(f"✉️ {len(envelope_parts)} envelope parts saved to: {output_dir}")
+        return letter_parts, envelope_parts
+
+    letters_files, envelopes_files = [], []
+    if letter_parts:
+        letters_files.append(output_dir / "all_letters.docx")
+        merge_docx_parts(letter_parts, letters_files[0])
+    if envelope_parts:
+        envelopes_files.append(output_dir / "all_envelopes.docx")
+        merge_docx_parts(envelope_parts, envelopes_files[0])
+    for part_path in letter_parts + envelope_parts:
+        part_path.unlink()
+    for letters_file in letters_files:
+        print(f"📄 All letters saved to: {letters_file}")
+    for envelopes_file in envelopes_files:
+        print(f"✉️ All envelopes saved to: {envelopes_file}")
+    return letters_files, envelopes_files
+
+# === SALES INGESTION ===
+SALES_CHUNK_ROWS = 5000
+
+# Logical sales fields mapped to their accepted column names, highest priority first.
+SALES_FIELD_ALIASES = {
+    "owner_name": ("Owner Name", "Owner"),
+    "property_address": ("Address", "Situs"),
+    "street_address": ("Address",),
+    "site_zip": ("Site Zip Code", "Property Zip", "Zip Code", "Zip"),
+    "mailing_line_one": (
+        "Mailing Address",
+        "Mailing Address Line 1",
+        "Mailing Address 1",
+        "Address",
+    ),
+    "mailing_line_two": ("Mailing Address 2", "Mailing Address Line 2", "Address Line 2"),
+    "mailing_zip": ("Mailing Zip", "Mailing ZIP", "Mailing Zip Code", "Zip Code", "Zip"),
+    "mailing_city": ("Mailing City", "City"),
+    "mailing_state": ("Mailing State", "State"),
+    "sale_date": ("Sale Date",),
+    "sale_price": ("Sale Price",),
+    "business_type": ("Business Type",),
+    "executive_first_name": ("Executive First Name",),
+    "executive_last_name": ("Executive Last Name",),
+    "legal_name": ("Legal Name",),
+    "company_name": ("Company Name",),
+}
+
+
+def _sales_header_labels(header):
+    """Return column labels for a header row, named the way pandas would."""
+    labels = []
+    seen = {}
+    for position, value in enumerate(header):
+        label = f"Unnamed: {position}" if value is None else value
+        if label in seen:
+            seen[label] += 1
+            label = f"{label}.{seen[label]}"
+        else:
+            seen[label] = 0
+        labels.append(label)
+    return labels
+
+
+def _cell_text(value):
+    """Return a worksheet cell value as text without type inference."""
+    if value is None:
+        return ""
+    return str(value)
+
+
+def read_sales_header(file_path):
+    """Return the column labels of the sales workbook's first sheet."""
+    file_path = Path(file_path)
+    if file_path.suffix.lower() == ".xls":
+        return list(pd.read_excel(file_path, nrows=0).columns)
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        header = next(workbook.active.iter_rows(max_row=1, values_only=True), None)
+    finally:
+        workbook.close()
+    return _sales_header_labels(header) if header else []
+
+
+def resolve_sales_schema(columns):
+    """Map each logical sales field to the aliases present in ``columns``.
+
+    Resolved once per file; rows then coalesce only the present aliases, in
+    priority order, instead of probing every alias on every row.
+    """
+    present = set(columns)
+    return {
+        field: tuple(alias for alias in aliases if alias in present)
+        for field, aliases in SALES_FIELD_ALIASES.items()
+    }
+
+
+def _schema_columns(schema):
+    """Return the distinct source columns referenced by a resolved schema."""
+    columns = []
+    for aliases in schema.values():
+        for alias in aliases:
+            if alias not in columns:
+                columns.append(alias)
+    return columns
+
+
+def _schema_is_new_commercial_format(schema):
+    return bool(schema["executive_first_name"] and schema["executive_last_name"])
+
+
+def iter_sales_chunks(file_path, chunk_rows=SALES_CHUNK_ROWS, columns=None, as_text=False):
+    """Yield the sales workbook as object-dtype DataFrames of ``chunk_rows`` rows.
+
+    ``.xlsx`` workbooks are streamed with openpyxl's read-only reader so only
+    one chunk is held in memory at a time.  Fully blank rows are kept unless
+    they trail the sheet, matching ``pd.read_excel``.  Legacy ``.xls`` files
+    cannot be streamed and are read whole, then sliced.  When ``columns`` is
+    given only those columns are materialized; ``as_text`` returns every cell
+    as a string (empty for blanks) so ZIPs and prices are never coerced.
+    """
+    file_path = Path(file_path)
+    if file_path.suffix.lower() == ".xls":
+        read_options = {"dtype": str} if as_text else {}
+        if columns is not None:
+            read_options["usecols"] = lambda column: column in columns
+        df = pd.read_excel(file_path, **read_options)
+        if as_text:
+            df = df.fillna("")
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+        return
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        labels = _sales_header_labels(header)
+        positions = [
+            position for position, label in enumerate(labels)
+            if columns is None or label in columns
+        ]
+        labels = [labels[position] for position in positions]
+
+        batch = []
+        blank_rows = []
+        for values in rows:
+            values = [values[position] if position < len(values) else None for position in positions]
+            if all(value is None for value in values):
+                blank_rows.append(values)
+                continue
+            batch.extend(blank_rows)
+            blank_rows = []
+            batch.append(values)
+            if len(batch) >= chunk_rows:
+                yield _sales_chunk_frame(batch, labels, as_text)
+                batch = []
+        if batch:
+            yield _sales_chunk_frame(batch, labels, as_text)
+    finally:
+        workbook.close()
+
+
+def _sales_chunk_frame(batch, labels, as_text):
+    if as_text:
+        batch = [[_cell_text(value) for value in values] for values in batch]
+    return pd.DataFrame(batch, columns=labels, dtype=object)
+
+
+def _coalesce_text_columns(chunk, aliases):
+    """Return the first usable value per row across ``aliases``, vectorized.
+
+    Mirrors :func:`_get_first_nonempty`: values are stripped and blanks or a
+    literal ``nan`` fall through to the next alias.
+    """
+    result = pd.Series("", index=chunk.index, dtype=object)
+    for alias in reversed(aliases):
+        values = chunk[alias].astype(str).str.strip()
+        usable = (values != "") & (values.str.lower() != "nan")
+        result = values.where(usable, result)
+    return result
+
+
+def resolve_sales_fields(chunk, schema):
+    """Return a frame with one coalesced text column per logical sales field."""
+    return pd.DataFrame(
+        {field: _coalesce_text_columns(chunk, aliases) for field, aliases in schema.items()},
+        index=chunk.index,
+    )
+
+
+def _sale_date_range_label(file_path):
+    """Return the ``MMDDYY-MMDDYY`` sale date span by streaming the date column."""
+    oldest_sale = newest_sale = None
+    for chunk in iter_sales_chunks(file_path, columns=['Sale Date']):
+        if 'Sale Date' not in chunk.columns:
+            return None
+        sale_dates = pd.to_datetime(chunk['Sale Date'], errors='coerce').dropna()
+        if sale_dates.empty:
+            continue
+        chunk_oldest, chunk_newest = sale_dates.min(), sale_dates.max()
+        oldest_sale = chunk_oldest if oldest_sale is None else min(oldest_sale, chunk_oldest)
+        newest_sale = chunk_newest if newest_sale is None else max(newest_sale, chunk_newest)
+    if oldest_sale is None:
+        return None
+    return f"{oldest_sale.strftime('%m%d%y')}-{newest_sale.strftime('%m%d%y')}"
+
+
+def _prepare_sales_rows(fields, mode, is_new_format):
+    """Yield cleaned candidate records from a frame of resolved sales fields."""
+    if mode == "personal":
+        names = clean_names(fields["owner_name"], mode)
+    else:  # commercial
+        names = clean_names(
+            pd.Series(
+                list(zip(
+                    fields["executive_first_name"],
+                    fields["executive_last_name"],
+                    fields["legal_name"],
+                    fields["company_name"],
+                )),
+                index=fields.index,
+                dtype=object,
+            ),
+            mode,
+        )
+    for row, name in zip(fields.itertuples(index=False), names):
+        try:
+            property_address = row.property_address
+            mailing_address_value = _join_mailing_address(
+                row.mailing_line_one,
+                row.mailing_line_two,
+                row.mailing_city,
+                row.mailing_state,
+                row.mailing_zip,
+                row.mailing_zip_normalized,
+            )
+            if mode == "personal":
+                filter_check = is_owner_occupied(property_address, mailing_address_value)
+                filter_desc = "non-owner-occupied"
+            else:  # commercial
+                filter_check = is_valid_business(row.business_type) if not is_new_format else True
+                filter_desc = "invalid business type"
+            if isinstance(name, Exception):
+                raise name
+
+            if not name:
+                print(f"⏭️ Skipping row with missing name")
+                continue
+            if not _has_minimum_name_parts(name):
+                print(f"⏭️ Skipping insufficient name parts: {name}")
+                continue
+
+            zip_code = row.site_zip
+            yield {
+                'Name': name,
+                'Address': property_address.title().strip(),
+                'Zip': zip_code,
+                'Mailing Address': mailing_address_value if mode == "personal" else row.street_address,
+                'Location Line': _format_city_state_zip(
+                    row.mailing_city, row.mailing_state, zip_code, row.site_zip_normalized
+                ),
+                'Sale Date': row.sale_date_display if not is_new_format else "Unknown",
+                'Sale Price': float(row.sale_price_value) if not is_new_format else 0.0,
+                'Filter Check': filter_check,
+                'Filter Description': filter_desc,
+            }
+        except Exception as e:
+            print(f"⚠️ Skipped row due to error: {e}")
+
+
+def iter_campaign_recipients(chunks, mode, client_index, schema=None, on_chunk_done=None):
+    """Yield accepted recipients from a stream of sales chunks.
+
+    Each chunk is resolved against ``schema`` (derived from the chunk's own
+    columns when omitted), cleaned, scrubbed against ``client_index`` in one
+    batch and filtered before the next chunk is read, so memory stays bounded
+    by the chunk size rather than the workbook size.  ``on_chunk_done(rows)``
+    is called once the consumer has taken every recipient of a chunk.
+    """
+    for chunk in chunks:
+        yield from scrub_sales_chunk(chunk, mode, client_index, schema)
+        if on_chunk_done is not None:
+            on_chunk_done(len(chunk))
+
+
+def scrub_sales_chunk(chunk, mode, client_index, schema=None):
+    """Clean, scrub and filter one sales chunk and return its accepted recipients."""
+    chunk_schema = schema or resolve_sales_schema(chunk.columns)
+    is_new_format = _schema_is_new_commercial_format(chunk_schema)
+    fields = normalize_sales_fields(resolve_sales_fields(chunk, chunk_schema))
+    prepared = list(_prepare_sales_rows(fields, mode, is_new_format))
+    candidates = scrub_existing_clients(
+        pd.DataFrame(prepared, columns=['Name', 'Mailing Address']), client_index
+    )
+
+    accepted = []
+    for record, existing_client in zip(prepared, candidates['Existing Client']):
+        try:
+            name = record['Name']
+            if existing_client:
+                print(f"⏭️ Skipping existing client: {name}")
+                continue
+
+            if not record['Filter Check'] and not is_new_format:
+                print(f"⏭️ Skipping {record['Filter Description']}: {name}")
+                continue
+
+            accepted.append({
+                'Name': name,
+                'Address': record['Address'],
+                'Zip': record['Zip'],
+                'Location Line': record['Location Line'],
+                'Sale Date': record['Sale Date'],
+                'Sale Price': record['Sale Price'],
+            })
+        except Exception as e:
+            print(f"⚠️ Skipped row due to error: {e}")
+    return accepted
+
+# === CAMPAIGN PIPELINE ===
+PIPELINE_QUEUE_DEPTH = 2  # chunks buffered between neighbouring stages
+PIPELINE_POLL_SECONDS = 0.1
+
+
+class _PipelineStopped(Exception):
+    """Raised inside a stage thread when the pipeline is closed early."""
+
+
+class CampaignPipeline:
+    """Overlap sales ingestion, scrubbing and rendering with bounded queues.
+
+    The ingest stage reads chunks from ``chunks`` in one thread and the scrub
+    stage runs :func:`scrub_sales_chunk` on them in another, while the caller
+    renders the recipients it iterates from :meth:`recipients`.  Each queue
+    holds at most ``queue_depth`` chunks, so memory stays bounded however far
+    the stages drift apart.  A stage failure is re-raised in the caller, and
+    :meth:`close` stops both threads if the caller gives up early.
+    """
+
+    _DONE = object()
+
+    def __init__(self, chunks, mode, client_index, schema=None, queue_depth=PIPELINE_QUEUE_DEPTH):
+        self.chunks = chunks
+        self.mode = mode
+        self.client_index = client_index
+        self.schema = schema
+        self.chunk_queue = queue.Queue(maxsize=queue_depth)
+        self.batch_queue = queue.Queue(maxsize=queue_depth)
+        self.queue_depth = queue_depth
+        self.stats = {
+            stage: {"items": 0, "rows": 0, "seconds": 0.0}
+            for stage in ("ingest", "scrub", "render")
+        }
+        self.peak_depth = {"chunks": 0, "batches": 0}
+        self.errors = []
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._run_stage, args=(self._ingest,), name="pipeline-ingest", daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._scrub,), name="pipeline-scrub", daemon=True),
+        ]
+
+    def _put(self, target, item, depth_name):
+        while True:
+            if self._stop.is_set():
+                raise _PipelineStopped
+            try:
+                target.put(item, timeout=PIPELINE_POLL_SECONDS)
+                break
+            except queue.Full:
+                continue
+        self.peak_depth[depth_name] = max(self.peak_depth[depth_name], target.qsize())
+
+    def _get(self, source):
+        while True:
+            if self._stop.is_set():
+                raise _PipelineStopped
+            try:
+                return source.get(timeout=PIPELINE_POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+    def _run_stage(self, stage):
+        try:
+            stage()
+        except _PipelineStopped:
+            pass
+        except BaseException as e:
+            self.errors.append(e)
+            self._stop.set()
+
+    def _ingest(self):
+        stats = self.stats["ingest"]
+        chunks = iter(self.chunks)
+        try:
+            while True:
+                started = time.perf_counter()
+                chunk = next(chunks, self._DONE)
+                stats["seconds"] += time.perf_counter() - started
+                if chunk is self._DONE:
+                    break
+                stats["items"] += 1
+                stats["rows"] += len(chunk)
+                self._put(self.chunk_queue, chunk, "chunks")
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+        self._put(self.chunk_queue, self._DONE, "chunks")
+
+    def _scrub(self):
+        stats = self.stats["scrub"]
+        while True:
+            chunk = self._get(self.chunk_queue)
+            if chunk is self._DONE:
+                break
+            started = time.perf_counter()
+            accepted = scrub_sales_chunk(chunk, self.mode, self.client_index, self.schema)
+            stats["seconds"] += time.perf_counter() - started
+            stats["items"] += 1
+            stats["rows"] += len(chunk)
+            print(
+                f"🧩 Pipeline chunk {stats['items']}: {len(chunk)} rows scrubbed, "
+                f"{len(accepted)} accepted (queued: {self.chunk_queue.qsize()}/{self.queue_depth} chunks, "
+                f"{self.batch_queue.qsize()}/{self.queue_depth} batches)"
+            )
+            self._put(self.batch_queue, (accepted, len(chunk)), "batches")
+        self._put(self.batch_queue, self._DONE, "batches")
+
+    def recipients(self, on_chunk_done=None):
+        """Yield accepted recipients in sales order while later chunks are read and scrubbed.
+
+        ``on_chunk_done(rows)`` is called once every recipient of a chunk has
+        been taken, like :func:`iter_campaign_recipients`.
+        """
+        for thread in self._threads:
+            thread.start()
+        stats = self.stats["render"]
+        try:
+            while True:
+                try:
+                    batch = self._get(self.batch_queue)
+                except _PipelineStopped:
+                    break
+                if batch is self._DONE:
+                    break
+                accepted, rows = batch
+                started = time.perf_counter()
+                for recipient in accepted:
+                    yield recipient
+                stats["seconds"] += time.perf_counter() - started
+                stats["items"] += len(accepted)
+                stats["rows"] += rows
+                if on_chunk_done is not None:
+                    on_chunk_done(rows)
+        finally:
+            self.close()
+        if self.errors:
+            raise self.errors[0]
+        self.report()
+
+    def close(self):
+        """Stop the stage threads and wait for them to exit."""
+        self._stop.set()
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join()
+
+    def report(self):
+        """Print each stage's throughput and the peak queue depths."""
+        parts = []
+        for stage, stats in self.stats.items():
+            count, unit = (stats["items"], "recipients") if stage == "render" else (stats["rows"], "rows")
+            rate = count / stats["seconds"] if stats["seconds"] else 0.0
+            parts.append(f"{stage} {count} {unit} in {stats['seconds']:.2f}s ({rate:,.0f}/s)")
+        print("⏱️ Pipeline stages: " + ", ".join(parts))
+        print(
+            f"🧩 Pipeline queue peaks: {self.peak_depth['chunks']}/{self.queue_depth} chunks, "
+            f"{self.peak_depth['batches']}/{self.queue_depth} batches"
+        )
+
+# === CAMPAIGN CHECKPOINTS ===
+class CampaignCheckpoint:
+    """Persist scrub progress so an interrupted campaign can be resumed.
+
+    After every sales chunk the recipients accepted from it are appended to
+    ``recipients.jsonl`` and ``state.json`` records how many chunks and rows
+    are done.  Both live in a hidden ``.checkpoint`` folder inside the
+    campaign output folder and are tied to the run's recipients cache key,
+    so a checkpoint is only resumed against the same sales file, client list,
+    ZIP lookup and mode.  Documents are re-rendered from the checkpointed
+    recipients on resume; the zip and PDF streams cannot be reopened.
+    """
+
+    FOLDER = ".checkpoint"
+
+    def __init__(self, output_dir, run_key, chunk_rows=SALES_CHUNK_ROWS):
+        self.folder = Path(output_dir) / self.FOLDER
+        self.state_file = self.folder / "state.json"
+        self.recipients_file = self.folder / "recipients.jsonl"
+        self.run_key = run_key
+        self.chunk_rows = chunk_rows
+        self.chunks_done = 0
+        self.rows_done = 0
+        self.saved = 0
+        self.journal_size = 0
+        self.pending = []
+
+    def _read_state(self):
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("run_key") != self.run_key or state.get("chunk_rows") != self.chunk_rows:
+            return None
+        return state
+
+    def exists(self):
+        """Whether a checkpoint for this run key is on disk."""
+        return self._read_state() is not None
+
+    def load(self):
+        """Return the checkpointed recipients and restore the counters, or None."""
+        state = self._read_state()
+        if state is None:
+            return None
+        recipients = []
+        try:
+            with open(self.recipients_file, "rb") as f:
+                while len(recipients) < state["recipients"]:
+                    line = f.readline()
+                    if not line.endswith(b"\n"):
+                        return None
+                    recipients.append(json.loads(line))
+                journal_size = f.tell()
+        except (OSError, ValueError):
+            return None
+        self.chunks_done = state["chunks_done"]
+        self.rows_done = state["rows_done"]
+        self.saved = len(recipients)
+        self.journal_size = journal_size
+        return recipients
+
+    def start(self):
+        """Discard any previous checkpoint and begin a new one."""
+        self.clear()
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+    def track(self, recipients):
+        """Pass recipients through, remembering those not yet checkpointed."""
+        for recipient in recipients:
+            self.pending.append(recipient)
+            yield recipient
+
+    def chunk_done(self, rows):
+        """Record a fully processed sales chunk of ``rows`` rows."""
+        self.chunks_done += 1
+        self.rows_done += rows
+        self.save()
+
+    def save(self):
+        """Append the pending recipients and write the new state atomically."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        # After a crash the journal may run past the last state; that tail is overwritten.
+        with open(self.recipients_file, "r+b" if self.recipients_file.exists() else "wb") as f:
+            f.seek(self.journal_size)
+            f.truncate()
+            f.write("".join(json.dumps(recipient) + "\n" for recipient in self.pending).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            self.journal_size = f.tell()
+        self.saved += len(self.pending)
+        self.pending = []
+        state = {
+            "run_key": self.run_key,
+            "chunk_rows": self.chunk_rows,
+            "chunks_done": self.chunks_done,
+            "rows_done": self.rows_done,
+            "recipients": self.saved,
+        }
+        with atomic_output(self.state_file) as partial, open(partial, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    def clear(self):
+        """Remove the checkpoint folder."""
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+
+def find_resumable_output_dir(mode, run_key):
+    """Return the newest campaign folder holding a checkpoint for ``run_key``, or None."""
+    candidates = []
+    for state_file in OUTPUT_ROOT.glob(f"*_{mode.capitalize()}_Mailing_Campaign/{CampaignCheckpoint.FOLDER}/state.json"):
+        output_dir = state_file.parent.parent
+        if CampaignCheckpoint(output_dir, run_key).exists():
+            candidates.append((state_file.stat().st_mtime, output_dir))
+    return max(candidates)[1] if candidates else None
+
+# === BUILD CACHE ===
+# Two content-addressed layers in the writable data dir: the scrubbed
+# recipient set and its sale date span (sales file + client list + mode) and
+# the finished output files (recipients + template, subject, signature,
+# format and render date).
+# Entries are touched on every hit and the least recently used are evicted
+# once the cache outgrows BUILD_CACHE_MAX_BYTES.
+BUILD_CACHE_DIR = WRITABLE_DATA_DIR / "build_cache"
+BUILD_CACHE_MAX_BYTES = 1 << 30
+BUILD_CACHE_FORMAT_VERSION = 2
+
+
+def build_cache_key(*parts):
+    """Return a stable hex key for JSON-serializable ``parts``."""
+    payload = json.dumps([BUILD_CACHE_FORMAT_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _recipients_cache_path(key):
+    return BUILD_CACHE_DIR / "recipients" / f"{key}.json"
+
+
+def _outputs_cache_path(key):
+    return BUILD_CACHE_DIR / "outputs" / key
+
+
+def load_cached_recipients(key):
+    """Return the cached ``(recipients, sale_date_range_label)`` for ``key``, or None."""
+    path = _recipients_cache_path(key)
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+        recipients, sale_date_range_label = entry["recipients"], entry["sale_date_range_label"]
+        os.utime(path)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return recipients, sale_date_range_label
+
+
+def store_cached_recipients(key, recipients, sale_date_range_label):
+    """Persist a recipient list, and the sale date span that names its folder, under ``key``."""
+    path = _recipients_cache_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_output(path) as partial, open(partial, "w", encoding="utf-8") as f:
+            json.dump({"sale_date_range_label": sale_date_range_label, "recipients": recipients}, f)
+    except OSError as e:
+        print(f"⚠️ Could not cache recipients: {e}")
+
+
+def restore_cached_outputs(key, output_dir):
+    """Copy a cached output set into ``output_dir``; returns the file names or None."""
+    entry = _outputs_cache_path(key)
+    if not entry.is_dir():
+        return None
+    names = sorted(path.name for path in entry.iterdir())
+    try:
+        remove_shard_parts(output_dir)
+        for name in names:
+            with atomic_output(Path(output_dir) / name) as partial:
+                shutil.copyfile(entry / name, partial)
+        os.utime(entry)
+    except OSError as e:
+        print(f"⚠️ Could not reuse cached outputs: {e}")
+        return None
+    return names
+
+
+def store_cached_outputs(key, paths):
+    """Copy finished output files into the cache under ``key``."""
+    entry = _outputs_cache_path(key)
+    staging = entry.with_name(f".{key}.partial")
+    try:
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        for path in paths:
+            shutil.copyfile(path, staging / Path(path).name)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(staging, entry)
+    except OSError as e:
+        shutil.rmtree(staging, ignore_errors=True)
+        print(f"⚠️ Could not cache outputs: {e}")
+
+
+def _cache_entry_size(path):
+    if path.is_dir():
+        return sum(child.stat().st_size for child in path.iterdir())
+    return path.stat().st_size
+
+
+def evict_build_cache(max_bytes=BUILD_CACHE_MAX_BYTES):
+    """Delete least recently used cache entries until the cache fits ``max_bytes``."""
+    entries = []
+    for layer in ("recipients", "outputs"):
+        folder = BUILD_CACHE_DIR / layer
+        if folder.is_dir():
+            entries.extend(path for path in folder.iterdir() if not path.name.startswith("."))
+    sized = []
+    for path in entries:
+        try:
+            sized.append((path.stat().st_mtime, _cache_entry_size(path), path))
+        except OSError:
+            continue
+    total = sum(size for _, size, _ in sized)
+    evicted = 0
+    for _, size, path in sorted(sized, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+        total -= size
+        evicted += 1
+    if evicted:
+        print(f"🧹 Evicted {evicted} build cache entries ({total / (1 << 20):.1f} MB kept)")
+    return evicted
+
+
+def _output_snapshot(output_dir):
+    """Map each visible file in ``output_dir`` to its (size, mtime) so new writes can be spotted."""
+    return {
+        path.name: (path.stat().st_size, path.stat().st_mtime_ns)
+        for path in Path(output_dir).iterdir()
+        if path.is_file() and not path.name.startswith(".")
+    }
+
+# === ARTIFACT FINALIZATION ===
+# "crm" is the CRM-ready CSV; "history" is the campaign history database upsert.
+CAMPAIGN_ARTIFACTS = ("letters", "envelopes", "labels", "crm", "history")
+ARTIFACT_WRITE_WORKERS = min(4, os.cpu_count() or 1)  # 1 writes the artifacts in turn
+
+
+def resolve_campaign_artifacts(artifacts):
+    """Validate an artifact selection and return it as a frozenset."""
+    if isinstance(artifacts, str):
+        artifacts = [artifacts]
+    selected = frozenset(artifacts or ())
+    unknown = selected.difference(CAMPAIGN_ARTIFACTS)
+    if unknown:
+        raise ValueError(
+            f"Unknown artifacts: {', '.join(sorted(unknown))}. Choose from: {', '.join(CAMPAIGN_ARTIFACTS)}"
+        )
+    if not selected:
+        raise ValueError("Select at least one artifact to generate")
+    return selected
+
+
+def campaign_crm_row(recipient, mode):
+    """Return the CRM-ready row for one accepted recipient."""
+    return {
+        'Name': recipient['Name'],
+        'Address': recipient['Address'],
+        'Zip': recipient['Zip'],
+        'Sale Date': recipient['Sale Date'],
+        'Sale Price': recipient['Sale Price'],
+        'Email': '',
+        'Phone': '',
+        'Source': f"{mode.capitalize()} Anniversary Mailer-Sept-Oct"
+    }
+
+
+def record_campaign_history(campaign_id, mode, crm_rows, sent_at):
+    """Write a campaign's CRM rows to the history database in one transaction."""
+    write_campaign_history(crm_rows, campaign_id=campaign_id, mode=mode, sent_at=sent_at)
+
+
+def write_crm_csv(crm_rows, crm_file):
+    """Write the CRM-ready CSV atomically."""
+    with atomic_output(crm_file) as partial, open(partial, 'w', newline='', encoding='utf-8') as f:
+        dict_writer = csv.DictWriter(f, crm_rows[0].keys())
+        dict_writer.writeheader()
+        dict_writer.writerows(crm_rows)
+    print(f"📥 CRM-ready CSV saved to: {crm_file}")
+
+
+def _timed_artifact(write):
+    started = time.perf_counter()
+    write()
+    return time.perf_counter() - started
+
+
+def finalize_artifacts(artifacts, max_workers=ARTIFACT_WRITE_WORKERS):
+    """Run ``(name, write)`` artifact writers concurrently and report their timings.
+
+    Writers are expected to be atomic (see :func:`atomic_output`), so a
+    failing one never leaves a half-written file behind.  Every writer is
+    allowed to finish before the first failure is re-raised.
+    """
+    if not artifacts:
+        return {}
+    timings = {}
+    errors = []
+    workers = max(min(max_workers, len(artifacts)), 1)
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        pending = [
+            (name, executor.submit(_timed_artifact, write) if executor else write)
+            for name, write in artifacts
+        ]
+        for name, task in pending:
+            try:
+                timings[name] = task.result() if executor else _timed_artifact(task)
+            except Exception as e:
+                print(f"❌ Failed to write {name}: {e}")
+                errors.append(e)
+    finally:
+        if executor:
+            executor.shutdown()
+    if timings:
+        print("⏱️ Artifact write times: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()))
+    if errors:
+        raise errors[0]
+    return timings
+
 # === MAIN ===
 def main(
     mode="personal",
@@ -1332,9 +4204,39 @@ def main(
     signature_title="Vice President",
     signature_image=SIGNATURES_DIR / "signature_brian.png",
     signature_email="Brian@jonesia.com",
+    render_workers=1,
+    shard_size=RENDER_SHARD_SIZE,
+    merge_shards=True,
+    output_format="docx",
+    label_format=DEFAULT_LABEL_FORMAT,
+    artifacts=CAMPAIGN_ARTIFACTS,
+    build_cache=True,
+    resume=False,
 ):
+    """Run a mailing campaign for ``mode`` from the sales workbook at ``file_path``.
+
+    With ``render_workers > 1`` (or ``merge_shards=False``) letters and
+    envelopes are rendered in shards of ``shard_size`` recipients, see
+    :func:`render_document_shards`; otherwise they are rendered in-process.
+    ``output_format="pdf"`` writes ``all_letters.pdf``, ``all_envelopes.pdf``
+    and ``mailing_labels.pdf`` directly (always in-process) instead of the
+    Word documents.  ``output_format="mail_merge"`` writes one letter,
+    envelope and label template with merge fields plus
+    ``mail_merge_data.csv`` instead of one copy per recipient.
+    ``label_format`` picks the label sheet from :data:`AVERY_LABEL_FORMATS`.
+    ``artifacts`` selects what to produce from :data:`CAMPAIGN_ARTIFACTS`;
+    unselected stages are skipped entirely, including their per-row work.
+    With ``build_cache`` the scrubbed recipients and finished outputs are
+    reused from the build cache when their inputs are unchanged.
+    Progress is checkpointed after every sales chunk; ``resume=True`` picks
+    an interrupted run up from its last checkpoint.
+    """
     if mode not in ["personal", "commercial"]:
         raise ValueError("Mode must be 'personal' or 'commercial'")
+    if output_format not in ["docx", "pdf", "mail_merge"]:
+        raise ValueError("Output format must be 'docx', 'pdf' or 'mail_merge'")
+    get_label_format(label_format)
+    artifacts = resolve_campaign_artifacts(artifacts)
     if not subject_line:
         if mode == "personal":
             subject_line = "Homeowners Insurance Rates Are Finally on the Decline – Don’t Miss Out!"
@@ -1368,13 +4270,7 @@ def main(
                 "Best Regards,"
             )
 
-
-
-    letters_doc = Document()
-    envelopes_doc = Document()
-
     load_zip_lookup()
-    client_list = load_client_list()
 
     file_path = Path(file_path)
     if not file_path.exists():
@@ -1385,23 +4281,34 @@ def main(
         candidate = SIGNATURES_DIR / signature_image.name
         if candidate.exists():
             signature_image = candidate
+    if "letters" in artifacts:
+        signature_image = prepare_signature_image(signature_image) or signature_image
 
-    try:
-        df = pd.read_excel(file_path)
-    except Exception as e:
-        raise Exception(f"Failed to read Excel file: {e}")
-    sale_date_range_label = None
-    if 'Sale Date' in df.columns:
-        sale_dates = pd.to_datetime(df['Sale Date'], errors='coerce')
-        sale_dates = sale_dates.dropna()
-        if not sale_dates.empty:
-            oldest_sale = sale_dates.min()
-            newest_sale = sale_dates.max()
-            sale_date_range_label = f"{oldest_sale.strftime('%m%d%y')}-{newest_sale.strftime('%m%d%y')}"
     run_started_at = datetime.now()
     timestamp = run_started_at.strftime("%m%d%y_%H%M%S")
     OUTPUT_ROOT.mkdir(parents=True, exist_ok=True)
-    if sale_date_range_label:
+    # The cache keys only fingerprint files, so a fully cached run never
+    # loads the client index or reads the sales workbook.
+    recipients_key = build_cache_key(
+        "recipients",
+        _file_sha256(file_path),
+        client_index_version(),
+        _file_sha256(ZIP_LOOKUP_FILE) if ZIP_LOOKUP_FILE.exists() else "",
+        mode,
+    )
+    cached = load_cached_recipients(recipients_key) if build_cache else None
+    if cached is not None:
+        cached_recipients, sale_date_range_label = cached
+    else:
+        cached_recipients = None
+        try:
+            sale_date_range_label = _sale_date_range_label(file_path)
+        except Exception as e:
+            raise Exception(f"Failed to read Excel file: {e}")
+    resumable_dir = find_resumable_output_dir(mode, recipients_key) if resume else None
+    if resumable_dir is not None:
+        folder_name = resumable_dir.name
+    elif sale_date_range_label:
         folder_name = f"{sale_date_range_label}_{mode.capitalize()}_Mailing_Campaign"
     else:
         
@@ -1417,100 +4324,206 @@ def main(
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     if created_output_dir:
         print(f"📁 Created output folder: {OUTPUT_DIR}")
+    for stale in OUTPUT_DIR.glob(".*.partial"):
+        stale.unlink()
+
+    if build_cache:
+        outputs_key = build_cache_key(
+            "outputs",
+            recipients_key,
+            run_started_at.strftime('%B %d, %Y'),
+            content,
+            subject_line,
+            signature_name,
+            signature_title,
+            signature_email,
+            _file_sha256(signature_image) if signature_image.exists() else "",
+            output_format,
+            get_label_format(label_format),
+            sorted(artifacts - {"history"}),
+            None if merge_shards else (render_workers, shard_size),
+        )
+        if cached_recipients is not None:
+            restored = restore_cached_outputs(outputs_key, OUTPUT_DIR)
+            if restored is not None:
+                print(f"♻️ Inputs unchanged, reused {len(restored)} output files from the build cache")
+                if "history" in artifacts:
+                    crm_rows = [campaign_crm_row(recipient, mode) for recipient in cached_recipients]
+                    record_campaign_history(folder_name, mode, crm_rows, run_started_at)
+                return
+            print(f"♻️ Reusing {len(cached_recipients)} scrubbed recipients from the build cache")
+        outputs_before = _output_snapshot(OUTPUT_DIR)
 
     labels = []
     crm_rows = []
-    is_new_format = 'Executive First Name' in df.columns and 'Executive Last Name' in df.columns
-
-    for _, row in df.iterrows():
+    letter_options = (content, mode, subject_line, signature_name, signature_title, signature_image, signature_email)
+    pdf_output = output_format == "pdf"
+    mail_merge_output = output_format == "mail_merge"
+    merge_rows = []
+    render_letters = "letters" in artifacts
+    render_envelopes = "envelopes" in artifacts
+    render_labels = "labels" in artifacts
+    keep_crm_rows = "crm" in artifacts or "history" in artifacts
+    sharded = output_format == "docx" and (render_workers > 1 or not merge_shards)
+    if pdf_output:
+        LETTERS_FILE = OUTPUT_DIR / "all_letters.pdf"
+        ENVELOPES_FILE = OUTPUT_DIR / "all_envelopes.pdf"
+        LABELS_FILE = OUTPUT_DIR / "mailing_labels.pdf"
+        if render_letters:
+            letters_pdf = StreamingPdfWriter(LETTERS_FILE, signature_image)
+        if render_envelopes:
+            envelopes_pdf = StreamingPdfWriter(ENVELOPES_FILE)
+    elif not (mail_merge_output or sharded):
+        if render_letters:
+            letters_doc = Document()
+            letter_skeleton = LetterSkeleton(letters_doc, *letter_options)
+            letters_writer = StreamingDocxWriter(LETTERS_FILE, letters_doc)
+        if render_envelopes:
+            envelopes_doc = create_envelope_document()
+            envelopes_writer = StreamingDocxWriter(ENVELOPES_FILE, envelopes_doc)
+    shard_recipients = []
+
+    checkpoint = CampaignCheckpoint(OUTPUT_DIR, recipients_key)
+    if cached_recipients is not None:
+        recipients = cached_recipients
+        fresh_recipients = None
+    else:
+        resumed_recipients = checkpoint.load() if resume else None
+        if resumed_recipients is None:
+            if resume:
+                print("⚠️ No checkpoint matches these inputs, starting from the first row")
+            resumed_recipients = []
+            checkpoint.start()
+        else:
+            print(
+                f"⏯️ Resuming from checkpoint: {checkpoint.rows_done} rows read, "
+                f"{len(resumed_recipients)} recipients accepted"
+            )
+        schema = resolve_sales_schema(read_sales_header(file_path))
+        chunks = iter_sales_chunks(file_path, columns=_schema_columns(schema), as_text=True)
+        pipeline = CampaignPipeline(
+            islice(chunks, checkpoint.chunks_done, None), mode, load_client_index(), schema
+        )
+        remaining = pipeline.recipients(on_chunk_done=checkpoint.chunk_done)
+        recipients = chain(resumed_recipients, checkpoint.track(remaining))
+        fresh_recipients = [] if build_cache else None
+    for recipient in recipients:
+        if fresh_recipients is not None:
+            fresh_recipients.append(recipient)
         try:
-            property_address = _get_first_nonempty(row, ['Address', 'Situs'])
-            mailing_address_value = _build_mailing_address(row)
-            if mode == "personal":
-                name_key = 'Owner Name'
-                filter_check = is_owner_occupied(property_address, mailing_address_value)
-                filter_desc = "non-owner-occupied"
-            else:  # commercial
-                name_key = 'Executive First Name' if is_new_format else 'Business Name'
-                filter_check = is_valid_business(row.get('Business Type', '')) if not is_new_format else True
-                filter_desc = "invalid business type"
-
-            name = clean_name(row, mode)
-            if not name:
-                print(f"⏭️ Skipping row with missing name")
-                continue
-            if not _has_minimum_name_parts(name):
-                print(f"⏭️ Skipping insufficient name parts: {name}")
-                continue
-
-            address = _get_first_nonempty(row, ['Address', 'Situs']).title().strip()
-            zip_code = _get_first_nonempty(row, ['Site Zip Code', 'Property Zip', 'Zip Code', 'Zip'])
-            mailing_address = mailing_address_value if mode == "personal" else _get_first_nonempty(row, ['Address'])
-            location_line = _compose_city_state_zip(row, zip_code)
-            sale_date_raw = _get_first_nonempty(row, ['Sale Date']) if not is_new_format else "Unknown"
-            sale_price_str = _get_first_nonempty(row, ['Sale Price']) if not is_new_format else "0.0"
-            sale_price_str = sale_price_str.replace('$', '').replace(',', '') if sale_price_str else ''
-
-            if is_existing_client(name, mailing_address, client_list):
-                print(f"⏭️ Skipping existing client: {name}")
-                continue
-
-            if not filter_check and not is_new_format:
-                print(f"⏭️ Skipping {filter_desc}: {name}")
-                continue
-
-            try:
-                sale_price = float(sale_price_str) if sale_price_str else 0.0
-            except ValueError:
-                sale_price = 0.0
-            try:
-                sale_date = datetime.strptime(sale_date_raw, '%m/%d/%Y').strftime('%B %d, %Y') if sale_date_raw else "Unknown"
-            except ValueError:
-                sale_date = "Unknown"
-
-            add_letter_to_doc(letters_doc, name, address, zip_code, sale_date, sale_price, content, mode, subject_line, signature_name, signature_title, signature_image, signature_email)
-            add_envelope_to_doc(envelopes_doc, name, address, location_line, signature_name)
+            name = recipient['Name']
+            address = recipient['Address']
+            zip_code = recipient['Zip']
+            location_line = recipient['Location Line']
+            sale_date = recipient['Sale Date']
+            sale_price = recipient['Sale Price']
+
+            if mail_merge_output:
+                if render_letters or render_envelopes or render_labels:
+                    merge_rows.append(mail_merge_record(
+                        name, address, location_line, zip_code, subject_line, signature_name, signature_title, signature_email
+                    ))
+            elif pdf_output:
+                if render_letters:
+                    add_letter_to_pdf(letters_pdf, name, address, zip_code, sale_date, sale_price, *letter_options)
+                if render_envelopes:
+                    add_envelope_to_pdf(envelopes_pdf, name, address, location_line, signature_name)
+            elif sharded:
+                if render_letters or render_envelopes:
+                    shard_recipients.append(recipient)
+            else:
+                if render_letters:
+                    letter_skeleton.add(name, address, zip_code, sale_date, sale_price)
+                    letters_writer.flush()
+                if render_envelopes:
+                    add_envelope_to_doc(envelopes_doc, name, address, location_line, signature_name)
+                    envelopes_writer.flush()
 
-            label_text = f"{name}\n{address}\n{location_line}" if location_line else f"{name}\n{address}"
-            labels.append(label_text)
+            if render_labels and not mail_merge_output:
+                label_text = f"{name}\n{address}\n{location_line}" if location_line else f"{name}\n{address}"
+                labels.append(label_text)
 
-            crm_rows.append({
-                'Name': name,
-                'Address': address,
-                'Zip': zip_code,
-                'Sale Date': sale_date,
-                'Sale Price': sale_price,
-                'Email': '',
-                'Phone': '',
-                'Source': f"{mode.capitalize()} Anniversary Mailer-Sept-Oct"
-            })
+            if keep_crm_rows:
+                crm_rows.append(campaign_crm_row(recipient, mode))
 
             print(f"✅ Processed: {name}")
 
         except Exception as e:
             print(f"⚠️ Skipped row due to error: {e}")
 
+    artifact_writers = []
     if labels:
-        create_labels(labels, LABELS_FILE)
-
-    if crm_rows:
-        keys = crm_rows[0].keys()
-        with open(CRM_EXPORT_FILE, 'w', newline='', encoding='utf-8') as f:
-            dict_writer = csv.DictWriter(f, keys)
-            dict_writer.writeheader()
-            dict_writer.writerows(crm_rows)
-        print(f"📥 CRM-ready CSV saved to: {CRM_EXPORT_FILE}")
-        append_campaign_history(folder_name, mode, crm_rows)
-        _append_campaign_records(
-            crm_rows,
-            campaign_id=OUTPUT_DIR.name,
-            mode=mode,
-            sent_at=run_started_at,
+        if pdf_output:
+            artifact_writers.append(("labels", lambda: create_labels_pdf(labels, LABELS_FILE, label_format)))
+        else:
+            artifact_writers.append(("labels", lambda: create_labels(labels, LABELS_FILE, label_format)))
+    if crm_rows and "crm" in artifacts:
+        artifact_writers.append(("CRM CSV", lambda: write_crm_csv(crm_rows, CRM_EXPORT_FILE)))
+    if mail_merge_output:
+        if merge_rows:
+            artifact_writers.append((
+                "mail merge",
+                lambda: write_mail_merge_outputs(
+                    OUTPUT_DIR, merge_rows, content, signature_image, label_format, templates=artifacts
+                ),
+            ))
+    elif pdf_output:
+        if render_letters:
+            artifact_writers.append(("letters", letters_pdf.close))
+        if render_envelopes:
+            artifact_writers.append(("envelopes", envelopes_pdf.close))
+    elif sharded:
+        if render_letters or render_envelopes:
+            # Shards render in spawned worker processes before the writer threads start.
+            render_document_shards(
+                shard_recipients,
+                OUTPUT_DIR,
+                letter_options,
+                signature_name,
+                render_workers=render_workers,
+                shard_size=shard_size,
+                merge_shards=merge_shards,
+                render_letters=render_letters,
+                render_envelopes=render_envelopes,
+            )
+    else:
+        if render_letters:
+            artifact_writers.append(("letters", letters_writer.close))
+        if render_envelopes:
+            artifact_writers.append(("envelopes", envelopes_writer.close))
+    finalize_artifacts(artifact_writers)
+    if not (mail_merge_output or sharded):
+        if render_letters:
+            print(f"📄 All letters saved to: {LETTERS_FILE}")
+        if render_envelopes:
+            print(f"✉️ All envelopes saved to: {ENVELOPES_FILE}")
+
+    if crm_rows and "history" in artifacts:
+        record_campaign_history(folder_name, mode, crm_rows, run_started_at)
+
+    checkpoint.clear()
+    if build_cache:
+        if fresh_recipients is not None:
+            store_cached_recipients(recipients_key, fresh_recipients, sale_date_range_label)
+        produced = [
+            OUTPUT_DIR / name
+            for name, state in _output_snapshot(OUTPUT_DIR).items()
+            if outputs_before.get(name) != state
+        ]
+        if produced:
+            store_cached_outputs(outputs_key, produced)
+        evict_build_cache()
+    stats = name_cache_stats()
+    print(
+        f"🗂️ Name cache: {stats['batch_rows']} rows, {stats['batch_distinct']} distinct, "
+        f"{stats['hits']} hits, {stats['misses']} misses"
+    )
+    db_stats = campaign_db.stats()
+    if db_stats["connections_opened"]:
+        print(
+            f"🗄️ Campaign database: {db_stats['connections_opened']} connections opened, "
+            f"{db_stats['queries']} queries run"
         )
-    letters_doc.save(str(LETTERS_FILE))
-    envelopes_doc.save(str(ENVELOPES_FILE))
-    print(f"📄 All letters saved to: {LETTERS_FILE}")
-    print(f"✉️ All envelopes saved to: {ENVELOPES_FILE}")
 
 def print_logo():
     logo = r"""
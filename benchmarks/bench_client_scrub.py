@@ -0,0 +1,136 @@
+"""Benchmark the master-client scrub as the client list grows.
+
+Usage:
+    python benchmarks/bench_client_scrub.py [--rows 200] [--sizes 1000 10000 50000 200000]
+
+Synthetic clients and sales rows are generated with a fixed seed.  For every
+client-list size the script times the bigram-filtered :class:`ClientMatchIndex`
+lookup, the batch ``scrub_existing_clients`` pass (rapidfuzz prefilter on
+every core, confirmed with fuzzywuzzy; only when rapidfuzz is installed) and,
+up to ``--linear-limit`` clients, the original linear scan so the approaches
+can be compared.  ``agree`` checks the index and batch decisions against the
+linear scan, or the batch against the index beyond the linear limit.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd  # noqa: E402
+
+import AutoMailerPro  # noqa: E402
+
+FIRST_NAMES = [
+    "John", "Mary", "Angela", "Denise", "Eduardo", "David", "Linda", "Robert",
+    "James", "Patricia", "Michael", "Barbara", "William", "Susan", "Carlos",
+    "Jennifer", "Richard", "Elizabeth", "Joseph", "Jessica", "Thomas", "Sarah",
+    "Charles", "Karen", "Christopher", "Nancy", "Daniel", "Lisa", "Matthew",
+    "Betty", "Anthony", "Margaret", "Mark", "Sandra", "Donald", "Ashley",
+    "Steven", "Kimberly", "Paul", "Emily", "Andrew", "Donna", "Joshua",
+    "Michelle", "Kenneth", "Carol", "Kevin", "Amanda", "Brian", "Melissa",
+    "George", "Deborah", "Timothy", "Stephanie", "Ronald", "Rebecca", "Jason",
+    "Sharon", "Edward", "Laura", "Jeffrey", "Cynthia", "Ryan", "Kathleen",
+]
+SURNAME_SYLLABLES = [
+    "an", "ber", "cad", "dell", "ford", "gar", "ham", "son", "ley", "mor",
+    "ne", "pun", "ro", "ves", "sto", "wil", "ton", "cha", "lo", "pez", "ri",
+]
+LAST_NAMES = sorted({
+    (first + second + third).title()
+    for first in SURNAME_SYLLABLES
+    for second in SURNAME_SYLLABLES
+    for third in ("", "s", "er")
+})
+STREETS = [
+    "Main St", "Hickory Dr", "Conley Pl", "SW Greenbriar Cv", "Ocean Dr",
+    "20th St", "Fieldstone Ranch Sq", "Indian River Blvd", "Royal Palm Pl",
+]
+CITIES = [("Vero Beach", "32960"), ("Vero Beach", "32962"), ("Fort Pierce", "34982"),
+          ("Sebastian", "32958"), ("Port St. Lucie", "34986")]
+
+
+def _random_client(rng):
+    city, zip_code = rng.choice(CITIES)
+    return {
+        "Name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "Mailing Address": (
+            f"{rng.randint(100, 99999)} {rng.choice(STREETS)}, {city}, FL {zip_code}"
+        ),
+    }
+
+
+def _random_row(rng, clients):
+    if clients and rng.random() < 0.2:
+        client = rng.choice(clients)
+        first, last = client["Name"].split(" ", 1)
+        street, city, state_zip = client["Mailing Address"].split(", ")
+        return f"{first} {last}", f"{street} | {city}, {state_zip}"
+    city, zip_code = rng.choice(CITIES)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    address = f"{rng.randint(100, 99999)} {rng.choice(STREETS)} | {city}, FL {zip_code}"
+    return name, address
+
+
+def _time_scrub(rows, client_list):
+    started = time.perf_counter()
+    decisions = [
+        AutoMailerPro.is_existing_client(name, address, client_list)
+        for name, address in rows
+    ]
+    return time.perf_counter() - started, decisions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 50000, 200000]
+    )
+    parser.add_argument("--linear-limit", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    print(f"cores: {os.cpu_count()}")
+    print(f"{'clients':>8} {'build s':>8} {'index s':>8} {'ms/row':>7} "
+          f"{'batch s':>8} {'linear s':>9} {'speedup':>8} {'agree':>6}")
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        clients = [_random_client(rng) for _ in range(size)]
+        rows = [_random_row(rng, clients) for _ in range(args.rows)]
+
+        started = time.perf_counter()
+        index = AutoMailerPro.build_client_index(clients)
+        build_seconds = time.perf_counter() - started
+        index_seconds, index_decisions = _time_scrub(rows, index)
+
+        batch_text, batch_decisions = "-", None
+        if AutoMailerPro.rapid_process is not None:
+            frame = pd.DataFrame(rows, columns=["Name", "Mailing Address"])
+            started = time.perf_counter()
+            AutoMailerPro.scrub_existing_clients(frame, index)
+            batch_text = f"{time.perf_counter() - started:.2f}"
+            batch_decisions = frame["Existing Client"].tolist()
+
+        linear_text, speedup_text = "-", "-"
+        expected = index_decisions
+        if size <= args.linear_limit:
+            linear_seconds, expected = _time_scrub(rows, clients)
+            linear_text = f"{linear_seconds:.2f}"
+            speedup_text = f"{linear_seconds / max(index_seconds, 1e-9):.0f}x"
+        agree = index_decisions == expected and batch_decisions in (None, expected)
+        agree_text = "yes" if agree else "NO"
+
+        print(
+            f"{size:>8} {build_seconds:>8.2f} {index_seconds:>8.2f} "
+            f"{index_seconds / args.rows * 1000:>7.2f} {batch_text:>8} {linear_text:>9} "
+            f"{speedup_text:>8} {agree_text:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
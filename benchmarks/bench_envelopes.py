@@ -0,0 +1,96 @@
+"""Benchmark envelope documents: one section per recipient versus one shared section.
+
+Usage:
+    python benchmarks/bench_envelopes.py [--envelopes 5000]
+
+Both layouts are written through :class:`StreamingDocxWriter`, as ``main()``
+does.  For each layout the script reports generation time, file size, the
+number of ``sectPr`` elements and the time python-docx needs to reopen the
+file and walk its sections.  Word itself cannot be timed
+headless; when LibreOffice (``soffice``) is on PATH, the time of a headless
+PDF conversion is reported as an open-and-paginate proxy.
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx import Document  # noqa: E402
+from docx.shared import Inches  # noqa: E402
+
+import AutoMailerPro  # noqa: E402
+
+
+def _add_envelope_with_section(doc, name, address, location_line, signature_name):
+    """The previous renderer: a new #10 section for every envelope."""
+    AutoMailerPro.setup_envelope_section(doc.add_section())
+    AutoMailerPro.add_envelope_to_doc(doc, name, address, location_line, signature_name)
+
+
+def _build(path, envelopes, per_recipient_sections):
+    started = time.perf_counter()
+    if per_recipient_sections:
+        doc = Document()
+        add_envelope = _add_envelope_with_section
+    else:
+        doc = AutoMailerPro.create_envelope_document()
+        add_envelope = AutoMailerPro.add_envelope_to_doc
+    writer = AutoMailerPro.StreamingDocxWriter(path, doc)
+    for index in range(envelopes):
+        add_envelope(doc, f"Recipient {index}", f"{index} Main St", "Vero Beach, FL 32960", "Brian Jones")
+        writer.flush()
+    writer.close()
+    return time.perf_counter() - started
+
+
+def _reopen(path):
+    started = time.perf_counter()
+    doc = Document(str(path))
+    widths = {section.page_width for section in doc.sections}
+    assert widths == {Inches(9.5)} or len(widths) == 2
+    return time.perf_counter() - started
+
+
+def _soffice_convert(path):
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    if not soffice:
+        return None
+    started = time.perf_counter()
+    subprocess.run(
+        [soffice, "--headless", "--convert-to", "pdf", "--outdir", str(path.parent), str(path)],
+        check=True,
+        capture_output=True,
+    )
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envelopes", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'layout':>18} {'build s':>8} {'size KB':>8} {'sectPr':>7} {'reopen s':>9} {'soffice s':>10}")
+    with tempfile.TemporaryDirectory() as folder:
+        for label, per_recipient_sections in (("section/envelope", True), ("shared section", False)):
+            path = Path(folder) / f"{label.replace('/', '_').replace(' ', '_')}.docx"
+            build_seconds = _build(path, args.envelopes, per_recipient_sections)
+            with zipfile.ZipFile(path) as archive:
+                sections = archive.read("word/document.xml").count(b"<w:sectPr")
+            reopen_seconds = _reopen(path)
+            convert_seconds = _soffice_convert(path)
+            convert_text = f"{convert_seconds:.2f}" if convert_seconds is not None else "-"
+            print(
+                f"{label:>18} {build_seconds:>8.2f} {path.stat().st_size / 1024:>8.0f} "
+                f"{sections:>7} {reopen_seconds:>9.2f} {convert_text:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
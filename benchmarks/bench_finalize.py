@@ -0,0 +1,80 @@
+"""Benchmark the end-of-run artifact writes: one after another versus concurrently.
+
+Usage:
+    python benchmarks/bench_finalize.py [--recipients 20000] [--workers 4]
+
+Synthetic recipients feed the four artifacts ``main()`` finishes with: the
+labels document, the CRM CSV, and the letters and envelopes streams (already
+rendered and flushed, so only their closing writes remain).  The same set is
+finalized once sequentially and once through :func:`finalize_artifacts`.
+Thread overlap comes from zlib and file I/O releasing the GIL, so the gain
+depends on the number of cores.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx import Document  # noqa: E402
+
+import AutoMailerPro  # noqa: E402
+
+
+def _artifacts(folder, recipients):
+    folder = Path(folder)
+    letters_doc = Document()
+    envelopes_doc = AutoMailerPro.create_envelope_document()
+    letters_writer = AutoMailerPro.StreamingDocxWriter(folder / "all_letters.docx", letters_doc)
+    envelopes_writer = AutoMailerPro.StreamingDocxWriter(folder / "all_envelopes.docx", envelopes_doc)
+    skeleton = AutoMailerPro.LetterSkeleton(
+        letters_doc, "Dear [Name],\n\nRates are coming down.", "personal", "Subject",
+        "Brian Jones", "Vice President", AutoMailerPro.SIGNATURES_DIR / "signature_brian.png", "Brian@jonesia.com",
+    )
+    labels, crm_rows = [], []
+    for index in range(recipients):
+        name, address = f"Recipient {index}", f"{index} Main St"
+        skeleton.add(name, address, "32960", "Unknown", 0.0)
+        AutoMailerPro.add_envelope_to_doc(envelopes_doc, name, address, "Vero Beach, FL 32960", "Brian Jones")
+        letters_writer.flush()
+        envelopes_writer.flush()
+        labels.append(f"{name}\n{address}\nVero Beach, FL 32960")
+        crm_rows.append({"Name": name, "Address": address, "Zip": "32960", "Sale Date": "Unknown",
+                         "Sale Price": 0.0, "Email": "", "Phone": "", "Source": "Benchmark"})
+    return [
+        ("labels", lambda: AutoMailerPro.create_labels(labels, folder / "mailing_labels.docx")),
+        ("CRM CSV", lambda: AutoMailerPro.write_crm_csv(crm_rows, folder / "crm.csv")),
+        ("letters", letters_writer.close),
+        ("envelopes", envelopes_writer.close),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipients", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=AutoMailerPro.ARTIFACT_WRITE_WORKERS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as sequential_folder, tempfile.TemporaryDirectory() as concurrent_folder:
+        artifacts = _artifacts(sequential_folder, args.recipients)
+        started = time.perf_counter()
+        for _, write in artifacts:
+            write()
+        sequential_seconds = time.perf_counter() - started
+
+        artifacts = _artifacts(concurrent_folder, args.recipients)
+        started = time.perf_counter()
+        AutoMailerPro.finalize_artifacts(artifacts, max_workers=args.workers)
+        concurrent_seconds = time.perf_counter() - started
+
+    print(f"recipients:  {args.recipients}")
+    print(f"sequential:  {sequential_seconds:.2f}s")
+    print(f"concurrent:  {concurrent_seconds:.2f}s ({args.workers} threads)")
+    print(f"speedup:     {sequential_seconds / max(concurrent_seconds, 1e-9):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
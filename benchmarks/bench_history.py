@@ -0,0 +1,293 @@
+"""Benchmark logging a campaign's CRM rows to the campaign history database.
+
+Usage:
+    python benchmarks/bench_history.py [--rows 50000]
+
+Compares the previous logging path (``append_campaign_history`` followed by
+``_append_campaign_records``, vendored below from the baseline module: two
+connections, each upserting every row under the original schema) with the
+single ``write_campaign_history`` transaction on a WAL database, which also
+refreshes ``contact_summary``.  Both run against fresh databases in a
+temporary folder, and the stored campaign_contacts rows are compared column
+by column, keyed on (campaign_id, name, address).
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import AutoMailerPro  # noqa: E402
+
+STREETS = ["Main St", "Hickory Dr", "Conley Pl", "Ocean Dr", "20th St", "Royal Palm Pl"]
+
+
+def _synthetic_rows(rows, seed):
+    rng = random.Random(seed)
+    return [
+        {
+            "Name": f"Owner {index}",
+            "Address": f"{rng.randint(100, 99999)} {rng.choice(STREETS)}",
+            "Zip": rng.choice(["32960", "32962", "34982", "32958"]),
+            "Sale Date": "August 14, 2025",
+            "Sale Price": float(rng.randint(100, 900) * 1000),
+            "Email": "",
+            "Phone": "",
+            "Source": "Personal Anniversary Mailer-Sept-Oct",
+        }
+        for index in range(rows)
+    ]
+
+
+# The logging path as it stood before write_campaign_history, vendored from
+# the baseline AutoMailerPro.py: main() called append_campaign_history and then
+# _append_campaign_records for the same rows.  Only the database path is a
+# parameter here, both writes take main()'s sent_at, and the log lines are
+# dropped.
+LEGACY_COLUMNS = (
+    "campaign_id",
+    "mode",
+    "sent_at",
+    "name",
+    "address",
+    "zip",
+    "sale_date",
+    "sale_price",
+    "email",
+    "phone",
+    "source",
+)
+
+LEGACY_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS campaign_contacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    campaign_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    sent_at TEXT NOT NULL,
+    name TEXT NOT NULL,
+    address TEXT NOT NULL,
+    zip TEXT,
+    sale_date TEXT,
+    sale_price REAL,
+    email TEXT,
+    phone TEXT,
+    source TEXT,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (campaign_id, name, address)
+)
+"""
+
+LEGACY_INSERT_SQL = """
+INSERT INTO campaign_contacts (
+    campaign_id,
+    mode,
+    sent_at,
+    name,
+    address,
+    zip,
+    sale_date,
+    sale_price,
+    email,
+    phone,
+    source
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(campaign_id, name, address) DO UPDATE SET
+    mode=excluded.mode,
+    sent_at=excluded.sent_at,
+    zip=excluded.zip,
+    sale_date=excluded.sale_date,
+    sale_price=excluded.sale_price,
+    email=excluded.email,
+    phone=excluded.phone,
+    source=excluded.source
+"""
+
+
+def _legacy_rebuild_table(connection):
+    cursor = connection.cursor()
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='campaign_contacts'"
+    )
+    has_existing = cursor.fetchone() is not None
+
+    if has_existing:
+        cursor.execute("ALTER TABLE campaign_contacts RENAME TO campaign_contacts_legacy")
+
+    cursor.execute(LEGACY_TABLE_SQL)
+
+    if has_existing:
+        cursor.execute("PRAGMA table_info('campaign_contacts_legacy')")
+        legacy_columns = [row[1] for row in cursor.fetchall()]
+        transferable_columns = [
+            column for column in LEGACY_COLUMNS if column in legacy_columns
+        ]
+        if transferable_columns:
+            column_list = ", ".join(transferable_columns)
+            cursor.execute(
+                f"INSERT OR IGNORE INTO campaign_contacts ({column_list}) "
+                f"SELECT {column_list} FROM campaign_contacts_legacy"
+            )
+        cursor.execute("DROP TABLE IF EXISTS campaign_contacts_legacy")
+
+
+def _legacy_ensure_schema(connection):
+    cursor = connection.cursor()
+    cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='campaign_contacts'"
+    )
+    result = cursor.fetchone()
+
+    if not result or not result[0]:
+        cursor.execute(LEGACY_TABLE_SQL)
+        return
+
+    existing_sql = result[0].upper()
+    if "UNIQUE (CAMPAIGN_ID, NAME, ADDRESS)" not in existing_sql:
+        _legacy_rebuild_table(connection)
+        return
+
+    cursor.execute("PRAGMA table_info('campaign_contacts')")
+    existing_columns = [row[1] for row in cursor.fetchall()]
+    expected_columns = {"id", "created_at", *LEGACY_COLUMNS}
+
+    if not expected_columns.issubset(set(existing_columns)):
+        _legacy_rebuild_table(connection)
+
+
+def _legacy_append_campaign_history(db_path, campaign_id, mode, crm_rows, sent_at):
+    if not crm_rows:
+        return
+
+    sent_at = sent_at.isoformat(timespec="seconds")
+    rows_to_insert = []
+    for row in crm_rows:
+        sale_price_raw = row.get("Sale Price", 0.0)
+        try:
+            sale_price = float(sale_price_raw or 0.0)
+        except (TypeError, ValueError):
+            sale_price = 0.0
+
+        rows_to_insert.append(
+            (
+                campaign_id,
+                mode,
+                sent_at,
+                row.get("Name", ""),
+                row.get("Address", ""),
+                row.get("Zip", ""),
+                row.get("Sale Date", ""),
+                sale_price,
+                row.get("Email", ""),
+                row.get("Phone", ""),
+                row.get("Source", ""),
+            )
+        )
+
+    with sqlite3.connect(db_path) as connection:
+        _legacy_ensure_schema(connection)
+        cursor = connection.cursor()
+        cursor.executemany(LEGACY_INSERT_SQL, rows_to_insert)
+        connection.commit()
+
+
+def _legacy_append_campaign_records(db_path, records, *, campaign_id, mode, sent_at):
+    records = list(records)
+    if not records:
+        return
+
+    sent_at_iso = sent_at.isoformat(timespec="seconds")
+    with sqlite3.connect(db_path) as connection:
+        insert_sql = LEGACY_INSERT_SQL
+
+        payload = []
+        for record in records:
+            payload.append(
+                (
+                    campaign_id,
+                    mode,
+                    sent_at_iso,
+                    str(record.get("Name", "")),
+                    str(record.get("Address", "")),
+                    str(record.get("Zip", "")) or None,
+                    str(record.get("Sale Date", "")) or None,
+                    float(record.get("Sale Price", 0.0) or 0.0),
+                    str(record.get("Email", "")) or None,
+                    str(record.get("Phone", "")) or None,
+                    str(record.get("Source", "")) or None,
+                )
+            )
+
+        connection.executemany(insert_sql, payload)
+        connection.commit()
+
+
+def _legacy_write(db_path, crm_rows, campaign_id, sent_at):
+    _legacy_append_campaign_history(db_path, campaign_id, "personal", crm_rows, sent_at)
+    _legacy_append_campaign_records(
+        db_path, crm_rows, campaign_id=campaign_id, mode="personal", sent_at=sent_at
+    )
+
+
+def _stored_rows(db_path):
+    with sqlite3.connect(db_path) as connection:
+        rows = connection.execute(
+            f"SELECT {', '.join(LEGACY_COLUMNS)} FROM campaign_contacts"
+        ).fetchall()
+    return {(row[0], row[3], row[4]): row for row in rows}
+
+
+def _column_differences(legacy, current):
+    """Count, per column, the rows whose stored value differs between the tables."""
+    differences = dict.fromkeys(LEGACY_COLUMNS, 0)
+    differences["missing rows"] = len(legacy.keys() ^ current.keys())
+    for key in legacy.keys() & current.keys():
+        for column, old, new in zip(LEGACY_COLUMNS, legacy[key], current[key]):
+            if old != new or type(old) is not type(new):
+                differences[column] += 1
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    crm_rows = _synthetic_rows(args.rows, args.seed)
+    sent_at = datetime(2025, 8, 14, 9, 30)
+    with tempfile.TemporaryDirectory() as folder:
+        legacy_db = Path(folder) / "legacy.db"
+        started = time.perf_counter()
+        _legacy_write(legacy_db, crm_rows, "bench", sent_at)
+        legacy_seconds = time.perf_counter() - started
+
+        AutoMailerPro.CAMPAIGN_DB_PATH = Path(folder) / "campaign_history.db"
+        sqlite3.connect(AutoMailerPro.CAMPAIGN_DB_PATH).close()
+        started = time.perf_counter()
+        AutoMailerPro.write_campaign_history(
+            crm_rows, campaign_id="bench", mode="personal", sent_at=sent_at
+        )
+        writer_seconds = time.perf_counter() - started
+
+        differences = _column_differences(
+            _stored_rows(legacy_db), _stored_rows(AutoMailerPro.CAMPAIGN_DB_PATH)
+        )
+
+    print(f"rows:        {args.rows}")
+    print(f"two writes:  {legacy_seconds:.3f}s")
+    print(f"one writer:  {writer_seconds:.3f}s")
+    print(f"speedup:     {legacy_seconds / max(writer_seconds, 1e-9):.1f}x")
+    print(f"identical:   {'yes' if not any(differences.values()) else 'NO'}")
+    for column, count in differences.items():
+        if count:
+            print(f"  {column}: {count} rows differ")
+
+
+if __name__ == "__main__":
+    main()
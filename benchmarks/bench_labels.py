@@ -0,0 +1,98 @@
+"""Benchmark label sheets: one growing table versus one cloned table per page.
+
+Usage:
+    python benchmarks/bench_labels.py [--labels 30000] [--format 5160] [--single-limit 30000]
+
+The paged engine (:func:`create_labels`) is timed at ``--labels``.  The
+previous single ``ceil(n/3)``-row table built cell by cell with python-docx
+is timed at up to ``--single-limit`` labels and the per-label rates are
+compared.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx import Document  # noqa: E402
+from docx.shared import Inches, Pt  # noqa: E402
+
+import AutoMailerPro  # noqa: E402
+
+
+def _single_table_labels(label_data, labels_file):
+    """The previous builder: every label in one table, filled through python-docx."""
+    doc = Document()
+    section = doc.sections[0]
+    section.page_width = Inches(8.5)
+    section.page_height = Inches(11)
+    section.top_margin = Inches(0.5)
+    section.bottom_margin = Inches(0.5)
+    section.left_margin = Inches(0.19)
+    section.right_margin = Inches(0.19)
+    table = doc.add_table(rows=-(-len(label_data) // 3), cols=3)
+    table.autofit = False
+    for col in table.columns:
+        col.width = Inches(2.63)
+    for row in table.rows:
+        row.height = Inches(1.0)
+        row.height_rule = 2
+    idx = 0
+    for row in table.rows:
+        for cell in row.cells:
+            if idx < len(label_data):
+                lines = label_data[idx].split("\n")
+                para = cell.paragraphs[0]
+                name_run = para.add_run(lines[0] + "\n")
+                name_run.bold = True
+                name_run.font.size = Pt(10.5)
+                for line in lines[1:]:
+                    para.add_run(line + "\n").font.size = Pt(10.5)
+                idx += 1
+    doc.save(str(labels_file))
+
+
+def _labels(count):
+    return [
+        f"Recipient {index}\n{index} Main St\nVero Beach, FL 32960" for index in range(count)
+    ]
+
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--labels", type=int, default=30000)
+    parser.add_argument("--format", default=AutoMailerPro.DEFAULT_LABEL_FORMAT,
+                        choices=list(AutoMailerPro.AVERY_LABEL_FORMATS))
+    parser.add_argument("--single-limit", type=int, default=30000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paged_file = Path(tmp) / "paged.docx"
+        paged_seconds = _timed(AutoMailerPro.create_labels, _labels(args.labels), paged_file, args.format)
+        with zipfile.ZipFile(paged_file) as archive:
+            document_xml = archive.read("word/document.xml")
+        tables = document_xml.count(b"<w:tbl>")
+
+        single_count = min(args.labels, args.single_limit)
+        single_seconds = _timed(_single_table_labels, _labels(single_count), Path(tmp) / "single.docx")
+
+    paged_rate = paged_seconds / args.labels * 1e6
+    single_rate = single_seconds / single_count * 1e6
+    print(f"format:        {args.format} ({AutoMailerPro.AVERY_LABEL_FORMATS[args.format]['description']})")
+    print(f"paged:         {args.labels} labels in {paged_seconds:.2f}s ({paged_rate:.0f} us/label, {tables} page tables)")
+    print(f"single table:  {single_count} labels in {single_seconds:.2f}s ({single_rate:.0f} us/label)")
+    print(f"speedup:       {single_rate / max(paged_rate, 1e-9):.1f}x per label")
+
+
+if __name__ == "__main__":
+    main()
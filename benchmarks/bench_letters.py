@@ -0,0 +1,97 @@
+"""Benchmark letter rendering: python-docx calls per letter versus the cloned skeleton.
+
+Usage:
+    python benchmarks/bench_letters.py [--letters 10000]
+
+Both approaches render the same synthetic recipients into a fresh document
+and save it to a temporary folder.  The script reports the render and save
+time of each and whether the resulting ``word/document.xml`` parts match.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx import Document  # noqa: E402
+
+import AutoMailerPro  # noqa: E402
+
+NAMES = ["Angela Rocha", "John & Mary Smith", "Eduardo Punales", "Denise M. Carter"]
+ZIP_CODES = ["32960", "32962", "32963", "34982", ""]
+CONTENT = "Dear neighbor [Name],\n\nRates in [County] are coming down.\n\nWarm Regards,"
+
+
+def _recipients(count, seed):
+    rng = random.Random(seed)
+    return [
+        (f"{rng.choice(NAMES)} {index}", f"{index} Main St", rng.choice(ZIP_CODES))
+        for index in range(count)
+    ]
+
+
+def _letter_options():
+    return (
+        CONTENT,
+        "personal",
+        "Rates Are Finally on the Decline",
+        "Brian Jones",
+        "Vice President",
+        AutoMailerPro.SIGNATURES_DIR / "signature_brian.png",
+        "Brian@jonesia.com",
+    )
+
+
+def _render(recipients, output_path, use_skeleton):
+    doc = Document()
+    options = _letter_options()
+    skeleton = AutoMailerPro.LetterSkeleton(doc, *options)
+    started = time.perf_counter()
+    for name, address, zip_code in recipients:
+        if use_skeleton:
+            skeleton.add(name, address, zip_code, "Unknown", 0.0)
+        else:
+            AutoMailerPro.add_letter_to_doc(doc, name, address, zip_code, "Unknown", 0.0, *options)
+    render_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    doc.save(str(output_path))
+    return render_seconds, time.perf_counter() - started
+
+
+def _document_xml(path):
+    with zipfile.ZipFile(path) as archive:
+        return archive.read("word/document.xml")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--letters", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    AutoMailerPro.load_zip_lookup()
+    recipients = _recipients(args.letters, args.seed)
+    with tempfile.TemporaryDirectory() as folder:
+        per_call_path = Path(folder) / "per_call.docx"
+        skeleton_path = Path(folder) / "skeleton.docx"
+        per_call = _render(recipients, per_call_path, use_skeleton=False)
+        skeleton = _render(recipients, skeleton_path, use_skeleton=True)
+        identical = _document_xml(per_call_path) == _document_xml(skeleton_path)
+
+    print(f"letters:     {args.letters}")
+    for label, (render_seconds, save_seconds) in (("per call", per_call), ("skeleton", skeleton)):
+        print(
+            f"{label + ':':<12} render {render_seconds:.2f}s "
+            f"({render_seconds / args.letters * 1000:.3f} ms/letter), save {save_seconds:.2f}s"
+        )
+    print(f"speedup:     {per_call[0] / max(skeleton[0], 1e-9):.1f}x render")
+    print(f"identical:   {'yes' if identical else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark ZIP, sale price and sale date normalization per row.
+
+Usage:
+    python benchmarks/bench_normalization.py [--rows 100000]
+
+Compares the per-row scalar path (regex ZIP cleanup, chained ``.replace``
+plus ``float`` for prices, ``datetime.strptime`` for dates) with the
+vectorized ``normalize_sales_fields`` stage on synthetic resolved fields.
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd  # noqa: E402
+
+import AutoMailerPro  # noqa: E402
+
+ZIP_CODES = ["32960", "32962-1234", "34982", "34951-3226", "32958", "3496", ""]
+
+
+def _synthetic_fields(rows, seed):
+    rng = random.Random(seed)
+    first_sale = datetime(2025, 7, 1)
+    return pd.DataFrame(
+        {
+            "site_zip": [rng.choice(ZIP_CODES) for _ in range(rows)],
+            "mailing_zip": [rng.choice(ZIP_CODES) for _ in range(rows)],
+            "sale_price": [
+                f"${rng.randint(100, 900) * 1000:,}" if rng.random() < 0.9 else ""
+                for _ in range(rows)
+            ],
+            "sale_date": [
+                (first_sale + timedelta(days=rng.randint(0, 90))).strftime("%m/%d/%Y")
+                if rng.random() < 0.95 else "Unknown"
+                for _ in range(rows)
+            ],
+        },
+        dtype=object,
+    )
+
+
+def _scalar_pass(fields):
+    results = []
+    for row in fields.itertuples(index=False):
+        site_zip = AutoMailerPro._normalize_zip(row.site_zip)
+        mailing_zip = AutoMailerPro._normalize_zip(row.mailing_zip)
+        price_text = row.sale_price.replace('$', '').replace(',', '')
+        try:
+            sale_price = float(price_text) if price_text else 0.0
+        except ValueError:
+            sale_price = 0.0
+        try:
+            sale_date = datetime.strptime(row.sale_date, '%m/%d/%Y').strftime('%B %d, %Y')
+        except ValueError:
+            sale_date = "Unknown"
+        results.append((site_zip, mailing_zip, sale_price, sale_date))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    fields = _synthetic_fields(args.rows, args.seed)
+
+    started = time.perf_counter()
+    scalar = _scalar_pass(fields)
+    scalar_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    normalized = AutoMailerPro.normalize_sales_fields(fields)
+    vector_seconds = time.perf_counter() - started
+
+    vector = list(zip(
+        normalized["site_zip_normalized"],
+        normalized["mailing_zip_normalized"],
+        normalized["sale_price_value"],
+        normalized["sale_date_display"],
+    ))
+    print(f"rows:        {args.rows}")
+    print(f"scalar:      {scalar_seconds:.3f}s ({scalar_seconds / args.rows * 1e6:.2f} us/row)")
+    print(f"vectorized:  {vector_seconds:.3f}s ({vector_seconds / args.rows * 1e6:.2f} us/row)")
+    print(f"speedup:     {scalar_seconds / max(vector_seconds, 1e-9):.1f}x")
+    print(f"identical:   {'yes' if scalar == vector else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
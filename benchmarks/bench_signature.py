@@ -0,0 +1,70 @@
+"""Benchmark the signature cache: scanned PNG versus the print-resolution copy.
+
+Usage:
+    python benchmarks/bench_signature.py [--letters 2000]
+
+Reports the one-off cost of :func:`prepare_signature_image` (cold and
+memoized) and the size and render time of a ``--letters`` letter document
+rendered with the :class:`LetterSkeleton` for each image.  The cache is written to a temporary
+folder rather than the user data dir.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx import Document  # noqa: E402
+
+import AutoMailerPro  # noqa: E402
+
+SOURCE = AutoMailerPro.SIGNATURES_DIR / "signature_brian.png"
+
+
+def _render_letters(image_path, letters, output_path):
+    # Bypass the cache so the scanned image is embedded as-is for the baseline.
+    prepare = AutoMailerPro.prepare_signature_image
+    AutoMailerPro.prepare_signature_image = lambda signature_image: Path(signature_image)
+    started = time.perf_counter()
+    try:
+        doc = Document()
+        skeleton = AutoMailerPro.LetterSkeleton(
+            doc, "Dear [Name],\n\nRates are coming down.", "personal", "Subject",
+            "Brian Jones", "Vice President", image_path, "Brian@jonesia.com",
+        )
+        for index in range(letters):
+            skeleton.add(f"Recipient {index}", f"{index} Main St", "32960", "Unknown", 0.0)
+        doc.save(str(output_path))
+    finally:
+        AutoMailerPro.prepare_signature_image = prepare
+    return time.perf_counter() - started, output_path.stat().st_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--letters", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        AutoMailerPro.SIGNATURE_CACHE_DIR = Path(folder) / "signature_cache"
+        started = time.perf_counter()
+        prepared = AutoMailerPro.prepare_signature_image(SOURCE)
+        cold_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        AutoMailerPro.prepare_signature_image(SOURCE)
+        warm_seconds = time.perf_counter() - started
+
+        original_seconds, original_size = _render_letters(SOURCE, args.letters, Path(folder) / "original.docx")
+        prepared_seconds, prepared_size = _render_letters(prepared, args.letters, Path(folder) / "prepared.docx")
+
+        print(f"image:         {SOURCE.stat().st_size / 1024:.0f} KB -> {prepared.stat().st_size / 1024:.0f} KB ({prepared.name})")
+        print(f"prepare:       {cold_seconds * 1000:.0f} ms cold, {warm_seconds * 1e6:.0f} us memoized")
+        print(f"letters.docx:  {original_size / 1024:.0f} KB original vs {prepared_size / 1024:.0f} KB prepared ({args.letters} letters)")
+        print(f"render+save:   {original_seconds:.2f}s original vs {prepared_seconds:.2f}s prepared")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark peak memory of in-memory versus streamed letter documents.
+
+Usage:
+    python benchmarks/bench_streaming_docx.py [--letters 1000 5000 20000]
+
+Every run happens in a fresh child process that renders synthetic letters
+with :class:`LetterSkeleton` and either keeps the whole document until
+``save()`` or flushes each letter through :class:`StreamingDocxWriter`.
+Peak resident memory is read from ``resource`` (Linux/macOS only).
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx import Document  # noqa: E402
+
+import AutoMailerPro  # noqa: E402
+
+CONTENT = "Dear neighbor [Name],\n\nRates in [County] are coming down.\n\nWarm Regards,"
+
+
+def _render(letters, streamed):
+    letter_options = (
+        CONTENT,
+        "personal",
+        "Rates Are Finally on the Decline",
+        "Brian Jones",
+        "Vice President",
+        AutoMailerPro.SIGNATURES_DIR / "signature_brian.png",
+        "Brian@jonesia.com",
+    )
+    with tempfile.TemporaryDirectory() as folder:
+        output_path = Path(folder) / "all_letters.docx"
+        doc = Document()
+        skeleton = AutoMailerPro.LetterSkeleton(doc, *letter_options)
+        writer = AutoMailerPro.StreamingDocxWriter(output_path, doc)
+        started = time.perf_counter()
+        for index in range(letters):
+            skeleton.add(f"Recipient {index}", f"{index} Main St", "32960", "Unknown", 0.0)
+            if streamed:
+                writer.flush()
+        if streamed:
+            writer.close()
+        else:
+            doc.save(str(output_path))
+        seconds = time.perf_counter() - started
+        size = output_path.stat().st_size
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    print(f"{seconds:.2f} {peak_mb:.1f} {size}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--letters", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _render(int(args.child[0]), args.child[1] == "streamed")
+        return
+
+    print(f"{'letters':>8} {'mode':>9} {'seconds':>8} {'peak MB':>8} {'file KB':>8}")
+    for letters in args.letters:
+        for mode in ("in-memory", "streamed"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", str(letters), mode],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            seconds, peak_mb, size = float(output[0]), float(output[1]), int(output[2])
+            print(f"{letters:>8} {mode:>9} {seconds:>8.2f} {peak_mb:>8.1f} {size / 1024:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Check that ClientMatchIndex makes the same decisions as the linear scan.
+
+Usage:
+    python benchmarks/check_client_match_index.py [--rounds 200] [--clients 300] [--rows 200]
+
+Every round generates a small client list and sales rows with a fixed seed,
+biased toward the cases a filtered lookup can get wrong: short names that
+are substrings of longer ones ("Smith" / "Johnny Smithers"), addresses with
+and without ZIP codes, typos, empty and one-character values, and names
+stored ``LAST FIRST``.  Each row is decided by ``is_existing_client`` against
+the plain list and against the index, and every round is also flagged by
+``scrub_existing_clients`` (the rapidfuzz batch pass when rapidfuzz is
+installed); any disagreement is printed and the script exits with status 1.
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd  # noqa: E402
+
+import AutoMailerPro  # noqa: E402
+
+FIRST_NAMES = [
+    "John", "Johnny", "Mary", "Ann", "Al", "Eduardo", "Linda", "Jo", "Maria",
+    "Denise", "Robert", "Patricia", "Carlos", "Susan", "Kevin", "Betty",
+]
+LAST_NAMES = [
+    "Smith", "Smithers", "Reeves", "Rocha", "Lee", "Li", "Ng", "Jones", "Padilla",
+    "Hamilton", "Vasquez", "Okafor", "Whitfield", "Castellano", "Brandt", "Moreau",
+]
+STREETS = ["Main St", "Hickory Dr", "Ocean Dr", "20th St", "Royal Palm Pl", "A St"]
+CITIES = ["Vero Beach, FL 32960", "Fort Pierce, FL 34982", "Sebastian, FL 32958"]
+
+# Fixed regressions: (client, sales name, sales address).
+KNOWN_CASES = [
+    (
+        {"Name": "Smith", "Mailing Address": "123 Main St"},
+        "Johnny Smithers",
+        "123 Main St, Vero Beach, FL 32960",
+    ),
+]
+
+
+def _mutate(rng, text):
+    """Apply a random typo, truncation or case change to ``text``."""
+    choice = rng.random()
+    if not text or choice < 0.3:
+        return text
+    index = rng.randrange(len(text))
+    if choice < 0.5:
+        return text[:index] + rng.choice(string.ascii_lowercase) + text[index + 1:]
+    if choice < 0.65:
+        return text[:index] + text[index + 1:]
+    if choice < 0.8:
+        return text[:index] + rng.choice(string.ascii_lowercase + " ") + text[index:]
+    if choice < 0.9:
+        return text[index:] if rng.random() < 0.5 else text[:index]
+    return text.upper()
+
+
+def _name(rng):
+    shape = rng.random()
+    if shape < 0.05:
+        return rng.choice(["", "J", "Al", rng.choice(LAST_NAMES)])
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    if shape < 0.3:
+        return f"{last.upper()} {first.upper()}"
+    return f"{first} {last}"
+
+
+def _address(rng):
+    shape = rng.random()
+    street = f"{rng.randint(1, 99999)} {rng.choice(STREETS)}"
+    if shape < 0.05:
+        return rng.choice(["", "1", street[:4]])
+    if shape < 0.4:
+        return street
+    return f"{street}, {rng.choice(CITIES)}"
+
+
+def _row_from(rng, client):
+    name = client["Name"]
+    if rng.random() < 0.5:
+        name = f"{rng.choice(FIRST_NAMES)} {name}" if rng.random() < 0.5 else f"{name}{rng.choice(['', 's', 'ers'])}"
+    address = client["Mailing Address"]
+    if rng.random() < 0.5:
+        address = f"{address} | {rng.choice(CITIES)}"
+    return _mutate(rng, name), _mutate(rng, address)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    cases = [([client], [(name, address)]) for client, name, address in KNOWN_CASES]
+    rng = random.Random(args.seed)
+    for _ in range(args.rounds):
+        clients = [
+            {"Name": _mutate(rng, _name(rng)), "Mailing Address": _mutate(rng, _address(rng))}
+            for _ in range(args.clients)
+        ]
+        rows = [
+            _row_from(rng, rng.choice(clients)) if rng.random() < 0.5 else (_name(rng), _address(rng))
+            for _ in range(args.rows)
+        ]
+        cases.append((clients, rows))
+
+    checked = matched = mismatched = 0
+    started = time.perf_counter()
+    for clients, rows in cases:
+        index = AutoMailerPro.build_client_index(clients)
+        frame = AutoMailerPro.scrub_existing_clients(
+            pd.DataFrame(rows, columns=["Name", "Mailing Address"]), index
+        )
+        for (name, address), batch in zip(rows, frame["Existing Client"].tolist()):
+            expected = AutoMailerPro.is_existing_client(name, address, clients)
+            if AutoMailerPro.is_existing_client(name, address, index) != expected:
+                mismatched += 1
+                print(f"❌ {name!r} / {address!r}: linear scan {expected}, index {not expected}")
+            if batch != expected:
+                mismatched += 1
+                print(f"❌ {name!r} / {address!r}: linear scan {expected}, batch scrub {batch}")
+            checked += 1
+            matched += expected
+
+    print(f"batch:       {'rapidfuzz prefilter' if AutoMailerPro.rapid_process else 'index only'}")
+    print(f"rows:        {checked}")
+    print(f"matches:     {matched}")
+    print(f"mismatches:  {mismatched}")
+    print(f"elapsed:     {time.perf_counter() - started:.1f}s")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
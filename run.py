@@ -1,5 +1,7 @@
 from pathlib import Path
 import json
+import multiprocessing
+import queue
 import re
 import shutil
 import sys
@@ -14,6 +16,7 @@ from ttkthemes import ThemedTk
 from textwrap import dedent
 from typing import Dict, List, Optional
 
+
 def get_base_dir() -> Path:
     """Return the directory that holds bundled resources."""
     if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
@@ -25,20 +28,41 @@ BASE_DIR = get_base_dir()
 ASSETS_DIR = BASE_DIR / "assets"
 SIGNATURES_DIR = ASSETS_DIR / "signatures"
 
+OUTPUT_POLL_MS = 50
+
 class StdoutRedirector:
+    """Queue writes from any thread; the Tk thread drains them into the output pane.
+
+    Tk widgets may only be touched from the thread running the main loop,
+    while the campaign prints from its worker and artifact-writer threads.
+    """
+
     def __init__(self, text_widget):
         self.text_widget = text_widget
+        self.messages = queue.SimpleQueue()
 
     def write(self, message):
-        self.text_widget.insert(tk.END, message)
-        self.text_widget.see(tk.END)
-        self.text_widget.update()
+        self.messages.put(message)
 
     def flush(self):
         pass
 
+    def drain(self):
+        """Append queued output to the widget and reschedule itself on the Tk loop."""
+        chunks = []
+        while True:
+            try:
+                chunks.append(self.messages.get_nowait())
+            except queue.Empty:
+                break
+        if chunks:
+            self.text_widget.insert(tk.END, "".join(chunks))
+            self.text_widget.see(tk.END)
+        self.text_widget.after(OUTPUT_POLL_MS, self.drain)
+
 def run_campaign():
     global selected_mode, sales_file_path, letter_content, subject_line, signature_name, signature_title, signature_image, signature_email
+    global render_workers, shard_size, merge_shards, output_format, label_format, artifacts, resume
     selected_mode = mode_var.get()
     sales_file_path = file_entry.get()
     selected_template = template_var.get()
@@ -57,6 +81,23 @@ def run_campaign():
     if not subject_line:
         messagebox.showerror("Error", "Please enter a subject line!")
         return
+    try:
+        render_workers = int(workers_var.get())
+        shard_size = int(shard_size_var.get()) if shard_size_var.get().strip() else None
+    except ValueError:
+        messagebox.showerror("Error", "Render workers and shard size must be whole numbers!")
+        return
+    if render_workers < 1 or (shard_size is not None and shard_size < 1):
+        messagebox.showerror("Error", "Render workers and shard size must be at least 1!")
+        return
+    merge_shards = merge_shards_var.get()
+    output_format = output_format_var.get()
+    label_format = label_format_var.get()
+    artifacts = [artifact for artifact, selected in artifact_vars.items() if selected.get()]
+    resume = resume_var.get()
+    if not artifacts:
+        messagebox.showerror("Error", "Please select at least one output to generate!")
+        return
     run_button.config(state='disabled')
     progress_bar.start()
     output_text.delete("1.0", tk.END)
@@ -77,7 +118,10 @@ def threaded_main():
         AutoMailerPro.main(
             selected_mode, sales_file_path, letter_content, subject_line,
             signature_name=signature_name, signature_title=signature_title,
-            signature_image=signature_image, signature_email=signature_email
+            signature_image=signature_image, signature_email=signature_email,
+            render_workers=render_workers, shard_size=shard_size, merge_shards=merge_shards,
+            output_format=output_format, label_format=label_format, artifacts=artifacts,
+            resume=resume
         )
         root.after(0, update_ui_success)
     except Exception as err:
@@ -127,35 +171,6 @@ def apply_template_selection(*args):
     letter_text.config(state='disabled')
     current_template_selection = new_selection
 
-# Initialize window with theme
-root = ThemedTk(theme="arc")
-root.title("Auto Mailer Pro    © 2025 Kyle Padilla — Jones Insurance Advisors, Inc.")
-root.geometry("1000x825")
-root.configure(bg="#f0f4f8")
-
-main_frame = ttk.Frame(root, padding="20")
-main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-main_frame.configure(style="Main.TFrame")
-
-# Define styles
-style = ttk.Style()
-style.configure("Main.TFrame", background="#f0f4f8")
-style.configure("TButton", font=("Arial", 12), padding=10)
-
-# Add logo
-
-logo_path = ASSETS_DIR / "logo.png"
-if logo_path.exists():
-    logo_image = tk.PhotoImage(file=str(logo_path))
-    logo_image = logo_image.subsample(2, 2)
-    logo_label = tk.Label(main_frame, image=logo_image, bg="#f0f4f8")
-    logo_label.image = logo_image
-    logo_label.grid(row=0, column=0, columnspan=4, pady=20)
-else:
-    print(f"❌ Logo file not found: {logo_path}")
-    logo_label = tk.Label(main_frame, text="Logo Not Found", font=("Arial", 12), bg="#f0f4f8")
-    logo_label.grid(row=0, column=0, columnspan=4, pady=20)
-
 # Define signature profiles (name, title, image, email)
 DEFAULT_SIGNATURE_PROFILES = {
     "Brian Jones": (
@@ -271,8 +286,6 @@ def persist_custom_signatures() -> None:
         messagebox.showerror("Error", f"Unable to save signature profiles: {exc}")
 
 
-signature_profiles.update(load_custom_signatures())
-
 INDIAN_RIVER_PERSONAL_TEMPLATE = dedent(
     """
 For the first time in years, homeowners rates are coming down — and the savings could be significant.
@@ -1046,22 +1059,6 @@ def open_customer_manager():
     refresh_tree()
     search_entry.focus_set()
 
-# Signature selection
-signature_label = tk.Label(main_frame, text="Signature:", font=("Arial", 12), bg="#f0f4f8")
-signature_label.grid(row=1, column=0, sticky=tk.W, pady=5)
-signature_choices = sorted(signature_profiles.keys())
-default_signature = (
-    "Brian Jones" if "Brian Jones" in signature_profiles else (signature_choices[0] if signature_choices else "")
-)
-signature_var = tk.StringVar(value=default_signature)
-signature_dropdown = ttk.Combobox(
-    main_frame,
-    textvariable=signature_var,
-    values=signature_choices,
-    state="readonly",
-)
-signature_dropdown.grid(row=1, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=5)
-
 def update_signature_choices(selected=None):
     values = sorted(signature_profiles.keys())
     signature_dropdown.config(values=values)
@@ -1279,113 +1276,205 @@ def open_remove_user_dialog() -> None:
         row=0, column=1, padx=5
     )
 
+def build_gui():
+    """Build the main window and route stdout/stderr into its output pane."""
+    global root, main_frame, mode_var, template_var, user_edited_subject, file_entry, subject_entry
+    global letter_text, signature_var, signature_dropdown, workers_var, shard_size_var
+    global merge_shards_var, output_format_var, label_format_var, artifact_vars, resume_var
+    global run_button, progress_bar, output_text
+
+    # Initialize window with theme
+    root = ThemedTk(theme="arc")
+    root.title("Auto Mailer Pro    © 2025 Kyle Padilla — Jones Insurance Advisors, Inc.")
+    root.geometry("1000x825")
+    root.configure(bg="#f0f4f8")
+
+    main_frame = ttk.Frame(root, padding="20")
+    main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+    main_frame.configure(style="Main.TFrame")
+
+    # Define styles
+    style = ttk.Style()
+    style.configure("Main.TFrame", background="#f0f4f8")
+    style.configure("TButton", font=("Arial", 12), padding=10)
+
+    # Add logo
+
+    logo_path = ASSETS_DIR / "logo.png"
+    if logo_path.exists():
+        logo_image = tk.PhotoImage(file=str(logo_path))
+        logo_image = logo_image.subsample(2, 2)
+        logo_label = tk.Label(main_frame, image=logo_image, bg="#f0f4f8")
+        logo_label.image = logo_image
+        logo_label.grid(row=0, column=0, columnspan=4, pady=20)
+    else:
+        print(f"❌ Logo file not found: {logo_path}")
+        logo_label = tk.Label(main_frame, text="Logo Not Found", font=("Arial", 12), bg="#f0f4f8")
+        logo_label.grid(row=0, column=0, columnspan=4, pady=20)
+
+
+    signature_profiles.update(load_custom_signatures())
+
+    # Signature selection
+    signature_label = tk.Label(main_frame, text="Signature:", font=("Arial", 12), bg="#f0f4f8")
+    signature_label.grid(row=1, column=0, sticky=tk.W, pady=5)
+    signature_choices = sorted(signature_profiles.keys())
+    default_signature = (
+        "Brian Jones" if "Brian Jones" in signature_profiles else (signature_choices[0] if signature_choices else "")
+    )
+    signature_var = tk.StringVar(value=default_signature)
+    signature_dropdown = ttk.Combobox(
+        main_frame,
+        textvariable=signature_var,
+        values=signature_choices,
+        state="readonly",
+    )
+    signature_dropdown.grid(row=1, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+    update_signature_choices(default_signature)
+
+    menubar = tk.Menu(root)
+
+    file_menu = tk.Menu(menubar, tearoff=0)
+    file_menu.add_command(label="Add User…", command=open_add_user_dialog)
+    file_menu.add_command(label="Remove User…", command=open_remove_user_dialog)
+    file_menu.add_separator()
+    file_menu.add_command(label="Exit", command=root.destroy)
+    menubar.add_cascade(label="File", menu=file_menu)
+
+    reports_menu = tk.Menu(menubar, tearoff=0)
+    reports_menu.add_command(label="Customer Database", command=open_customer_manager)
+    menubar.add_cascade(label="Reports", menu=reports_menu)
+
+    view_menu = tk.Menu(menubar, tearoff=0)
+    view_menu.add_command(label="Enter Fullscreen", command=lambda: toggle_fullscreen(True))
+    view_menu.add_command(label="Exit Fullscreen", command=lambda: toggle_fullscreen(False))
+    menubar.add_cascade(label="View", menu=view_menu)
+
+    about_menu = tk.Menu(menubar, tearoff=0)
+    about_menu.add_command(label="About", command=show_about_dialog)
+    about_menu.add_command(label="Instructions", command=show_instructions)
+    menubar.add_cascade(label="About", menu=about_menu)
+
+    root.config(menu=menubar)
+
+
+    # Mode selection
+    mode_label = tk.Label(main_frame, text="Select Mode:", font=("Arial", 12), bg="#f0f4f8")
+    mode_label.grid(row=2, column=0, sticky=tk.W, pady=5)
+    mode_var = tk.StringVar(value="personal")
+    template_var = tk.StringVar(value="Indian River County")
+    user_edited_subject = tk.BooleanVar(value=False)
+    mode_var.trace("w", update_subject_line)
+    ttk.Radiobutton(main_frame, text="Personal Lines", variable=mode_var, value="personal").grid(row=2, column=1, sticky=tk.W)
+    ttk.Radiobutton(main_frame, text="Commercial Lines", variable=mode_var, value="commercial").grid(row=2, column=2, sticky=tk.W)
+
+    # File selection
+    file_label = tk.Label(main_frame, text="Sales Data File:", font=("Arial", 12), bg="#f0f4f8")
+    file_label.grid(row=3, column=0, sticky=tk.W, pady=5)
+    file_entry = ttk.Entry(main_frame, width=50, font=("Arial", 10))
+    file_entry.grid(row=3, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+    ttk.Button(main_frame, text="Browse", command=browse_file, style="TButton").grid(row=3, column=3, padx=5)
+
+    # Template selection
+    template_label = tk.Label(main_frame, text="Letter Template:", font=("Arial", 12), bg="#f0f4f8")
+    template_label.grid(row=4, column=0, sticky=tk.W, pady=5)
+    template_dropdown = ttk.Combobox(
+        main_frame,
+        textvariable=template_var,
+        values=list(LETTER_TEMPLATES.keys()) + ["Custom"],
+        state="readonly"
+    )
+    template_dropdown.grid(row=4, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+
+    # Subject line
+    subject_label = tk.Label(main_frame, text="Subject Line:", font=("Arial", 12), bg="#f0f4f8")
+    subject_label.grid(row=5, column=0, sticky=tk.W, pady=5)
+    subject_entry = ttk.Entry(main_frame, width=50, font=("Arial", 10))
+    subject_entry.grid(row=5, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+    subject_entry.insert(0, "Homeowners Insurance Rates Are Finally on the Decline – Don’t Miss Out!")
+    subject_entry.bind("<KeyRelease>", mark_subject_edited)
+
+    # Letter content
+    content_label = tk.Label(main_frame, text="Letter Content (editable when using the custom template):", font=("Arial", 12), bg="#f0f4f8")
+    content_label.grid(row=6, column=0, sticky=tk.W, pady=5)
+    letter_text = scrolledtext.ScrolledText(main_frame, width=60, height=10, font=("Arial", 10), bg="white", fg="black")
+    letter_text.grid(row=7, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
+    template_var.trace_add("write", lambda *args: apply_template_selection())
+    apply_template_selection()
+
+
+    # Render options
+    render_label = tk.Label(main_frame, text="Render Workers:", font=("Arial", 12), bg="#f0f4f8")
+    render_label.grid(row=8, column=0, sticky=tk.W, pady=5)
+    render_frame = ttk.Frame(main_frame)
+    render_frame.grid(row=8, column=1, columnspan=3, sticky=tk.W, pady=5)
+    workers_var = tk.StringVar(value="1")
+    ttk.Spinbox(render_frame, from_=1, to=max(multiprocessing.cpu_count(), 1), textvariable=workers_var, width=5).grid(row=0, column=0, sticky=tk.W)
+    ttk.Label(render_frame, text="Shard size (blank = even split):").grid(row=0, column=1, sticky=tk.W, padx=(15, 5))
+    shard_size_var = tk.StringVar(value="")
+    ttk.Entry(render_frame, textvariable=shard_size_var, width=8).grid(row=0, column=2, sticky=tk.W)
+    merge_shards_var = tk.BooleanVar(value=True)
+    ttk.Checkbutton(render_frame, text="Merge into one document", variable=merge_shards_var).grid(row=0, column=3, sticky=tk.W, padx=(15, 0))
+    ttk.Label(render_frame, text="Format:").grid(row=0, column=4, sticky=tk.W, padx=(15, 5))
+    output_format_var = tk.StringVar(value="docx")
+    ttk.Combobox(render_frame, textvariable=output_format_var, values=["docx", "pdf", "mail_merge"], state="readonly", width=11).grid(row=0, column=5, sticky=tk.W)
+    ttk.Label(render_frame, text="Labels:").grid(row=0, column=6, sticky=tk.W, padx=(15, 5))
+    label_format_var = tk.StringVar(value=AutoMailerPro.DEFAULT_LABEL_FORMAT)
+    ttk.Combobox(render_frame, textvariable=label_format_var, values=list(AutoMailerPro.AVERY_LABEL_FORMATS), state="readonly", width=6).grid(row=0, column=7, sticky=tk.W)
+
+    # Artifact selection
+    artifacts_label = tk.Label(main_frame, text="Generate:", font=("Arial", 12), bg="#f0f4f8")
+    artifacts_label.grid(row=9, column=0, sticky=tk.W, pady=5)
+    artifacts_frame = ttk.Frame(main_frame)
+    artifacts_frame.grid(row=9, column=1, columnspan=3, sticky=tk.W, pady=5)
+    artifact_vars = {}
+    for column, (artifact, text) in enumerate([
+        ("letters", "Letters"),
+        ("envelopes", "Envelopes"),
+        ("labels", "Labels"),
+        ("crm", "CRM CSV"),
+        ("history", "Campaign history"),
+    ]):
+        artifact_vars[artifact] = tk.BooleanVar(value=True)
+        ttk.Checkbutton(artifacts_frame, text=text, variable=artifact_vars[artifact]).grid(row=0, column=column, sticky=tk.W, padx=(0, 15))
+    resume_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(artifacts_frame, text="Resume interrupted run", variable=resume_var).grid(row=0, column=5, sticky=tk.W, padx=(15, 0))
+
+    # Run button
+    run_button = ttk.Button(main_frame, text="Run Campaign", command=run_campaign, style="TButton")
+    run_button.grid(row=10, column=0, columnspan=4, pady=20)
+
+    # Progress bar
+    progress_bar = ttk.Progressbar(main_frame, mode='indeterminate')
+    progress_bar.grid(row=11, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
+
+    # Output text
+    output_label = tk.Label(main_frame, text="Output:", font=("Arial", 12), bg="#f0f4f8")
+    output_label.grid(row=12, column=0, sticky=tk.W, pady=5)
+    output_text = scrolledtext.ScrolledText(main_frame, width=60, height=10, font=("Arial", 10), bg="white", fg="black")
+    output_text.grid(row=13, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
+
+    # Redirect print output to GUI
+    sys.stdout = sys.stderr = StdoutRedirector(output_text)
+    sys.stdout.drain()
+
+    # Credits
+    credits_label = tk.Label(
+        main_frame,
+        text="Support: scooby_rizz@protonmail.com   |  Repository: github.io/scoobyrizz-py   |  Last updated: 08/14/2025",
+        font=("Arial", 10),
+        bg="#f0f4f8"
+    )
+    credits_label.grid(row=14, column=0, columnspan=4, pady=20)
 
+    root.columnconfigure(0, weight=1)
+    root.rowconfigure(0, weight=1)
+    main_frame.columnconfigure(1, weight=1)
 
-update_signature_choices(default_signature)
-
-menubar = tk.Menu(root)
-
-file_menu = tk.Menu(menubar, tearoff=0)
-file_menu.add_command(label="Add User…", command=open_add_user_dialog)
-file_menu.add_command(label="Remove User…", command=open_remove_user_dialog)
-file_menu.add_separator()
-file_menu.add_command(label="Exit", command=root.destroy)
-menubar.add_cascade(label="File", menu=file_menu)
-
-reports_menu = tk.Menu(menubar, tearoff=0)
-reports_menu.add_command(label="Customer Database", command=open_customer_manager)
-menubar.add_cascade(label="Reports", menu=reports_menu)
-
-view_menu = tk.Menu(menubar, tearoff=0)
-view_menu.add_command(label="Enter Fullscreen", command=lambda: toggle_fullscreen(True))
-view_menu.add_command(label="Exit Fullscreen", command=lambda: toggle_fullscreen(False))
-menubar.add_cascade(label="View", menu=view_menu)
-
-about_menu = tk.Menu(menubar, tearoff=0)
-about_menu.add_command(label="About", command=show_about_dialog)
-about_menu.add_command(label="Instructions", command=show_instructions)
-menubar.add_cascade(label="About", menu=about_menu)
-
-root.config(menu=menubar)
-
-
-# Mode selection
-mode_label = tk.Label(main_frame, text="Select Mode:", font=("Arial", 12), bg="#f0f4f8")
-mode_label.grid(row=2, column=0, sticky=tk.W, pady=5)
-mode_var = tk.StringVar(value="personal")
-template_var = tk.StringVar(value="Indian River County")
-user_edited_subject = tk.BooleanVar(value=False)
-mode_var.trace("w", update_subject_line)
-ttk.Radiobutton(main_frame, text="Personal Lines", variable=mode_var, value="personal").grid(row=2, column=1, sticky=tk.W)
-ttk.Radiobutton(main_frame, text="Commercial Lines", variable=mode_var, value="commercial").grid(row=2, column=2, sticky=tk.W)
-
-# File selection
-file_label = tk.Label(main_frame, text="Sales Data File:", font=("Arial", 12), bg="#f0f4f8")
-file_label.grid(row=3, column=0, sticky=tk.W, pady=5)
-file_entry = ttk.Entry(main_frame, width=50, font=("Arial", 10))
-file_entry.grid(row=3, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=5)
-ttk.Button(main_frame, text="Browse", command=browse_file, style="TButton").grid(row=3, column=3, padx=5)
-
-# Template selection
-template_label = tk.Label(main_frame, text="Letter Template:", font=("Arial", 12), bg="#f0f4f8")
-template_label.grid(row=4, column=0, sticky=tk.W, pady=5)
-template_dropdown = ttk.Combobox(
-    main_frame,
-    textvariable=template_var,
-    values=list(LETTER_TEMPLATES.keys()) + ["Custom"],
-    state="readonly"
-)
-template_dropdown.grid(row=4, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=5)
-
-# Subject line
-subject_label = tk.Label(main_frame, text="Subject Line:", font=("Arial", 12), bg="#f0f4f8")
-subject_label.grid(row=5, column=0, sticky=tk.W, pady=5)
-subject_entry = ttk.Entry(main_frame, width=50, font=("Arial", 10))
-subject_entry.grid(row=5, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=5)
-subject_entry.insert(0, "Homeowners Insurance Rates Are Finally on the Decline – Don’t Miss Out!")
-subject_entry.bind("<KeyRelease>", mark_subject_edited)
-
-# Letter content
-content_label = tk.Label(main_frame, text="Letter Content (editable when using the custom template):", font=("Arial", 12), bg="#f0f4f8")
-content_label.grid(row=6, column=0, sticky=tk.W, pady=5)
-letter_text = scrolledtext.ScrolledText(main_frame, width=60, height=10, font=("Arial", 10), bg="white", fg="black")
-letter_text.grid(row=7, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
-template_var.trace_add("write", lambda *args: apply_template_selection())
-apply_template_selection()
-
-
-# Run button
-run_button = ttk.Button(main_frame, text="Run Campaign", command=run_campaign, style="TButton")
-run_button.grid(row=9, column=0, columnspan=4, pady=20)
-run_button.grid(row=8, column=0, columnspan=4, pady=20)
-
-# Progress bar
-progress_bar = ttk.Progressbar(main_frame, mode='indeterminate')
-progress_bar.grid(row=10, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
-progress_bar.grid(row=9, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
-
-# Output text
-output_label = tk.Label(main_frame, text="Output:", font=("Arial", 12), bg="#f0f4f8")
-output_label.grid(row=10, column=0, sticky=tk.W, pady=5)
-output_text = scrolledtext.ScrolledText(main_frame, width=60, height=10, font=("Arial", 10), bg="white", fg="black")
-output_text.grid(row=11, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
-
-# Redirect print output to GUI
-sys.stdout = StdoutRedirector(output_text)
-sys.stderr = StdoutRedirector(output_text)
-
-# Credits
-credits_label = tk.Label(
-    main_frame,
-    text="Support: scooby_rizz@protonmail.com   |  Repository: github.io/scoobyrizz-py   |  Last updated: 08/14/2025",
-    font=("Arial", 10),
-    bg="#f0f4f8"
-)
-credits_label.grid(row=12, column=0, columnspan=4, pady=20)
-
-root.columnconfigure(0, weight=1)
-root.rowconfigure(0, weight=1)
-main_frame.columnconfigure(1, weight=1)
 
 if __name__ == "__main__":
+    # Render workers are spawned and re-import this module as __mp_main__;
+    # the GUI is only built here so they never open a window.
+    multiprocessing.freeze_support()
+    build_gui()
     root.mainloop()
\ No newline at end of file
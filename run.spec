@@ -21,7 +21,7 @@ a = Analysis(
     pathex=[str(BASE_DIR)],
     binaries=[],
     datas=datas,
-    hiddenimports=['AutoMailerPro', 'pandas', 'docx', 'fuzzywuzzy', 'Levenshtein', 'tkinter', 'ttkthemes'],
+    hiddenimports=['AutoMailerPro', 'pandas', 'docx', 'fuzzywuzzy', 'Levenshtein', 'rapidfuzz', 'tkinter', 'ttkthemes'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],